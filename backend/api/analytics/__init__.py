@@ -0,0 +1,5 @@
+"""Finance aggregations shared by the API and the Kestra flow scripts.
+
+Standard library only: the API imports it next to pandas, and the flows run
+it in the prebuilt `finance-analytics-runtime` image (see Dockerfile.analytics).
+"""
@@ -0,0 +1,101 @@
+from typing import Any, Dict, Iterable, List
+from analytics.scoring import compliance_risk_score, rag_status, status_level
+
+OPEN_ALERT_STATUSES = ("PENDING_REVIEW", "UNDER_INVESTIGATION")
+
+# KYC expiring within this many days is urgent
+KYC_URGENT_DAYS = 14
+
+
+def count_sanctions(alerts: Iterable[Dict[str, Any]]) -> int:
+    return sum(1 for alert in alerts if alert.get("type") == "SANCTIONS_MATCH")
+
+
+def kyc_compliance_rate(kyc_summary: Dict[str, Any]) -> float:
+    """Percentage of clients that are fully KYC compliant."""
+    total = kyc_summary.get("total_clients", 1)
+    return kyc_summary.get("fully_compliant", 0) / max(total, 1) * 100
+
+
+def aml_summary(aml_data: Dict[str, Any], high_priority_threshold: int) -> Dict[str, Any]:
+    alerts = aml_data.get("alerts", [])
+    critical = [a for a in alerts if a.get("priority") == "HIGH" and a.get("status") in OPEN_ALERT_STATUSES]
+    sanctions = [a for a in alerts if a.get("type") == "SANCTIONS_MATCH"]
+    return {
+        "summary": aml_data.get("summary", {}),
+        "critical_alerts_count": len(critical),
+        "critical_alerts": critical,
+        "sanctions_alerts": sanctions,
+        "pending_deadlines": [d for d in aml_data.get("regulatory_deadlines", []) if d.get("status") != "COMPLETED"],
+        "requires_immediate_action": bool(sanctions) or len(critical) >= high_priority_threshold,
+    }
+
+
+def audit_summary(audit_rows: List[Dict[str, Any]], critical_event_types: Iterable[str] = ()) -> Dict[str, Any]:
+    def of_type(event_type: str) -> List[Dict[str, Any]]:
+        return [row for row in audit_rows if row.get("event_type") == event_type]
+
+    critical_types = {event_type.strip() for event_type in critical_event_types if event_type.strip()}
+    failed_logins = of_type("FAILED_LOGIN")
+    unauthorized = of_type("UNAUTHORIZED_ACCESS")
+    critical_events = [row for row in audit_rows if row.get("risk_level") in ("CRITICAL", "HIGH")]
+    return {
+        "total_events": len(audit_rows),
+        "critical_events_count": len(critical_events),
+        "critical_events": critical_events,
+        "escalation_events": [row for row in audit_rows if row.get("event_type") in critical_types],
+        "failed_login_attempts": len(failed_logins),
+        "unauthorized_access_attempts": unauthorized,
+        "bulk_data_exports": of_type("BULK_DOWNLOAD"),
+        "config_changes": of_type("CONFIG_CHANGE"),
+        "security_concerns": bool(unauthorized) or len(failed_logins) > 2,
+    }
+
+
+def kyc_summary(kyc_data: Dict[str, Any], urgent_days: int = KYC_URGENT_DAYS) -> Dict[str, Any]:
+    summary = kyc_data.get("summary", {})
+    expiring = kyc_data.get("expiring_soon", [])
+    urgent = [c for c in expiring if c.get("days_until_expiry", 999) <= urgent_days]
+    return {
+        "compliance_rate": round(kyc_compliance_rate(summary), 1),
+        "pending_reviews": summary.get("pending_review", 0),
+        "expired_docs": summary.get("expired_documentation", 0),
+        "high_risk_clients": len(kyc_data.get("high_risk_clients", [])),
+        "urgent_expirations": urgent,
+        "expiring_soon": expiring,
+        "kyc_action_required": bool(urgent) or summary.get("expired_documentation", 0) > 5,
+    }
+
+
+def compliance_assessment(aml: Dict[str, Any], audit: Dict[str, Any], kyc: Dict[str, Any]) -> Dict[str, Any]:
+    """Health score, RAG status and escalation flags from the compliance summaries."""
+    sanctions = len(aml["sanctions_alerts"])
+    risk_score = compliance_risk_score(sanctions, aml["summary"].get("high_priority", 0))
+    critical_items = aml["critical_alerts_count"] + sanctions + len(audit["unauthorized_access_attempts"])
+    return {
+        "risk_score": risk_score,
+        "health_score": 100 - risk_score,
+        "rag_status": rag_status(risk_score),
+        "status": status_level(risk_score),
+        "critical_items": critical_items,
+        "has_sanctions_match": sanctions > 0,
+        "escalation_required": aml["requires_immediate_action"] or audit["security_concerns"],
+    }
+
+
+def compliance_overview(aml_data: Dict[str, Any], kyc_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Executive one-glance compliance figures."""
+    aml = aml_data.get("summary", {})
+    high_priority = aml.get("high_priority", 0)
+    sanctions = count_sanctions(aml_data.get("alerts", []))
+    return {
+        "aml_alerts_total": aml.get("total_alerts", 0),
+        "aml_high_priority": high_priority,
+        "sanctions_alerts": sanctions,
+        "pending_reviews": aml.get("pending_review", 0),
+        "kyc_compliance_rate": round(kyc_compliance_rate(kyc_data.get("summary", {})), 1),
+        "kyc_expiring_soon": len(kyc_data.get("expiring_soon", [])),
+        "regulatory_deadlines": len(aml_data.get("regulatory_deadlines", [])),
+        "risk_score": compliance_risk_score(sanctions, high_priority),
+        "status": "CRITICAL" if sanctions > 0 else "WARNING" if high_priority >= 3 else "OK",
+    }
@@ -0,0 +1,19 @@
+from typing import Any, Dict
+from analytics.scoring import overall_risk_score
+
+STATUS_ORDER = ("OK", "WARNING", "CRITICAL")
+
+
+def executive_assessment(treasury: Dict[str, Any], portfolio: Dict[str, Any], compliance: Dict[str, Any]) -> Dict[str, Any]:
+    """Roll the domain overviews up into the briefing status and distribution flags."""
+    statuses = {"treasury": treasury["status"], "portfolio": portfolio["status"], "compliance": compliance["status"]}
+    overall_status = max(statuses.values(), key=STATUS_ORDER.index)
+    return {
+        "overall_status": overall_status,
+        "overall_risk_score": overall_risk_score(
+            (treasury["risk_score"], portfolio["risk_score"], compliance["risk_score"])
+        ),
+        "domain_status": statuses,
+        "priority_items": sum(1 for status in statuses.values() if status != "OK"),
+        "requires_ceo_attention": overall_status == "CRITICAL" or compliance["sanctions_alerts"] > 0,
+    }
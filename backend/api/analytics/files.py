@@ -0,0 +1,30 @@
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DATA_PATH = os.getenv("DATA_PATH", "/app/data")
+
+
+def _coerce(value: Optional[str]) -> Any:
+    """Convert a CSV cell to int or float where it parses as one."""
+    if value is None or value == "":
+        return None
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def read_csv(relpath: str, data_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Read a data CSV into a list of dicts with numeric cells converted."""
+    with open(Path(data_path or DATA_PATH) / relpath, "r", newline="") as f:
+        return [{key: _coerce(value) for key, value in row.items()} for row in csv.DictReader(f)]
+
+
+def read_json(relpath: str, data_path: Optional[str] = None) -> Dict[str, Any]:
+    with open(Path(data_path or DATA_PATH) / relpath, "r") as f:
+        return json.load(f)
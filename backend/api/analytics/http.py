@@ -0,0 +1,18 @@
+import json
+import urllib.request
+from typing import Any, Dict
+
+
+def post_json(url: str, payload: Dict[str, Any], timeout: float = 10.0) -> Any:
+    """POST a JSON body and decode the JSON (or text) response."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        body = response.read().decode()
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
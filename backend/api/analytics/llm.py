@@ -0,0 +1,21 @@
+import os
+from typing import Any, Dict, Optional
+from analytics.http import post_json
+
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://ollama:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:3b")
+
+
+def generate(prompt: str, options: Optional[Dict[str, Any]] = None, timeout: float = 120.0) -> Optional[str]:
+    """Run a non-streaming Ollama completion; returns None if Ollama fails or is unreachable."""
+    payload = {
+        "model": OLLAMA_MODEL,
+        "prompt": prompt,
+        "stream": False,
+        "options": options or {"temperature": 0.3},
+    }
+    try:
+        return post_json(f"{OLLAMA_HOST}/api/generate", payload, timeout=timeout).get("response") or None
+    except Exception as e:
+        print(f"Ollama error: {e}")
+        return None
@@ -0,0 +1,25 @@
+from typing import Any, Dict
+
+
+def market_overview(news_data: Dict[str, Any], indicators_data: Dict[str, Any], headlines: int = 3) -> Dict[str, Any]:
+    """Executive one-glance market figures."""
+    market_summary = news_data.get("market_summary", {})
+    indicators = indicators_data.get("indicators", {})
+    rates = indicators.get("interest_rates", {})
+    indices = indicators.get("market_indices", {})
+    return {
+        "overall_sentiment": market_summary.get("overall_sentiment"),
+        "key_themes": market_summary.get("key_themes", []),
+        "risk_factors": market_summary.get("risk_factors", []),
+        "sp500_level": indices.get("sp500", {}).get("value"),
+        "sp500_change_pct": indices.get("sp500", {}).get("change_1d_pct"),
+        "vix": indices.get("vix", {}).get("value"),
+        "ten_year_yield": rates.get("10y_treasury_yield"),
+        "fed_funds_rate": rates.get("fed_funds_rate"),
+        "yield_curve": rates.get("yield_curve_status"),
+        "yield_curve_spread": rates.get("yield_curve_spread"),
+        "top_headlines": [
+            {"headline": a.get("headline"), "sentiment": a.get("sentiment")}
+            for a in news_data.get("articles", [])[:headlines]
+        ],
+    }
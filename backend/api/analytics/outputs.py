@@ -0,0 +1,21 @@
+import json
+import os
+from typing import Any
+
+
+def emit_outputs(**values: Any) -> None:
+    """Publish values as Kestra task outputs (`outputs.<task>.vars.<name>`).
+
+    Kestra picks up `::{"outputs": {...}}::` lines from script stdout; the
+    values are also printed readably for the task log.
+    """
+    print(json.dumps(values, indent=2, default=str))
+    print("::" + json.dumps({"outputs": values}, default=str) + "::")
+
+
+def task_input(name: str, default: Any = None) -> Any:
+    """Read a JSON value passed from an upstream task through an environment variable."""
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    return json.loads(raw)
@@ -0,0 +1,215 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+from analytics.scoring import status_level
+
+# Position weight (%) above which a holding counts as concentrated
+CONCENTRATION_LIMIT_PCT = 15
+
+
+def holdings_summary(holdings_data: Dict[str, Any], top: int = 5) -> Dict[str, Any]:
+    holdings = holdings_data.get("holdings", [])
+    by_weight = sorted(holdings, key=lambda h: h.get("weight", 0), reverse=True)
+    return {
+        "portfolio_id": holdings_data.get("portfolio_id"),
+        "total_aum": holdings_data.get("total_aum"),
+        "position_count": len(holdings),
+        "total_unrealized_pnl": sum(h.get("unrealized_pnl", 0) for h in holdings),
+        "winners_count": sum(1 for h in holdings if h.get("unrealized_pnl", 0) > 0),
+        "losers_count": sum(1 for h in holdings if h.get("unrealized_pnl", 0) < 0),
+        "max_position_weight": by_weight[0].get("weight", 0) if by_weight else 0,
+        "concentrated_positions": [
+            {"ticker": h.get("ticker"), "name": h.get("name"), "weight": h.get("weight")}
+            for h in by_weight
+            if h.get("weight", 0) > CONCENTRATION_LIMIT_PCT
+        ],
+        "top_positions": [
+            {"ticker": h.get("ticker"), "weight": h.get("weight"), "market_value": h.get("market_value")}
+            for h in by_weight[:top]
+        ],
+        "allocation": holdings_data.get("allocation_summary", {}),
+        "sector_concentration": holdings_data.get("sector_concentration", {}),
+    }
+
+
+def belongs_to_portfolio(row: Dict[str, Any], portfolio_id: str) -> bool:
+    """Whether a VaR row is `portfolio_id`'s; untagged rows (no or empty id) belong to the file's portfolio."""
+    return row.get("portfolio_id") in (None, "", portfolio_id)
+
+
+def latest_var_row(var_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return max(var_rows, key=lambda row: str(row.get("date", ""))) if var_rows else {}
+
+
+def var_summary(var_rows: List[Dict[str, Any]], var_threshold: float, risk_score_threshold: int) -> Dict[str, Any]:
+    """Latest VaR metrics, trend against the oldest row, and threshold breaches."""
+    latest = latest_var_row(var_rows)
+    oldest = min(var_rows, key=lambda row: str(row.get("date", ""))) if var_rows else latest
+    var_95 = latest.get("var_95_1d") or 0
+    risk_score = int(latest.get("risk_score") or 0)
+    return {
+        "as_of_date": latest.get("date"),
+        "current": {
+            key: latest.get(key)
+            for key in ("var_95_1d", "var_99_1d", "cvar_95", "max_drawdown", "sharpe_ratio", "volatility_30d", "risk_score")
+        },
+        "var_trend": "INCREASING" if var_95 > (oldest.get("var_95_1d") or 0) else "DECREASING",
+        "risk_trend": "INCREASING" if risk_score > (oldest.get("risk_score") or 0) else "DECREASING",
+        "var_breach": var_95 > var_threshold,
+        "risk_breach": risk_score > risk_score_threshold,
+    }
+
+
+def performance_summary(performance_data: Dict[str, Any]) -> Dict[str, Any]:
+    performance = performance_data.get("performance", {})
+    periods = {
+        name: {
+            "return_pct": performance.get(name, {}).get("return_pct"),
+            "benchmark_pct": performance.get(name, {}).get("benchmark_return"),
+            "alpha": performance.get(name, {}).get("alpha"),
+        }
+        for name in ("daily", "mtd", "ytd")
+    }
+    return {
+        "periods": periods,
+        "ytd_return_amount": performance.get("ytd", {}).get("return_amount"),
+        "attribution": performance_data.get("attribution", {}),
+        "top_contributors": performance_data.get("top_contributors", []),
+        "top_detractors": performance_data.get("top_detractors", []),
+        "underperforming_benchmark": (performance.get("ytd", {}).get("alpha") or 0) < 0,
+    }
+
+
+def market_context(news_data: Dict[str, Any], min_relevance: float = 0.8, limit: int = 5) -> Dict[str, Any]:
+    market_summary = news_data.get("market_summary", {})
+    relevant = [a for a in news_data.get("articles", []) if a.get("relevance_score", 0) > min_relevance]
+    return {
+        "market_sentiment": market_summary.get("overall_sentiment"),
+        "key_themes": market_summary.get("key_themes", []),
+        "risk_factors": market_summary.get("risk_factors", []),
+        "relevant_news": [
+            {"headline": a.get("headline"), "sentiment": a.get("sentiment"), "impact": a.get("impact_assessment")}
+            for a in relevant[:limit]
+        ],
+    }
+
+
+def portfolio_assessment(holdings: Dict[str, Any], var: Dict[str, Any], performance: Dict[str, Any]) -> Dict[str, Any]:
+    """Risk rating, rebalancing flag and priority actions from the portfolio summaries."""
+    risk_score = int(var["current"].get("risk_score") or 0)
+    actions = []
+    if var["var_breach"]:
+        actions.append("Reduce VaR back within limit")
+    for position in holdings["concentrated_positions"]:
+        actions.append(f"Consider reducing {position['ticker']} concentration ({position['weight']}%)")
+    if performance["underperforming_benchmark"]:
+        actions.append("Address benchmark underperformance")
+    if var["risk_trend"] == "INCREASING":
+        actions.append("Review drivers of rising risk score")
+    return {
+        "risk_score": risk_score,
+        "risk_rating": max(1, min(10, round(risk_score / 10))),
+        "status": status_level(risk_score),
+        "rebalancing_recommended": bool(holdings["concentrated_positions"]) or var["risk_breach"],
+        "priority_actions": actions,
+    }
+
+
+def portfolio_overview(
+    holdings_data: Dict[str, Any],
+    performance_data: Dict[str, Any],
+    var_rows: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Executive one-glance portfolio figures."""
+    latest = latest_var_row(var_rows)
+    ytd = performance_data.get("performance", {}).get("ytd", {})
+    daily = performance_data.get("performance", {}).get("daily", {})
+    risk_score = int(latest.get("risk_score") or 0)
+    return {
+        "total_aum": holdings_data.get("total_aum"),
+        "ytd_return_pct": ytd.get("return_pct"),
+        "ytd_return_amount": ytd.get("return_amount"),
+        "benchmark_variance": ytd.get("alpha"),
+        "daily_return_pct": daily.get("return_pct"),
+        "var_95_1d": latest.get("var_95_1d"),
+        "risk_score": risk_score,
+        "sharpe_ratio": latest.get("sharpe_ratio"),
+        "status": status_level(risk_score),
+    }
+
+
+def _value(row: Dict[str, Any], key: str, default: Any) -> Any:
+    value = row.get(key)
+    return default if value is None else value
+
+
+def partition_summary(
+    portfolio_id: str,
+    holdings_data: Dict[str, Any],
+    performance_data: Dict[str, Any],
+    var_rows: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Headline figures for one portfolio; the fields of the API's PortfolioData.
+
+    `var_rows` may hold several portfolios' history; only rows tagged with
+    `portfolio_id` (or untagged rows) are used.
+    """
+    rows = [row for row in var_rows if belongs_to_portfolio(row, portfolio_id)]
+    latest = latest_var_row(rows)
+    ytd = performance_data.get("performance", {}).get("ytd", {})
+    return {
+        "portfolio_id": portfolio_id,
+        "portfolio_name": holdings_data.get("portfolio_name"),
+        "date": str(latest["date"]) if latest else datetime.now().strftime("%Y-%m-%d"),
+        "holdings": holdings_data.get("holdings", []),
+        "total_aum": float(_value(holdings_data, "total_aum", 0)),
+        "var_95_1d": float(_value(latest, "var_95_1d", 0)),
+        "var_99_1d": float(_value(latest, "var_99_1d", 0)),
+        "sharpe_ratio": float(_value(latest, "sharpe_ratio", 0)),
+        "max_drawdown": float(_value(latest, "max_drawdown", 0)),
+        "risk_score": int(_value(latest, "risk_score", 50)),
+        "ytd_return": float(_value(ytd, "return_pct", 0)),
+        "benchmark_return": float(_value(ytd, "benchmark_return", 0)),
+        "alpha": float(_value(ytd, "alpha", 0)),
+    }
+
+
+def firm_rollup(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Firm-wide view over partition summaries.
+
+    VaR is summed without diversification benefit (a conservative upper
+    bound); risk score, YTD return and alpha are AUM-weighted.
+    """
+    summaries = sorted(summaries, key=lambda s: s["portfolio_id"])
+    total_aum = sum(s["total_aum"] for s in summaries)
+
+    def weighted(key: str) -> float:
+        if not total_aum:
+            return 0.0
+        return sum(s[key] * s["total_aum"] for s in summaries) / total_aum
+
+    risk_score = round(weighted("risk_score"))
+    return {
+        "date": max((s["date"] for s in summaries), default=datetime.now().strftime("%Y-%m-%d")),
+        "portfolio_count": len(summaries),
+        "total_aum": total_aum,
+        "total_var_95_1d": sum(s["var_95_1d"] for s in summaries),
+        "risk_score": risk_score,
+        "max_risk_score": max((s["risk_score"] for s in summaries), default=0),
+        "ytd_return": round(weighted("ytd_return"), 4),
+        "alpha": round(weighted("alpha"), 4),
+        "status": status_level(risk_score),
+        "portfolios": [
+            {
+                "portfolio_id": s["portfolio_id"],
+                "portfolio_name": s.get("portfolio_name"),
+                "date": s["date"],
+                "total_aum": s["total_aum"],
+                "var_95_1d": s["var_95_1d"],
+                "risk_score": s["risk_score"],
+                "ytd_return": s["ytd_return"],
+                "alpha": s["alpha"],
+                "status": status_level(s["risk_score"]),
+            }
+            for s in summaries
+        ],
+    }
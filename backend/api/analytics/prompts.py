@@ -0,0 +1,200 @@
+"""LLM context blocks built from the precomputed aggregates."""
+from typing import Any, Dict, List
+
+
+def _money(value: Any) -> str:
+    value = value or 0
+    return f"{'-' if value < 0 else ''}${abs(value):,.0f}"
+
+
+def _pct(value: Any) -> str:
+    return f"{value or 0:+.2f}%"
+
+
+def _lines(items: List[str], empty: str = "None") -> str:
+    return "\n".join(f"- {item}" for item in items) if items else f"- {empty}"
+
+
+def treasury_context(cash: Dict[str, Any], fx: Dict[str, Any], debt: Dict[str, Any], assessment: Dict[str, Any]) -> str:
+    regions = ", ".join(f"{region} ({pct}%)" for region, pct in cash["regional_distribution_pct"].items())
+    exposures = [
+        f"{currency}: Net position {exposure.get('net_position', 0):,}, Hedge ratio {exposure.get('hedge_ratio', 0):.0%}"
+        + (" (BELOW TARGET)" if any(a["currency"] == currency for a in fx["low_hedge_alerts"]) else "")
+        for currency, exposure in fx["exposures"].items()
+    ]
+    covenants = [
+        f"{issue['debt_id']} ({issue['instrument_type']}, {issue['lender']}): {issue['covenant_status']}"
+        for issue in debt["covenant_issues"]
+    ]
+    return f"""TREASURY DATA AS OF {cash['as_of_date']}:
+
+CASH POSITIONS:
+- Total USD Equivalent: {_money(cash['total_usd_equivalent'])} across {cash['account_count']} accounts
+- Banks: {', '.join(cash['banks'])}
+- Regional distribution: {regions}
+
+FX EXPOSURES:
+{_lines(exposures)}
+- Total unhedged exposure (USD): {_money(fx['total_unhedged_exposure_usd'])}
+
+DEBT OBLIGATIONS:
+- Total debt (USD): {_money(debt['total_debt_usd'])} across {debt['facility_count']} facilities
+- Weighted avg rate: {debt['weighted_avg_rate']}%
+- Upcoming payments (30 days): {_money(debt['upcoming_payments_30d'])} ({debt['upcoming_payment_count']} payments)
+
+COVENANT ISSUES:
+{_lines(covenants)}
+
+NET POSITION (USD): {_money(assessment['net_position_usd'])}
+CALCULATED RISK SCORE: {assessment['risk_score']}/100 ({assessment['status']})"""
+
+
+def portfolio_context(
+    holdings: Dict[str, Any],
+    var: Dict[str, Any],
+    performance: Dict[str, Any],
+    market: Dict[str, Any],
+    assessment: Dict[str, Any],
+) -> str:
+    current = var["current"]
+    allocation = ", ".join(f"{name} {weight}%" for name, weight in holdings["allocation"].items())
+    periods = [
+        f"{name.upper()}: {_pct(values['return_pct'])} (Benchmark: {_pct(values['benchmark_pct'])}, alpha {_pct(values['alpha'])})"
+        for name, values in performance["periods"].items()
+    ]
+    contributors = ", ".join(f"{c['ticker']} ({_pct(c.get('contribution'))})" for c in performance["top_contributors"])
+    detractors = ", ".join(f"{d['ticker']} ({_pct(d.get('contribution'))})" for d in performance["top_detractors"])
+    concentration = [f"{p['ticker']} ({p['name']}): {p['weight']}%" for p in holdings["concentrated_positions"]]
+    news = [f"{n['headline']} [{n['sentiment']}]" for n in market["relevant_news"]]
+    return f"""PORTFOLIO ANALYSIS DATA - {var['as_of_date']}:
+
+PORTFOLIO OVERVIEW:
+- Total AUM: {_money(holdings['total_aum'])} in {holdings['position_count']} positions
+- Asset Allocation: {allocation}
+- Total Unrealized P&L: {_money(holdings['total_unrealized_pnl'])} ({holdings['winners_count']} winners, {holdings['losers_count']} losers)
+
+RISK METRICS (Current):
+- VaR (95%, 1-day): {_money(current['var_95_1d'])} ({var['var_trend']})
+- VaR (99%, 1-day): {_money(current['var_99_1d'])}
+- CVaR (95%): {_money(current['cvar_95'])}
+- Risk Score: {current['risk_score']}/100 ({var['risk_trend']})
+- 30-day Volatility: {current['volatility_30d']}%
+- Sharpe Ratio: {current['sharpe_ratio']}
+- Max Drawdown: {current['max_drawdown']}%
+
+PERFORMANCE:
+{_lines(periods)}
+
+TOP CONTRIBUTORS: {contributors or 'None'}
+TOP DETRACTORS: {detractors or 'None'}
+
+CONCENTRATION RISK:
+{_lines(concentration)}
+
+MARKET CONTEXT ({market['market_sentiment']}):
+{_lines(news)}
+
+CALCULATED RISK RATING: {assessment['risk_rating']}/10"""
+
+
+def compliance_context(aml: Dict[str, Any], audit: Dict[str, Any], kyc: Dict[str, Any], assessment: Dict[str, Any]) -> str:
+    summary = aml["summary"]
+    critical = [
+        f"{a.get('alert_id')}: {a.get('type')} - {a.get('client_name')}, {a.get('currency')} {a.get('amount', 0):,.0f}, "
+        f"risk {a.get('risk_score')}/100. {a.get('recommended_action', '')}"
+        for a in {a.get("alert_id"): a for a in aml["critical_alerts"] + aml["sanctions_alerts"]}.values()
+    ]
+    deadlines = [f"{d.get('filing_type')} filing due {d.get('due_date')} ({d.get('status')})" for d in aml["pending_deadlines"]]
+    audit_items = [
+        f"{e.get('event_type')} by {e.get('user_id')}: {e.get('details')}"
+        for e in audit["unauthorized_access_attempts"] + audit["bulk_data_exports"]
+    ]
+    expiring = [
+        f"{c.get('client_id')} {c.get('client_name')} ({c.get('risk_rating')} risk): expires {c.get('kyc_expiry_date')} "
+        f"({c.get('days_until_expiry')} days)"
+        for c in kyc["urgent_expirations"]
+    ]
+    return f"""COMPLIANCE STATUS REPORT:
+
+AML ALERTS SUMMARY:
+- Total Active Alerts: {summary.get('total_alerts', 0)}
+- High Priority: {summary.get('high_priority', 0)}, Medium: {summary.get('medium_priority', 0)}, Low: {summary.get('low_priority', 0)}
+
+CRITICAL ALERTS REQUIRING IMMEDIATE ATTENTION:
+{_lines(critical)}
+
+REGULATORY DEADLINES:
+{_lines(deadlines)}
+
+AUDIT LOG ANALYSIS:
+- Events analysed: {audit['total_events']}, high/critical risk: {audit['critical_events_count']}
+- Failed logins: {audit['failed_login_attempts']}
+{_lines(audit_items, empty='No unauthorized access or bulk exports')}
+
+KYC STATUS:
+- Overall Compliance Rate: {kyc['compliance_rate']}%
+- Pending Reviews: {kyc['pending_reviews']} clients
+- Expired Documentation: {kyc['expired_docs']} clients
+- High-Risk Clients: {kyc['high_risk_clients']}
+
+URGENT KYC EXPIRATIONS:
+{_lines(expiring)}
+
+CALCULATED HEALTH SCORE: {assessment['health_score']}/100 ({assessment['rag_status']})"""
+
+
+def executive_context(
+    treasury: Dict[str, Any],
+    portfolio: Dict[str, Any],
+    compliance: Dict[str, Any],
+    market: Dict[str, Any],
+) -> str:
+    briefing = f"""EXECUTIVE FINANCIAL BRIEFING
+
+TREASURY POSITION
+Total Cash (USD equivalent): {_money(treasury['total_cash_usd'])}
+Total Debt Outstanding (USD): {_money(treasury['total_debt_usd'])}
+Net Cash Position: {_money(treasury['net_cash_position_usd'])}
+Active Accounts: {treasury['accounts_count']} across {len(treasury['regions'])} regions
+Covenant Status: {treasury['covenant_breaches']} breach(es), {treasury['covenant_warnings']} warning(s)
+Unhedged FX Exposure: {_money(treasury['fx_exposure_unhedged_usd'])}
+STATUS: {treasury['status']}
+
+INVESTMENT PORTFOLIO
+Total AUM: {_money(portfolio['total_aum'])}
+YTD Return: {_pct(portfolio['ytd_return_pct'])} ({_money(portfolio['ytd_return_amount'])})
+vs Benchmark: {_pct(portfolio['benchmark_variance'])}
+Daily Return: {_pct(portfolio['daily_return_pct'])}
+VaR (95%, 1-day): {_money(portfolio['var_95_1d'])}
+Risk Score: {portfolio['risk_score']}/100
+Sharpe Ratio: {portfolio['sharpe_ratio']}
+STATUS: {portfolio['status']}
+
+COMPLIANCE
+AML Alerts: {compliance['aml_alerts_total']} total ({compliance['aml_high_priority']} High Priority)
+Sanctions Matches: {compliance['sanctions_alerts']}
+KYC Compliance Rate: {compliance['kyc_compliance_rate']}%
+Expiring KYC: {compliance['kyc_expiring_soon']} clients
+Regulatory Deadlines: {compliance['regulatory_deadlines']} pending
+STATUS: {compliance['status']}"""
+    if not market:
+        return briefing
+
+    headlines = [f"{h['headline']} [{h['sentiment']}]" for h in market.get("top_headlines", [])]
+    return briefing + f"""
+
+MARKET ENVIRONMENT
+Overall Sentiment: {market.get('overall_sentiment')}
+S&P 500: {_pct(market.get('sp500_change_pct'))} today
+VIX: {market.get('vix')}
+10Y Treasury: {market.get('ten_year_yield')}%
+Yield Curve: {market.get('yield_curve')} ({market.get('yield_curve_spread')})
+
+Key Themes:
+{_lines(market.get('key_themes', []))}
+
+Top Headlines:
+{_lines(headlines)}
+
+Risk Factors:
+{_lines(market.get('risk_factors', []))}"""
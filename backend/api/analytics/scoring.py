@@ -0,0 +1,37 @@
+from typing import Iterable
+
+
+def status_level(score: int) -> str:
+    """OK / WARNING / CRITICAL for a 0-100 risk score."""
+    if score >= 80:
+        return "CRITICAL"
+    if score >= 60:
+        return "WARNING"
+    return "OK"
+
+
+def rag_status(score: int) -> str:
+    return {"CRITICAL": "RED", "WARNING": "AMBER", "OK": "GREEN"}[status_level(score)]
+
+
+def treasury_risk_score(covenant_breaches: int, covenant_warnings: int) -> int:
+    score = 50
+    if covenant_breaches > 0:
+        score += 30
+    if covenant_warnings > 0:
+        score += 15
+    return min(score, 100)
+
+
+def compliance_risk_score(sanctions_matches: int, high_priority_count: int) -> int:
+    score = 40
+    if sanctions_matches > 0:
+        score += 40
+    score += high_priority_count * 10
+    return min(score, 100)
+
+
+def overall_risk_score(scores: Iterable[int]) -> int:
+    """Unweighted mean of the domain risk scores."""
+    scores = list(scores)
+    return int(sum(scores) / len(scores)) if scores else 0
@@ -0,0 +1,169 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from analytics.scoring import status_level, treasury_risk_score
+
+# Indicative conversion rates to USD
+FX_TO_USD = {"USD": 1, "EUR": 1.08, "GBP": 1.27, "JPY": 0.0067, "CHF": 1.14, "CAD": 0.74}
+
+# Hedge ratio below which an FX exposure is flagged
+HEDGE_RATIO_TARGET = 0.7
+
+
+def to_usd(amount: float, currency: str) -> float:
+    return amount * FX_TO_USD.get(currency, 1)
+
+
+def total_usd(rows: Iterable[Dict[str, Any]], amount_key: str) -> float:
+    return sum(to_usd(row[amount_key] or 0, row["currency"]) for row in rows)
+
+
+def covenant_counts(debt_rows: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+    """Return (breaches, warnings) across debt instruments."""
+    breaches = warnings = 0
+    for row in debt_rows:
+        status = row.get("covenant_status")
+        if status == "BREACH":
+            breaches += 1
+        elif status == "WARNING":
+            warnings += 1
+    return breaches, warnings
+
+
+def latest_cash_rows(cash_rows: List[Dict[str, Any]]) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """Rows of the most recent date in a cash position history."""
+    if not cash_rows:
+        return None, []
+    latest = max(str(row["date"]) for row in cash_rows)
+    return latest, [row for row in cash_rows if str(row["date"]) == latest]
+
+
+def cash_summary(cash_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    latest_date, positions = latest_cash_rows(cash_rows)
+    totals: Dict[str, Dict[str, float]] = defaultdict(lambda: {"balance": 0.0, "available_balance": 0.0})
+    usd_by_region: Dict[str, float] = defaultdict(float)
+    for row in positions:
+        totals[row["currency"]]["balance"] += row["balance"] or 0
+        totals[row["currency"]]["available_balance"] += row["available_balance"] or 0
+        usd_by_region[row.get("region") or "Other"] += to_usd(row["balance"] or 0, row["currency"])
+
+    total = total_usd(positions, "balance")
+    return {
+        "as_of_date": latest_date,
+        "positions": positions,
+        "totals_by_currency": dict(totals),
+        "total_usd_equivalent": round(total, 2),
+        "account_count": len(positions),
+        "banks": sorted({row.get("bank") for row in positions if row.get("bank")}),
+        "regional_distribution_pct": {
+            region: round(amount / total * 100, 1) if total else 0.0
+            for region, amount in sorted(usd_by_region.items(), key=lambda item: -item[1])
+        },
+    }
+
+
+def fx_summary(fx_data: Dict[str, Any]) -> Dict[str, Any]:
+    exposures = fx_data.get("exposures", {})
+    low_hedge_alerts = [
+        {
+            "currency": currency,
+            "hedge_ratio": exposure.get("hedge_ratio"),
+            "unhedged_exposure": exposure.get("unhedged_exposure"),
+        }
+        for currency, exposure in exposures.items()
+        if exposure.get("hedge_ratio", 1) < HEDGE_RATIO_TARGET
+    ]
+    return {
+        "rates": fx_data.get("rates", {}),
+        "exposures": exposures,
+        "total_unhedged_exposure_usd": round(
+            sum(to_usd(exposure.get("unhedged_exposure", 0), currency) for currency, exposure in exposures.items()), 2
+        ),
+        "low_hedge_alerts": low_hedge_alerts,
+    }
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def debt_summary(debt_rows: List[Dict[str, Any]], today: Optional[date] = None, horizon_days: int = 30) -> Dict[str, Any]:
+    today = today or date.today()
+    horizon = today + timedelta(days=horizon_days)
+    upcoming = [
+        row for row in debt_rows
+        if (_as_date(row.get("next_payment_date")) or date.max) <= horizon
+    ]
+    total_principal = sum(row["principal"] or 0 for row in debt_rows)
+    weighted_rate = (
+        sum((row["principal"] or 0) * (row["interest_rate"] or 0) for row in debt_rows) / total_principal
+        if total_principal else 0.0
+    )
+    breaches, warnings = covenant_counts(debt_rows)
+    return {
+        "total_debt_usd": round(total_usd(debt_rows, "principal"), 2),
+        "facility_count": len(debt_rows),
+        "weighted_avg_rate": round(weighted_rate, 2),
+        "upcoming_payments_30d": round(sum(row.get("payment_amount") or 0 for row in upcoming), 2),
+        "upcoming_payment_count": len(upcoming),
+        "covenant_breaches": breaches,
+        "covenant_warnings": warnings,
+        "covenant_issues": [
+            {
+                "debt_id": row.get("debt_id"),
+                "instrument_type": row.get("instrument_type"),
+                "lender": row.get("lender"),
+                "covenant_status": row.get("covenant_status"),
+            }
+            for row in debt_rows
+            if row.get("covenant_status") != "COMPLIANT"
+        ],
+    }
+
+
+def treasury_assessment(cash: Dict[str, Any], fx: Dict[str, Any], debt: Dict[str, Any]) -> Dict[str, Any]:
+    """Risk score and alerts from the cash, FX and debt summaries."""
+    risk_score = treasury_risk_score(debt["covenant_breaches"], debt["covenant_warnings"])
+    alerts = [
+        {
+            "type": "COVENANT_BREACH" if issue["covenant_status"] == "BREACH" else "COVENANT_WARNING",
+            "severity": "CRITICAL" if issue["covenant_status"] == "BREACH" else "WARNING",
+            "item": issue["debt_id"],
+        }
+        for issue in debt["covenant_issues"]
+    ]
+    alerts += [
+        {"type": "HEDGE_RATIO_LOW", "severity": "WARNING", "currency": alert["currency"]}
+        for alert in fx["low_hedge_alerts"]
+    ]
+    return {
+        "risk_score": risk_score,
+        "status": status_level(risk_score),
+        "net_position_usd": round(cash["total_usd_equivalent"] - debt["total_debt_usd"], 2),
+        "alerts": alerts,
+    }
+
+
+def treasury_overview(cash_rows: List[Dict[str, Any]], fx_data: Dict[str, Any], debt_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Executive one-glance treasury figures."""
+    cash = cash_summary(cash_rows)
+    fx = fx_summary(fx_data)
+    debt = debt_summary(debt_rows)
+    assessment = treasury_assessment(cash, fx, debt)
+    return {
+        "total_cash_usd": round(cash["total_usd_equivalent"], 0),
+        "total_debt_usd": round(debt["total_debt_usd"], 0),
+        "net_cash_position_usd": round(assessment["net_position_usd"], 0),
+        "accounts_count": cash["account_count"],
+        "regions": list(cash["regional_distribution_pct"]),
+        "covenant_breaches": debt["covenant_breaches"],
+        "covenant_warnings": debt["covenant_warnings"],
+        "fx_exposure_unhedged_usd": round(fx["total_unhedged_exposure_usd"], 0),
+        "risk_score": assessment["risk_score"],
+        "status": assessment["status"],
+    }
@@ -0,0 +1 @@
+# Performance benchmarks - run from backend/api with: python -m benchmarks.<name>
@@ -0,0 +1,63 @@
+"""Throughput benchmark for the streaming audit anomaly detector.
+
+Usage (from backend/api):
+    python -m benchmarks.audit_anomalies [event_count]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from services.audit_anomalies import AuditAnomalyDetector
+
+TARGET_EVENTS_PER_SECOND = 100_000
+
+EVENT_TYPES = [
+    "DATA_ACCESS",
+    "DATA_ACCESS",
+    "DATA_ACCESS",
+    "LOGIN",
+    "FAILED_LOGIN",
+    "PERMISSION_CHANGE",
+    "TRANSACTION_APPROVAL",
+    "REPORT_GENERATION",
+]
+
+
+def generate_events(count: int, seed: int = 42) -> list:
+    """Build a time-ordered synthetic audit stream."""
+    rng = random.Random(seed)
+    start = datetime(2024, 12, 11, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        ts = start + timedelta(milliseconds=i * 50)
+        events.append({
+            "timestamp": ts.isoformat().replace("+00:00", "Z"),
+            "event_id": f"EVT-{i}",
+            "event_type": rng.choice(EVENT_TYPES),
+            "user_id": f"USR-{rng.randrange(500):03d}",
+            "ip_address": f"10.0.{rng.randrange(16)}.{rng.randrange(256)}",
+        })
+    return events
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    events = generate_events(count)
+
+    detector = AuditAnomalyDetector()
+    started = time.perf_counter()
+    raised = detector.process_many(events)
+    elapsed = time.perf_counter() - started
+
+    rate = count / elapsed
+    print(f"events:     {count:,}")
+    print(f"anomalies:  {raised:,}")
+    print(f"elapsed:    {elapsed:.3f}s")
+    print(f"throughput: {rate:,.0f} events/s (target {TARGET_EVENTS_PER_SECOND:,})")
+    print(f"tracked keys: users={len(detector.by_user)} failed-login ips={len(detector.failed_logins_by_ip)}")
+    if rate < TARGET_EVENTS_PER_SECOND:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
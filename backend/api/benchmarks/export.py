@@ -0,0 +1,111 @@
+"""Bulk export benchmark: throughput and memory of the streaming exporters.
+
+Writes a synthetic cash_positions.csv and news_feed.json with N rows each to
+a temporary data directory, then drains each export format's generator and
+reports rows/s, output size and the peak Python heap while streaming
+(tracemalloc). Peak memory should stay flat as N grows, except for the JSON
+dataset with snapshots disabled, which has to load the whole document.
+
+Usage (from backend/api):
+    python -m benchmarks.export [n_rows]
+"""
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+def write_cash_positions(path: Path, n: int) -> None:
+    rng = random.Random(5)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "account_name", "currency", "balance", "available_balance", "bank", "region"])
+        for i in range(n):
+            balance = round(rng.uniform(0, 10_000_000), 2)
+            writer.writerow([
+                f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                f"Account {i}",
+                rng.choice(["USD", "EUR", "GBP"]),
+                balance,
+                round(balance * 0.95, 2),
+                rng.choice(["JPMorgan Chase", "HSBC", "BNP Paribas"]),
+                rng.choice(["North America", "Europe", "Asia Pacific"]),
+            ])
+
+
+def write_news_feed(path: Path, n: int) -> None:
+    rng = random.Random(6)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    articles = [
+        {
+            "id": f"NEWS-{i}",
+            "headline": f"Headline {i} on {rng.choice(['rates', 'earnings', 'credit', 'FX'])}",
+            "source": rng.choice(["Reuters", "Bloomberg", "WSJ"]),
+            "published_at": f"2024-12-{1 + i % 28:02d}T{i % 24:02d}:00:00Z",
+            "category": rng.choice(["MONETARY_POLICY", "EARNINGS", "MACRO"]),
+            "sentiment": rng.choice(["POSITIVE", "NEUTRAL", "NEGATIVE"]),
+            "sentiment_score": round(rng.uniform(-1, 1), 2),
+            "relevance_score": round(rng.uniform(0, 1), 2),
+            "summary": "Synthetic article body " * 4,
+            "tickers_mentioned": rng.sample(["SPY", "TLT", "JPM", "AAPL", "XLF"], 2),
+            "impact_assessment": "Neutral",
+        }
+        for i in range(n)
+    ]
+    with open(path, "w") as f:
+        json.dump({"articles": articles, "market_summary": {}}, f)
+
+
+def measure(label: str, fmt: str, stream, make_query, n: int) -> None:
+    started = time.perf_counter()
+    size = sum(len(chunk) for chunk in stream(make_query()))
+    elapsed = time.perf_counter() - started
+
+    # Separate pass: tracing allocations slows the export down
+    tracemalloc.start()
+    for _ in stream(make_query()):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"  {label:13} {fmt:8} {elapsed:7.2f} s {n / elapsed:10,.0f} rows/s "
+        f"{size / 1e6:8.1f} MB out  peak heap {peak / 1e6:6.2f} MB"
+    )
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_cash_positions(Path(data_dir) / "treasury" / "cash_positions.csv", n)
+        write_news_feed(Path(data_dir) / "market" / "news_feed.json", n)
+        os.environ["DATA_PATH"] = data_dir
+        os.environ["SNAPSHOT_DIR"] = os.path.join(data_dir, ".snapshot")
+
+        from config import settings
+        from services.exporter import STREAMERS, ExportQuery, resolve_dataset
+        from services.snapshot import snapshot_manager
+
+        dataset = resolve_dataset("treasury")
+        print(f"Exporting {n:,} cash positions")
+        for label, filters in (("all rows", []), ("currency=USD", ["currency=USD"])):
+            for fmt, stream in STREAMERS.items():
+                measure(label, fmt, stream, lambda: ExportQuery(dataset, filters=filters), n)
+
+        news = resolve_dataset("market")
+        print(f"Exporting {n:,} news articles (JSON source)")
+        # Published once up front, as warm-up does in the API
+        snapshot_manager.publish_all(Path(data_dir))
+        for label, enabled in (("snapshot", True), ("direct read", False)):
+            settings.snapshot_enabled = enabled
+            for fmt, stream in STREAMERS.items():
+                measure(label, fmt, stream, lambda: ExportQuery(news), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Model construction benchmark: per-record validation vs bulk construction.
+
+Builds 100k synthetic AML alerts, holdings and cash positions the way the
+loaders used to (one validated model per row, `iterrows` for CSV data) and
+the way they do now (`frame_records`/`dict_records` + `build_models`), with
+`model_construct` for reference, then the bulk path again with
+STRICT_VALIDATION off and on. Then serializes a response both with
+FastAPI-style re-validation and through `model_response`.
+
+Flat models such as Holding gain little from bulk building: each record
+still has every value cast in Python by `dict_records`, and pydantic-core's
+per-model cost is the same either way. Only the per-row constructor call is
+saved, so the ratio moves around 1x with allocator and GC noise; each
+timing starts from a collected heap to keep runs comparable.
+
+Usage (from backend/api):
+    python -m benchmarks.model_construction [n_records]
+"""
+import gc
+import random
+import sys
+import time
+from typing import Callable, List
+from fastapi.encoders import jsonable_encoder
+import pandas as pd
+from pydantic import TypeAdapter
+from config import settings
+from models.schemas import AMLAlert, CashPosition, ComplianceData, Holding
+from services.data_loader import AML_ALERT_FIELDS, CASH_POSITION_FIELDS, HOLDING_FIELDS
+from services.model_builder import build_models, dict_records, frame_records
+
+
+def make_alerts(n: int) -> List[dict]:
+    rng = random.Random(7)
+    return [
+        {
+            "alert_id": f"AML-{i:06d}",
+            "type": rng.choice(["STRUCTURING", "SANCTIONS_MATCH", "UNUSUAL_PATTERN"]),
+            "risk_score": rng.randint(1, 100),
+            "priority": rng.choice(["LOW", "MEDIUM", "HIGH"]),
+            "status": "PENDING",
+            "entity_name": f"Entity {i}",
+            "amount": round(rng.uniform(1_000, 5_000_000), 2),
+            "currency": rng.choice(["USD", "EUR", "GBP"]),
+        }
+        for i in range(n)
+    ]
+
+
+def make_holdings(n: int) -> List[dict]:
+    rng = random.Random(11)
+    return [
+        {
+            "ticker": f"T{i:05d}",
+            "name": f"Holding {i}",
+            "asset_class": rng.choice(["EQUITY", "FIXED_INCOME", "CASH"]),
+            "quantity": rng.randint(1, 10_000),
+            "current_price": round(rng.uniform(1, 500), 2),
+            "market_value": round(rng.uniform(1_000, 1_000_000), 2),
+            "weight_pct": round(rng.uniform(0, 5), 3),
+            "unrealized_pnl": round(rng.uniform(-50_000, 50_000), 2),
+        }
+        for i in range(n)
+    ]
+
+
+def make_cash_frame(n: int) -> pd.DataFrame:
+    rng = random.Random(13)
+    return pd.DataFrame(
+        {
+            "account_name": [f"Account {i}" for i in range(n)],
+            "currency": [rng.choice(["USD", "EUR", "GBP"]) for _ in range(n)],
+            "balance": [round(rng.uniform(0, 10_000_000), 2) for _ in range(n)],
+            "available_balance": [round(rng.uniform(0, 10_000_000), 2) for _ in range(n)],
+            "bank": [rng.choice(["JPM", "HSBC", "BNP"]) for _ in range(n)],
+            "region": [rng.choice(["NA", "EMEA", "APAC"]) for _ in range(n)],
+        }
+    )
+
+
+def per_record(model_cls, items: List[dict], spec) -> list:
+    """The previous loader pattern: validate one model per source row."""
+    return [
+        model_cls(**{name: cast(item.get(column, default)) for name, (column, default, cast) in spec.items()})
+        for item in items
+    ]
+
+
+def per_row(model_cls, df: pd.DataFrame, spec) -> list:
+    """The previous CSV loader pattern: `iterrows` plus one validated model per row."""
+    return [
+        model_cls(**{name: cast(row.get(column, default)) for name, (column, default, cast) in spec.items()})
+        for _, row in df.iterrows()
+    ]
+
+
+def construct(model_cls, records: List[dict]) -> list:
+    construct_one = model_cls.model_construct
+    return [construct_one(**record) for record in records]
+
+
+def timed(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    alerts, holdings, cash = make_alerts(n), make_holdings(n), make_cash_frame(n)
+    cases = [
+        ("AMLAlert", [
+            ("per-record", lambda: per_record(AMLAlert, alerts, AML_ALERT_FIELDS)),
+            ("model_construct", lambda: construct(AMLAlert, dict_records(alerts, AML_ALERT_FIELDS))),
+            ("build_models", lambda: build_models(AMLAlert, dict_records(alerts, AML_ALERT_FIELDS))),
+        ]),
+        ("Holding", [
+            ("per-record", lambda: per_record(Holding, holdings, HOLDING_FIELDS)),
+            ("model_construct", lambda: construct(Holding, dict_records(holdings, HOLDING_FIELDS))),
+            ("build_models", lambda: build_models(Holding, dict_records(holdings, HOLDING_FIELDS))),
+        ]),
+        ("Cash", [
+            ("iterrows", lambda: per_row(CashPosition, cash, CASH_POSITION_FIELDS)),
+            ("model_construct", lambda: construct(CashPosition, frame_records(cash, CASH_POSITION_FIELDS))),
+            ("build_models", lambda: build_models(CashPosition, frame_records(cash, CASH_POSITION_FIELDS))),
+        ]),
+    ]
+
+    print(f"Building {n:,} records per model (best of 3)")
+    for label, variants in cases:
+        baseline = None
+        for name, build in variants:
+            elapsed = timed(build)
+            baseline = baseline or elapsed
+            print(
+                f"  {label:9} {name:16} {elapsed * 1000:9.1f} ms "
+                f"{n / elapsed:12,.0f} rec/s  {baseline / elapsed:5.1f}x"
+            )
+
+    print("build_models with STRICT_VALIDATION off / on")
+    bulk = [
+        ("AMLAlert", lambda: build_models(AMLAlert, dict_records(alerts, AML_ALERT_FIELDS))),
+        ("Holding", lambda: build_models(Holding, dict_records(holdings, HOLDING_FIELDS))),
+        ("Cash", lambda: build_models(CashPosition, frame_records(cash, CASH_POSITION_FIELDS))),
+    ]
+    for label, build in bulk:
+        fast = timed(build)
+        settings.strict_validation = True
+        try:
+            strict = timed(build)
+        finally:
+            settings.strict_validation = False
+        print(f"  {label:9} off {fast * 1000:9.1f} ms   on {strict * 1000:9.1f} ms  {strict / fast:5.2f}x")
+
+    response = ComplianceData(
+        date="2024-01-01",
+        aml_alerts=build_models(AMLAlert, dict_records(alerts, AML_ALERT_FIELDS)),
+        total_alerts=n,
+        high_priority_count=0,
+        sanctions_matches=0,
+        kyc_compliance_rate=100.0,
+        clients_pending_review=0,
+        critical_audit_events=0,
+    )
+    response_adapter = TypeAdapter(ComplianceData)
+
+    def revalidate_and_encode() -> bytes:
+        # What FastAPI does for a returned model with a response_model
+        validated = response_adapter.validate_python(response, from_attributes=True)
+        return str(jsonable_encoder(response_adapter.dump_python(validated, mode="json"))).encode()
+
+    slow = timed(revalidate_and_encode)
+    fast = timed(response.model_dump_json)
+    print(f"Serializing ComplianceData with {n:,} alerts")
+    print(f"  re-validate + encode       {slow * 1000:9.1f} ms")
+    print(f"  model_dump_json            {fast * 1000:9.1f} ms  {slow / fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
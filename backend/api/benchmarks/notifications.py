@@ -0,0 +1,86 @@
+"""Notification dispatcher benchmark: an incident burst of alerts, digested.
+
+Submits a burst of alerts spread over a few alert types and priorities to a
+dispatcher with in-memory channels, then reports how many messages were sent
+per channel and how long the batched audit write took compared with writing
+one audit row per alert.
+
+Usage (from backend/api):
+    python -m benchmarks.notifications [alert_count]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+ALERT_TYPES = ["TREASURY", "PORTFOLIO", "COMPLIANCE", "EXECUTIVE"]
+PRIORITIES = ["LOW", "MEDIUM", "MEDIUM", "HIGH", "HIGH", "CRITICAL"]
+
+
+async def run(n: int) -> None:
+    from models.schemas import NotificationRequest
+    from services.notifications import MemoryChannel, NotificationDispatcher
+    from services.results_store import results_store
+
+    rng = random.Random(7)
+    alerts = [
+        NotificationRequest(
+            alert_type=rng.choice(ALERT_TYPES),
+            priority=rng.choice(PRIORITIES),
+            title=f"Alert {i}",
+            message=f"Threshold breached on check {i}",
+            slack_channel=rng.choice(["#finance-alerts", "#executive-alerts"]),
+        )
+        for i in range(n)
+    ]
+    channels = {name: MemoryChannel(name) for name in ("slack", "email", "ticket")}
+    dispatcher = NotificationDispatcher(channels, window=0.5, critical_window=0.1, max_digest_size=n)
+    dispatcher.start()
+
+    started = time.perf_counter()
+    dispatcher.submit(alerts)
+    submitted = time.perf_counter() - started
+    await dispatcher.stop()  # closes the open windows instead of waiting them out
+    total = time.perf_counter() - started
+
+    print(f"{n:,} alerts submitted in {submitted * 1000:.1f} ms, digested and delivered in {total * 1000:.0f} ms")
+    # What the per-alert subflow sent: one message per alert and enabled channel
+    per_alert_messages = {
+        "slack": sum(alert.include_slack for alert in alerts),
+        "email": sum(alert.include_email for alert in alerts),
+        "ticket": sum(alert.priority.value == "CRITICAL" for alert in alerts),
+    }
+    for name, channel in channels.items():
+        print(f"  {name:8} {channel.sent:6,} messages (one per alert: {per_alert_messages[name]:,})")
+
+    rows = [
+        {
+            "digest_id": "bench", "alert_type": alert.alert_type, "priority": alert.priority.value,
+            "title": alert.title, "message": alert.message, "channels": ["slack", "email"],
+            "recipients": alert.recipients, "slack_channel": alert.slack_channel, "received_at": "2024-12-11T00:00:00",
+        }
+        for alert in alerts
+    ]
+    started = time.perf_counter()
+    for row in rows:
+        results_store.save_notification_audit([row])
+    per_alert = time.perf_counter() - started
+    started = time.perf_counter()
+    results_store.save_notification_audit(rows)
+    batched = time.perf_counter() - started
+    print(f"  audit, one write per alert {per_alert * 1000:9.1f} ms")
+    print(f"  audit, one batched write   {batched * 1000:9.1f} ms ({per_alert / batched:.0f}x)")
+    results_store.close()
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as state_dir:
+        os.environ["RESULTS_DB_PATH"] = os.path.join(state_dir, "results.db")
+        asyncio.run(run(n))
+
+
+if __name__ == "__main__":
+    main()
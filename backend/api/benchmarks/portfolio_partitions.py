@@ -0,0 +1,113 @@
+"""Portfolio partition benchmark: cold rollup, serial vs parallel, and single-portfolio refresh.
+
+Writes N synthetic portfolios (holdings, performance and VaR history per
+portfolio directory) to a temporary data directory, then times:
+
+- a cold firm-wide rollup aggregated inline (one process)
+- a cold rollup aggregated across worker processes
+- a warm rollup (every portfolio served from its cache)
+- a rollup after touching one portfolio, which re-aggregates only that one
+
+Usage (from backend/api):
+    python -m benchmarks.portfolio_partitions [n_portfolios] [holdings_per_portfolio]
+"""
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+TICKERS = ["AAPL", "MSFT", "JPM", "XOM", "JNJ", "GLD", "LQD", "US10Y", "TLT", "VNQ", "EEM", "HYG"]
+
+
+def write_portfolio(directory: Path, portfolio_id: str, n_holdings: int, rng: random.Random) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    holdings = []
+    for i in range(n_holdings):
+        market_value = round(rng.uniform(50_000, 2_000_000), 2)
+        holdings.append({
+            "ticker": f"{rng.choice(TICKERS)}{i}",
+            "name": f"Security {i}",
+            "asset_class": rng.choice(["Equity", "Fixed Income", "Commodities", "Cash"]),
+            "quantity": rng.randint(100, 10_000),
+            "current_price": round(rng.uniform(10, 500), 2),
+            "market_value": market_value,
+            "unrealized_pnl": round(market_value * rng.uniform(-0.2, 0.3), 2),
+            "weight": round(100 / n_holdings, 2),
+        })
+    total_aum = round(sum(h["market_value"] for h in holdings), 2)
+    with open(directory / "holdings.json", "w") as f:
+        json.dump({"portfolio_id": portfolio_id, "portfolio_name": f"Portfolio {portfolio_id}",
+                   "total_aum": total_aum, "holdings": holdings}, f)
+
+    ytd = round(rng.uniform(-5, 20), 2)
+    benchmark = round(rng.uniform(0, 15), 2)
+    with open(directory / "performance.json", "w") as f:
+        json.dump({"portfolio_id": portfolio_id, "performance": {
+            "ytd": {"return_pct": ytd, "benchmark_return": benchmark, "alpha": round(ytd - benchmark, 2)},
+        }}, f)
+
+    with open(directory / "var_metrics.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "portfolio_id", "var_95_1d", "var_99_1d", "cvar_95",
+                         "max_drawdown", "sharpe_ratio", "volatility_30d", "risk_score"])
+        for day in range(30):
+            var_95 = round(total_aum * rng.uniform(0.005, 0.02), 2)
+            writer.writerow([
+                (date(2024, 12, 11) - timedelta(days=day)).isoformat(), portfolio_id,
+                var_95, round(var_95 * 1.5, 2), round(var_95 * 1.26, 2),
+                round(rng.uniform(-10, -1), 2), round(rng.uniform(0.5, 2.5), 2),
+                round(rng.uniform(5, 25), 2), rng.randint(20, 95),
+            ])
+
+
+def timed(label: str, fn) -> float:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:42} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_holdings = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as data_dir:
+        partitions = Path(data_dir) / "portfolio" / "portfolios"
+        ids = [f"PF-{i:05d}" for i in range(n)]
+        for portfolio_id in ids:
+            write_portfolio(partitions / portfolio_id, portfolio_id, n_holdings, rng)
+        os.environ["DATA_PATH"] = data_dir
+        os.environ["SNAPSHOT_ENABLED"] = "false"
+
+        from services.data_loader import DataLoaderService
+        from services.portfolio_partitions import PartitionAggregator, portfolio_aggregator
+        import services.data_loader as data_loader_module
+
+        print(f"{n:,} portfolios x {n_holdings} holdings, {portfolio_aggregator.workers} workers")
+
+        # Inline baseline: a fresh loader with an aggregator that never uses the pool
+        data_loader_module.portfolio_aggregator = PartitionAggregator(workers=1)
+        serial = timed("cold rollup, inline", DataLoaderService().get_portfolio_rollup)
+
+        data_loader_module.portfolio_aggregator = portfolio_aggregator
+        loader = DataLoaderService()
+        timed("cold rollup, parallel (incl. pool start)", loader.get_portfolio_rollup)
+        parallel = timed("cold rollup, parallel (warm pool)", DataLoaderService().get_portfolio_rollup)
+        print(f"  parallel speed-up (warm pool)              {serial / parallel:9.1f} x")
+
+        timed("warm rollup (all cached)", loader.get_portfolio_rollup)
+        holdings = partitions / ids[n // 2] / "holdings.json"
+        os.utime(holdings, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        timed("rollup after one portfolio changed", loader.get_portfolio_rollup)
+        timed("single portfolio by id (cached)", lambda: loader.get_portfolio_data(ids[0]))
+        portfolio_aggregator.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Shared-snapshot memory benchmark: resident memory of N API workers.
+
+Copies the sample data to a temporary directory and replaces
+cash_positions.csv and news_feed.json with N synthetic rows each, then starts
+W worker processes, with snapshots enabled and disabled, that each hold one
+of these workloads:
+
+- frame: the cash positions DataFrame
+- document: the parsed news feed document
+- loaders: the treasury and market responses (get_treasury_data and
+  get_market_data), which build per-worker models from the data
+
+Once every worker has loaded, each reports from /proc/self/smaps_rollup:
+
+- RSS: resident pages, counting shared pages in full in every worker
+- PSS: resident pages, with shared pages split between the workers mapping
+  them; the sum of PSS is what the workers cost together
+- the growth of both over the worker's footprint before it loaded any data
+
+Linux only (smaps_rollup).
+
+Usage (from backend/api):
+    python -m benchmarks.snapshot_memory [n_rows] [workers]
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from benchmarks.export import write_cash_positions, write_news_feed
+
+SAMPLE_DATA = Path(__file__).resolve().parent.parent.parent / "data"
+
+
+def memory_kb() -> Dict[str, int]:
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return fields
+
+
+WORKLOADS = ("frame", "document", "loaders")
+
+
+def worker(data_path: str, snapshot_dir: str, snapshot_enabled: bool, workload: str, loaded, measure, results) -> None:
+    os.environ["DATA_PATH"] = data_path
+    os.environ["SNAPSHOT_DIR"] = snapshot_dir
+    os.environ["SNAPSHOT_ENABLED"] = str(snapshot_enabled).lower()
+    import pandas  # noqa: F401  imported up front so the baseline includes it
+    import pyarrow  # noqa: F401
+    from services.data_loader import DataLoaderService
+    from services.snapshot import snapshot_manager
+
+    loader = DataLoaderService()
+    before = memory_kb()
+    if workload == "frame":
+        held = snapshot_manager.read_csv(Path(data_path) / "treasury" / "cash_positions.csv")
+    elif workload == "document":
+        held = snapshot_manager.read_json(Path(data_path) / "market" / "news_feed.json")
+    else:
+        held = (loader.get_treasury_data(), loader.get_market_data())
+    loaded.wait()  # every worker holds its data before anyone measures
+    after = memory_kb()
+    results.put({
+        "rss": after["Rss"],
+        "pss": after["Pss"],
+        "rss_growth": after["Rss"] - before["Rss"],
+        "pss_growth": after["Pss"] - before["Pss"],
+    })
+    measure.wait()
+    del held
+
+
+def run(data_path: Path, snapshot_dir: Path, snapshot_enabled: bool, workload: str, workers: int) -> None:
+    context = multiprocessing.get_context("spawn")
+    loaded, measure, results = context.Barrier(workers), context.Barrier(workers + 1), context.Queue()
+    processes = [
+        context.Process(
+            target=worker, args=(str(data_path), str(snapshot_dir), snapshot_enabled, workload, loaded, measure, results),
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    measure.wait()
+    for process in processes:
+        process.join()
+
+    label = f"{workload:8}  {'snapshot' if snapshot_enabled else 'direct':8}"
+    mean = {key: sum(report[key] for report in reports) / workers / 1024 for key in reports[0]}
+    total_pss = sum(report["pss"] for report in reports) / 1024
+    print(
+        f"  {label}  per worker: RSS {mean['rss']:7.1f} MB (+{mean['rss_growth']:6.1f})  "
+        f"PSS {mean['pss']:7.1f} MB (+{mean['pss_growth']:6.1f})   all workers: PSS {total_pss:7.1f} MB"
+    )
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp) / "data"
+        shutil.copytree(SAMPLE_DATA, data_path)
+        write_cash_positions(data_path / "treasury" / "cash_positions.csv", n)
+        write_news_feed(data_path / "market" / "news_feed.json", n)
+        print(f"{n:,} cash positions and articles, {workers} workers")
+        for workload in WORKLOADS:
+            run(data_path, Path(tmp) / "snapshot", True, workload, workers)
+            run(data_path, Path(tmp) / "snapshot", False, workload, workers)
+
+
+if __name__ == "__main__":
+    main()
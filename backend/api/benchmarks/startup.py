@@ -0,0 +1,81 @@
+"""Cold-start benchmark: import time, time to first byte and time to ready.
+
+Starts the API in a fresh uvicorn process and measures:
+- import time of `main` (in a separate interpreter)
+- time from process spawn to the first /health/live response
+- time from process spawn until /health/ready returns 200 (warm-up done)
+- latency of the first and second /data/dashboard requests
+
+Usage (from backend/api):
+    DATA_PATH=../data python -m benchmarks.startup
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+import httpx
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import() -> float:
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=API_DIR, env=os.environ.copy())
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def wait_for(client: httpx.Client, url: str, started: float, timeout: float = 60.0) -> float:
+    """Poll `url` until it returns 200; return seconds since `started`."""
+    while time.perf_counter() - started < timeout:
+        try:
+            if client.get(url).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def timed_get(client: httpx.Client, url: str) -> float:
+    started = time.perf_counter()
+    client.get(url).raise_for_status()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    print(f"import main:          {measure_import() * 1000:8.1f} ms")
+
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=API_DIR,
+        env=os.environ.copy(),
+    )
+    try:
+        with httpx.Client(timeout=10.0) as client:
+            live = wait_for(client, f"{base}/health/live", started)
+            ready = wait_for(client, f"{base}/health/ready", started)
+            first = timed_get(client, f"{base}/data/dashboard")
+            second = timed_get(client, f"{base}/data/dashboard")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    print(f"first byte (live):    {live * 1000:8.1f} ms")
+    print(f"ready (warm-up done): {ready * 1000:8.1f} ms")
+    print(f"first /data/dashboard:{first * 1000:8.1f} ms")
+    print(f"next /data/dashboard: {second * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
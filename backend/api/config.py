@@ -17,9 +17,88 @@ class Settings(BaseSettings):
     ollama_host: str = os.getenv("OLLAMA_HOST", "http://ollama:11434")
     ollama_model: str = "llama3.2:3b"
 
+    # Health Monitoring
+    health_probe_interval_seconds: float = 10.0
+    health_probe_timeout_seconds: float = 3.0
+    health_latency_window: int = 30
+    kestra_breaker_failure_threshold: int = 3
+    kestra_breaker_reset_seconds: float = 30.0
+    # Seconds between background retries of failed warm-up steps
+    warmup_retry_interval_seconds: float = 10.0
+
     # Data Paths
     data_base_path: str = os.getenv("DATA_PATH", "/app/data")
 
+    # Portfolio Partitions
+    # One directory per portfolio_id under the data path; the top-level
+    # portfolio/ files are the default portfolio
+    portfolio_partitions_dir: str = "portfolio/portfolios"
+    default_portfolio_id: str = "CORP-MAIN-001"
+    # Worker processes for per-portfolio aggregation (0 = one per CPU); the pool
+    # is only used when at least `portfolio_parallel_min` portfolios are stale
+    portfolio_workers: int = int(os.getenv("PORTFOLIO_WORKERS", "0"))
+    portfolio_parallel_min: int = 32
+
+    # Response Models
+    # Validate every record and response model (slower); off by default since
+    # the data files are produced by our own generators
+    strict_validation: bool = os.getenv("STRICT_VALIDATION", "false").lower() == "true"
+
+    # Bulk Export
+    export_chunk_rows: int = 1000
+
+    # Shared Data Snapshot
+    snapshot_enabled: bool = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+    snapshot_dir: str = os.getenv("SNAPSHOT_DIR", "")
+
+    # Results Store
+    results_db_path: str = os.getenv("RESULTS_DB_PATH", "results.db")
+    results_poll_interval_seconds: float = 30.0
+    results_poll_batch_size: int = 25
+    # Pages of results_poll_batch_size read per poll while catching up after a burst
+    results_poll_max_pages: int = 20
+    results_retention_days: int = 90
+    results_max_executions: int = 5000
+    results_compaction_interval_seconds: float = 3600.0
+
+    # Execution Logs
+    logs_follow_interval_seconds: float = 2.0
+    logs_follow_max_seconds: float = 3600.0
+
+    # Audit Anomaly Detection
+    audit_window_seconds: int = 900
+    audit_failed_login_threshold: int = 3
+    audit_permission_change_threshold: int = 5
+    audit_user_activity_threshold: int = 50
+    audit_business_hours_start: int = 7
+    audit_business_hours_end: int = 19
+    audit_max_anomalies: int = 1000
+
+    # Notifications
+    # Alerts of the same alert_type and priority arriving within the window are
+    # sent as one digest; CRITICAL alerts use the shorter window
+    notification_window_seconds: float = 30.0
+    notification_critical_window_seconds: float = 2.0
+    notification_max_digest_size: int = 50
+    notification_queue_size: int = 10000
+    notification_retries: int = 3
+    notification_retry_backoff_seconds: float = 1.0
+    # Per-channel send rate (messages per second) and burst
+    notification_slack_rate: float = 1.0
+    notification_email_rate: float = 5.0
+    notification_ticket_rate: float = 1.0
+    notification_burst: int = 3
+    notification_audit_retention_days: int = 365
+    slack_webhook_url: str = os.getenv("SLACK_WEBHOOK_URL", "")
+    smtp_host: str = os.getenv("SMTP_HOST", "")
+    smtp_port: int = int(os.getenv("SMTP_PORT", "587"))
+    smtp_username: str = os.getenv("SMTP_USERNAME", "")
+    smtp_password: str = os.getenv("SMTP_PASSWORD", "")
+    smtp_sender: str = os.getenv("SMTP_SENDER", "finance-alerts@company.com")
+
+    # Market News
+    news_dedup_threshold: float = 0.6
+
     # CORS Settings
     cors_origins: list = ["http://localhost:3000", "http://localhost:5173", "http://127.0.0.1:3000"]
 
@@ -1,8 +1,18 @@
-from fastapi import FastAPI
+import math
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 from config import settings
-from routers import workflows_router, data_router, health_router
+from routers import workflows_router, data_router, export_router, health_router, notifications_router
+from services.circuit_breaker import CircuitOpenError
+from services.health_monitor import health_monitor
+from services.notifications import notification_dispatcher
+from services.portfolio_partitions import portfolio_aggregator
+from services.results_ingester import results_ingester
+from services.results_store import results_store
+from services.warmup import warmup
 
 
 @asynccontextmanager
@@ -12,9 +22,21 @@ async def lifespan(app: FastAPI):
     print(f"Starting {settings.api_title} v{settings.api_version}")
     print(f"Kestra endpoint: {settings.kestra_host}")
     print(f"Ollama endpoint: {settings.ollama_host}")
+    # Pre-load every domain in the background; /health/ready reports when done
+    warmup.start()
+    health_monitor.start()
+    results_ingester.start()
+    notification_dispatcher.start()
     yield
     # Shutdown
     print("Shutting down API...")
+    await warmup.stop()
+    await results_ingester.stop()
+    await health_monitor.stop()
+    # Flushes pending digests and their audit rows, so before the store closes
+    await notification_dispatcher.stop()
+    results_store.close()
+    portfolio_aggregator.shutdown()
 
 
 app = FastAPI(
@@ -36,10 +58,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    """A dependency behind an open circuit breaker is down: answer 503 instead of waiting on it."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.breaker.reset_timeout))},
+    )
+
+
 # Include routers
 app.include_router(health_router)
 app.include_router(workflows_router)
 app.include_router(data_router)
+app.include_router(export_router)
+app.include_router(notifications_router)
 
 
 @app.get("/")
@@ -55,10 +90,16 @@ async def root():
             "dashboard": "/data/dashboard",
             "treasury": "/data/treasury",
             "portfolio": "/data/portfolio",
+            "portfolio_by_id": "/data/portfolio/{portfolio_id}",
+            "portfolios": "/data/portfolios",
             "compliance": "/data/compliance",
             "market": "/data/market",
+            "export": "/export/{domain}?format=ndjson|csv|parquet",
+            "notifications": "/notifications/alerts",
             "trigger_workflow": "/workflows/trigger",
             "executions": "/workflows/executions",
+            "history": "/workflows/history",
+            "latest_results": "/workflows/results/latest",
         },
     }
 
@@ -2,11 +2,21 @@ from models.schemas import (
     WorkflowTriggerRequest,
     WorkflowTriggerResponse,
     ExecutionStatus,
+    ExecutionCallback,
+    ExecutionLogPage,
     AgentResult,
+    NotificationRequest,
+    NotificationAccepted,
+    NotificationStats,
     TreasuryData,
     PortfolioData,
+    PortfolioRollup,
     ComplianceData,
+    AuditAnomalyReport,
+    KycExpiringPage,
     MarketData,
+    MarketSentiment,
     DashboardSummary,
+    ExportDatasetInfo,
     HealthCheck,
 )
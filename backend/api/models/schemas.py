@@ -23,6 +23,22 @@ class ExecutionState(str, Enum):
     SUCCESS = "SUCCESS"
     FAILED = "FAILED"
     KILLED = "KILLED"
+    WARNING = "WARNING"
+
+
+class LogLevel(str, Enum):
+    TRACE = "TRACE"
+    DEBUG = "DEBUG"
+    INFO = "INFO"
+    WARN = "WARN"
+    ERROR = "ERROR"
+
+
+class AlertPriority(str, Enum):
+    LOW = "LOW"
+    MEDIUM = "MEDIUM"
+    HIGH = "HIGH"
+    CRITICAL = "CRITICAL"
 
 
 # Request/Response Models
@@ -50,6 +66,19 @@ class ExecutionStatus(BaseModel):
     outputs: Optional[Dict[str, Any]] = None
 
 
+class ExecutionCallback(BaseModel):
+    execution_id: str
+
+
+class ExecutionLogPage(BaseModel):
+    execution_id: str
+    logs: List[Dict[str, Any]]
+    next_cursor: Optional[int] = None
+    has_more: bool = False
+    finished: bool = False
+    cached: bool = False
+
+
 # Agent Result Models
 class AgentAlert(BaseModel):
     type: str
@@ -68,6 +97,42 @@ class AgentResult(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+# Notification Models
+class NotificationRequest(BaseModel):
+    alert_type: str = Field(..., description="TREASURY, PORTFOLIO, COMPLIANCE or EXECUTIVE")
+    priority: AlertPriority = AlertPriority.MEDIUM
+    title: str
+    message: str
+    recipients: List[str] = ["team@company.com"]
+    slack_channel: str = "#finance-alerts"
+    include_slack: bool = True
+    include_email: bool = True
+
+
+class NotificationAccepted(BaseModel):
+    queued: int
+    queue_depth: int
+
+
+class ChannelStats(BaseModel):
+    channel: str
+    backend: str
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    rate_limited_seconds: float = 0.0
+
+
+class NotificationStats(BaseModel):
+    queue_depth: int
+    pending_alerts: int
+    alerts_received: int
+    alerts_dropped: int
+    digests_sent: int
+    audit_rows_written: int
+    channels: List[ChannelStats]
+
+
 # Data Models
 class CashPosition(BaseModel):
     account_name: str
@@ -112,6 +177,8 @@ class Holding(BaseModel):
 
 
 class PortfolioData(BaseModel):
+    portfolio_id: Optional[str] = None
+    portfolio_name: Optional[str] = None
     date: str
     holdings: List[Holding]
     total_aum: float
@@ -125,6 +192,32 @@ class PortfolioData(BaseModel):
     alpha: float
 
 
+class PortfolioRollupItem(BaseModel):
+    portfolio_id: str
+    portfolio_name: Optional[str] = None
+    date: str
+    total_aum: float
+    var_95_1d: float
+    risk_score: int
+    ytd_return: float
+    alpha: float
+    status: StatusLevel
+
+
+class PortfolioRollup(BaseModel):
+    """Firm-wide view across every portfolio partition."""
+    date: str
+    portfolio_count: int
+    total_aum: float
+    total_var_95_1d: float
+    risk_score: int
+    max_risk_score: int
+    ytd_return: float
+    alpha: float
+    status: StatusLevel
+    portfolios: List[PortfolioRollupItem]
+
+
 class AMLAlert(BaseModel):
     alert_id: str
     type: str
@@ -147,6 +240,47 @@ class ComplianceData(BaseModel):
     critical_audit_events: int
 
 
+class AuditAnomaly(BaseModel):
+    anomaly_type: str
+    severity: str
+    key: str
+    event_id: str
+    event_type: str
+    user_id: str
+    ip_address: str
+    timestamp: datetime
+    count: int
+    window_seconds: int
+    message: str
+
+
+class AuditAnomalyReport(BaseModel):
+    date: str
+    events_processed: int
+    total_anomalies: int
+    counts_by_type: Dict[str, int]
+    anomalies: List[AuditAnomaly]
+
+
+class KycExpiringClient(BaseModel):
+    client_id: str
+    client_name: str
+    kyc_expiry_date: str
+    days_until_expiry: int
+    risk_rating: str
+    last_review_date: Optional[str] = None
+    required_documents: List[str] = []
+
+
+class KycExpiringPage(BaseModel):
+    as_of_date: str
+    days: int
+    total: int
+    offset: int
+    limit: int
+    clients: List[KycExpiringClient]
+
+
 class NewsItem(BaseModel):
     headline: str
     source: str
@@ -166,6 +300,24 @@ class MarketData(BaseModel):
     treasury_10y: float
 
 
+class SentimentAggregate(BaseModel):
+    key: str
+    article_count: int
+    weighted_score: float
+    label: str
+
+
+class MarketSentiment(BaseModel):
+    window: str
+    as_of: datetime
+    ticker: Optional[str] = None
+    overall: SentimentAggregate
+    by_category: List[SentimentAggregate]
+    by_ticker: List[SentimentAggregate]
+    articles_ingested: int
+    duplicates_collapsed: int
+
+
 class DashboardSummary(BaseModel):
     timestamp: datetime
     overall_status: StatusLevel
@@ -183,6 +335,23 @@ class DashboardSummary(BaseModel):
     next_scheduled_run: Optional[datetime] = None
 
 
+class ExportDatasetInfo(BaseModel):
+    domain: str
+    dataset: str
+    default: bool
+    columns: Dict[str, str]
+
+
+class ComponentHealth(BaseModel):
+    status: str
+    last_checked: Optional[datetime] = None
+    last_success: Optional[datetime] = None
+    latency_ms: Optional[float] = None
+    avg_latency_ms: Optional[float] = None
+    consecutive_failures: int = 0
+    error: Optional[str] = None
+
+
 class HealthCheck(BaseModel):
     status: str
     api_version: str
@@ -190,3 +359,6 @@ class HealthCheck(BaseModel):
     ollama_status: str
     database_status: str
     timestamp: datetime
+    data_status: str = "unknown"
+    kestra_circuit: str = "closed"
+    components: Dict[str, ComponentHealth] = {}
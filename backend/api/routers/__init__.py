@@ -1,3 +1,5 @@
 from routers.workflows import router as workflows_router
 from routers.data import router as data_router
 from routers.health import router as health_router
+from routers.export import router as export_router
+from routers.notifications import router as notifications_router
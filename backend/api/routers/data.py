@@ -1,12 +1,20 @@
-from fastapi import APIRouter
+import asyncio
+from fastapi import APIRouter, HTTPException, Query
+from typing import Literal, Optional
+from datetime import date, datetime, timezone
 from models.schemas import (
     TreasuryData,
     PortfolioData,
+    PortfolioRollup,
     ComplianceData,
+    AuditAnomalyReport,
+    KycExpiringPage,
     MarketData,
+    MarketSentiment,
     DashboardSummary,
 )
 from services.data_loader import data_loader_service
+from services.model_builder import model_response
 
 router = APIRouter(prefix="/data", tags=["Data"])
 
@@ -19,7 +27,7 @@ async def get_dashboard():
     Returns overall risk scores, status indicators, and key metrics
     across all financial domains (Treasury, Portfolio, Compliance).
     """
-    return data_loader_service.get_dashboard_summary()
+    return model_response(data_loader_service.get_dashboard_summary())
 
 
 @router.get("/treasury", response_model=TreasuryData)
@@ -33,7 +41,7 @@ async def get_treasury_data():
     - FX exposures and hedge ratios
     - Net position calculations
     """
-    return data_loader_service.get_treasury_data()
+    return model_response(data_loader_service.get_treasury_data())
 
 
 @router.get("/portfolio", response_model=PortfolioData)
@@ -41,13 +49,44 @@ async def get_portfolio_data():
     """
     Get portfolio data including holdings, risk metrics, and performance.
 
+    Serves the default portfolio; see `/data/portfolio/{portfolio_id}` and
+    `/data/portfolios` for the other portfolios.
+
     Returns:
     - Current holdings with market values
     - VaR metrics (95% and 99% confidence)
     - YTD performance vs benchmark
     - Risk score and Sharpe ratio
     """
-    return data_loader_service.get_portfolio_data()
+    return model_response(data_loader_service.get_portfolio_data())
+
+
+@router.get("/portfolios", response_model=PortfolioRollup)
+async def get_portfolio_rollup():
+    """
+    Get the firm-wide rollup across every portfolio.
+
+    Returns total AUM, undiversified VaR (sum of portfolio VaRs), AUM-weighted
+    risk score, YTD return and alpha, and one summary line per portfolio.
+    Portfolios whose files changed are re-aggregated in parallel worker
+    processes; the rest are served from their own caches.
+    """
+    # Off the event loop: a cold rollup may aggregate hundreds of portfolios
+    return model_response(await asyncio.to_thread(data_loader_service.get_portfolio_rollup))
+
+
+@router.get("/portfolio/{portfolio_id}", response_model=PortfolioData)
+async def get_portfolio_by_id(portfolio_id: str):
+    """
+    Get holdings, risk metrics, and performance for one portfolio.
+
+    - **portfolio_id**: Portfolio identifier (see `/data/portfolios`)
+    """
+    try:
+        portfolio = await asyncio.to_thread(data_loader_service.get_portfolio_data, portfolio_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown portfolio '{portfolio_id}'")
+    return model_response(portfolio)
 
 
 @router.get("/compliance", response_model=ComplianceData)
@@ -61,7 +100,50 @@ async def get_compliance_data():
     - KYC compliance rate
     - Critical audit events
     """
-    return data_loader_service.get_compliance_data()
+    return model_response(data_loader_service.get_compliance_data())
+
+
+@router.get("/compliance/anomalies", response_model=AuditAnomalyReport)
+async def get_compliance_anomalies(limit: Optional[int] = Query(default=100, ge=1, le=1000)):
+    """
+    Get anomalies detected in the audit log.
+
+    Audit events are consumed in a single streaming pass with sliding-window
+    counters per user, IP address and event type. Detects:
+    - Repeated failed logins from one IP address
+    - Bursts of permission changes
+    - Transaction approvals outside business hours
+    - Activity spikes for a single user
+
+    - **limit**: Maximum number of anomalies to return (newest first)
+    """
+    return model_response(data_loader_service.get_audit_anomalies(limit=limit))
+
+
+@router.get("/compliance/kyc/expiring", response_model=KycExpiringPage)
+async def get_kyc_expiring(
+    days: int = Query(default=30, ge=0, le=3650),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    as_of: Optional[date] = None,
+    include_expired: bool = False,
+):
+    """
+    Get clients whose KYC documentation expires soon, highest risk first.
+
+    - **days**: Look-ahead window in days
+    - **offset** / **limit**: Pagination over the ordered result set
+    - **as_of**: Reference date for days-until-expiry (defaults to today)
+    - **include_expired**: Also include clients whose KYC has already expired
+    """
+    page = data_loader_service.get_kyc_expiring(
+        days=days,
+        offset=offset,
+        limit=limit,
+        as_of=as_of,
+        include_expired=include_expired,
+    )
+    return model_response(page)
 
 
 @router.get("/market", response_model=MarketData)
@@ -75,4 +157,27 @@ async def get_market_data():
     - Interest rates (Fed funds, 10Y Treasury)
     - Overall market sentiment
     """
-    return data_loader_service.get_market_data()
+    return model_response(data_loader_service.get_market_data())
+
+
+@router.get("/market/sentiment", response_model=MarketSentiment)
+async def get_market_sentiment(
+    window: Literal["1h", "1d"] = "1d",
+    ticker: Optional[str] = None,
+    as_of: Optional[datetime] = None,
+):
+    """
+    Get rolling, relevance-weighted news sentiment.
+
+    Near-duplicate headlines (e.g. syndicated copies) are collapsed before
+    aggregation. The window ends at the newest article in the feed unless
+    `as_of` is given; pass the current time to see sentiment decay when no
+    new articles arrive.
+
+    - **window**: Aggregation window (1h or 1d)
+    - **ticker**: Restrict ticker aggregates to a single symbol
+    - **as_of**: End of the window (defaults to the newest article; naive times are UTC)
+    """
+    if as_of is not None and as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+    return model_response(data_loader_service.get_market_sentiment(window=window, ticker=ticker, as_of=as_of))
@@ -0,0 +1,83 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from models.schemas import ExportDatasetInfo
+from services.exporter import (
+    EXPORT_DATASETS,
+    EXPORT_MEDIA_TYPES,
+    STREAMERS,
+    ExportError,
+    ExportQuery,
+    list_datasets,
+    resolve_dataset,
+)
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("", response_model=List[ExportDatasetInfo])
+async def get_export_datasets():
+    """
+    List exportable datasets and their column types, grouped by domain.
+    """
+    return [
+        ExportDatasetInfo(domain=dataset.domain, dataset=dataset.name, default=default, columns=dataset.columns)
+        for dataset, default in list_datasets()
+    ]
+
+
+@router.get("/{domain}")
+def export_domain(
+    domain: str,
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    dataset: Optional[str] = None,
+    portfolio_id: Optional[str] = None,
+    columns: Optional[str] = None,
+    where: List[str] = Query(default=[]),
+    limit: Optional[int] = Query(default=None, ge=1),
+):
+    """
+    Stream a domain's rows as NDJSON, CSV or Parquet.
+
+    Rows are read, filtered and written in chunks, so memory use does not
+    grow with the size of the export. JSON-backed datasets stream from the
+    shared snapshot; with SNAPSHOT_ENABLED=false their document is loaded
+    whole first.
+
+    A cell that does not convert to its column type is exported as null and
+    logged. If the export fails part-way the response is aborted (and NDJSON
+    ends with an `export_error` line), so a truncated file is never a clean 200.
+
+    - **format**: ndjson (default), csv or parquet
+    - **dataset**: Table within the domain (defaults to the domain's main table, see `GET /export`)
+    - **portfolio_id**: Portfolio domain only; export that portfolio's files instead of the default portfolio's
+    - **columns**: Comma-separated columns to include, in order (defaults to all)
+    - **where**: Row filter `column<op>value` with =, !=, >, >=, <, <=; repeat for AND.
+      `=` and `!=` accept comma-separated values, e.g. `currency=USD,EUR`
+    - **limit**: Maximum number of rows
+    """
+    if domain not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown domain '{domain}'")
+    export_dataset = resolve_dataset(domain, dataset)
+    if export_dataset is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}' for {domain}")
+    filename = export_dataset.name
+    if portfolio_id is not None:
+        if domain != "portfolio":
+            raise HTTPException(status_code=400, detail="portfolio_id only applies to the portfolio domain")
+        export_dataset = export_dataset.for_portfolio(portfolio_id)
+        if export_dataset is None:
+            raise HTTPException(status_code=404, detail=f"Unknown portfolio '{portfolio_id}'")
+        filename = f"{export_dataset.name}-{export_dataset.portfolio_id}"
+
+    selected = [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+    try:
+        query = ExportQuery(export_dataset, columns=selected, filters=where, limit=limit)
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        STREAMERS[format](query),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
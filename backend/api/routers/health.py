@@ -1,9 +1,11 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
-import httpx
 from config import settings
 from models.schemas import HealthCheck
+from services.health_monitor import health_monitor
 from services.kestra import kestra_service
+from services.warmup import warmup
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -13,36 +15,57 @@ async def health_check():
     """
     Check the health status of all services.
     Returns status of API, Kestra, Ollama, and database.
+
+    Answers from the latest background probe results, including last-success
+    timestamps and rolling latency per component. Until the first background
+    round finishes, components and the overall status are `unknown`; the
+    request never probes inline.
     """
-    # Check Kestra
-    kestra_health = await kestra_service.check_health()
-
-    # Check Ollama
-    ollama_status = "unknown"
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{settings.ollama_host}/api/tags")
-            ollama_status = "healthy" if response.status_code == 200 else "unhealthy"
-    except Exception:
-        ollama_status = "unreachable"
+    components = health_monitor.snapshot()
+    kestra_status = components["kestra"].status
+    ollama_status = components["ollama"].status
+    data_status = components["data"].status
 
     # Overall status
-    all_healthy = kestra_health.get("status") == "healthy" and ollama_status == "healthy"
+    if not health_monitor.has_results:
+        status = "unknown"
+    elif all(component.status == "healthy" for component in components.values()):
+        status = "healthy"
+    else:
+        status = "degraded"
 
     return HealthCheck(
-        status="healthy" if all_healthy else "degraded",
+        status=status,
         api_version=settings.api_version,
-        kestra_status=kestra_health.get("status", "unknown"),
+        kestra_status=kestra_status,
         ollama_status=ollama_status,
         database_status="healthy",  # Postgres is managed by Kestra
         timestamp=datetime.utcnow(),
+        data_status=data_status,
+        kestra_circuit=kestra_service.breaker.state,
+        components=components,
     )
 
 
 @router.get("/ready")
 async def readiness_check():
-    """Simple readiness probe for container orchestration."""
-    return {"status": "ready", "timestamp": datetime.utcnow().isoformat()}
+    """
+    Readiness probe for container orchestration.
+
+    Returns 503 until the start-up warm-up has loaded and aggregated every
+    data domain, so traffic is only routed to a worker with warm caches. A
+    worker whose warm-up had failing steps reports `degraded` (also 503)
+    until the background retry of those steps succeeds; the probe itself
+    only reports the current state.
+    """
+    body = {
+        "status": warmup.state,
+        "timestamp": datetime.utcnow().isoformat(),
+        "warmup": warmup.status(),
+    }
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content=body)
+    return body
 
 
 @router.get("/live")
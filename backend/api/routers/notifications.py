@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException
+from typing import List, Union
+from models.schemas import NotificationAccepted, NotificationRequest, NotificationStats
+from services.notifications import notification_dispatcher
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+
+
+@router.post("/alerts", response_model=NotificationAccepted, status_code=202)
+async def queue_alerts(alerts: Union[NotificationRequest, List[NotificationRequest]]):
+    """
+    Queue one alert or a list of alerts for delivery.
+
+    A batch is queued whole or rejected with 503 when the queue is full.
+    Alerts with the same alert_type and priority are collected for a short
+    window and sent as one digest per Slack channel and recipient list.
+    CRITICAL alerts also open an incident ticket.
+
+    - **alert_type**: TREASURY, PORTFOLIO, COMPLIANCE or EXECUTIVE
+    - **priority**: LOW, MEDIUM, HIGH or CRITICAL
+    - **recipients** / **slack_channel**: Where the digest goes
+    - **include_slack** / **include_email**: Channels to use
+    """
+    batch = alerts if isinstance(alerts, list) else [alerts]
+    queued = notification_dispatcher.submit(batch)
+    if queued < len(batch):
+        raise HTTPException(status_code=503, detail="Notification queue full, retry later")
+    return NotificationAccepted(queued=queued, queue_depth=notification_dispatcher.queue_depth)
+
+
+@router.get("/stats", response_model=NotificationStats)
+async def get_notification_stats():
+    """Queue depth, pending digests and per-channel delivery counters."""
+    return notification_dispatcher.stats()
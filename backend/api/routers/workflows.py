@@ -1,11 +1,20 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional, List, Dict, Any
+from datetime import datetime
 from models.schemas import (
     WorkflowTriggerRequest,
     WorkflowTriggerResponse,
     ExecutionStatus,
+    ExecutionCallback,
+    ExecutionLogPage,
+    LogLevel,
+    AgentResult,
 )
+from services.execution_logs import LogFilter, execution_log_service
 from services.kestra import kestra_service
+from services.results_ingester import results_ingester
+from services.results_store import results_store
 
 router = APIRouter(prefix="/workflows", tags=["Workflows"])
 
@@ -45,6 +54,43 @@ async def list_executions(
     return await kestra_service.list_executions(limit=limit, state=state)
 
 
+@router.get("/history", response_model=List[ExecutionStatus])
+async def get_execution_history(
+    flow_id: Optional[str] = None,
+    state: Optional[str] = None,
+    since: Optional[datetime] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+):
+    """
+    List finished executions from the local results store (no Kestra round trip).
+
+    - **flow_id**: Filter by flow
+    - **state**: Filter by final state (SUCCESS, FAILED, KILLED)
+    - **since**: Only executions started at or after this time
+    - **limit**: Maximum number of executions to return
+    """
+    return results_store.list_executions(flow_id=flow_id, state=state, since=since, limit=limit)
+
+
+@router.get("/results/latest", response_model=List[AgentResult])
+async def get_latest_results():
+    """Get the most recent AI summary for each agent from the local results store."""
+    return results_store.latest_agent_results()
+
+
+@router.post("/callback")
+async def execution_callback(callback: ExecutionCallback):
+    """
+    Receive a finished-execution notification from Kestra.
+
+    Only the execution id is taken from the request: the execution itself is
+    fetched from Kestra and stored locally, so dashboard and history reads
+    never need to call Kestra and callers cannot inject results.
+    """
+    stored = await results_ingester.ingest_execution(callback.execution_id)
+    return {"execution_id": callback.execution_id, "stored": stored}
+
+
 @router.get("/executions/{execution_id}", response_model=ExecutionStatus)
 async def get_execution(execution_id: str):
     """
@@ -58,15 +104,39 @@ async def get_execution(execution_id: str):
     return result
 
 
-@router.get("/executions/{execution_id}/logs")
-async def get_execution_logs(execution_id: str):
+@router.get("/executions/{execution_id}/logs", response_model=ExecutionLogPage)
+async def get_execution_logs(
+    execution_id: str,
+    task_id: Optional[str] = None,
+    level: Optional[LogLevel] = None,
+    after: Optional[int] = Query(default=None, ge=-1),
+    since: Optional[datetime] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=5000),
+    follow: bool = False,
+):
     """
-    Get logs for a specific execution.
+    Get logs for a specific execution, filtered and paginated.
+
+    Logs of finished executions are cached locally after the first request.
 
     - **execution_id**: The unique execution ID
+    - **task_id**: Only lines from this task
+    - **level**: Minimum log level (TRACE, DEBUG, INFO, WARN, ERROR)
+    - **after**: Index cursor; only lines after this index (use `next_cursor` from the previous page)
+    - **since**: Only lines logged at or after this timestamp
+    - **limit**: Page size (default: all matching lines)
+    - **follow**: Stream matching lines as NDJSON, including new ones, until the execution finishes
     """
-    logs = await kestra_service.get_execution_logs(execution_id)
-    return {"execution_id": execution_id, "logs": logs}
+    log_filter = LogFilter(task_id=task_id, min_level=level.value if level else None, since=since)
+    if follow:
+        stream = await execution_log_service.follow(execution_id, log_filter, after=after)
+        if stream is None:
+            raise HTTPException(status_code=404, detail="Execution not found")
+        return StreamingResponse(stream, media_type="application/x-ndjson")
+    result = await execution_log_service.page(execution_id, log_filter, after=after, limit=limit)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    return result
 
 
 @router.post("/trigger/treasury")
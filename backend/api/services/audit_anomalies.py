@@ -0,0 +1,272 @@
+import csv
+import io
+import os
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from config import settings
+from models.schemas import AuditAnomaly
+
+
+class SlidingWindowCounter:
+    """Per-key event counts over a sliding time window.
+
+    The window is split into fixed-size time buckets held in a ring; each
+    bucket only stores the keys seen during that bucket, and expired buckets
+    are subtracted from the running totals as time advances. Memory is bounded
+    by the number of distinct keys active inside the window.
+    """
+
+    def __init__(self, window_seconds: int, bucket_seconds: int = 60):
+        self.bucket_seconds = max(int(bucket_seconds), 1)
+        self.num_buckets = max(int(window_seconds) // self.bucket_seconds, 1)
+        self.window_seconds = self.num_buckets * self.bucket_seconds
+        self._buckets: Deque[Tuple[int, Dict[str, int]]] = deque()
+        self._totals: Dict[str, int] = {}
+        self._current_id = -1
+        self._current: Dict[str, int] = {}
+
+    def _expire(self, bucket_id: int) -> None:
+        oldest_allowed = bucket_id - self.num_buckets + 1
+        buckets = self._buckets
+        totals = self._totals
+        while buckets and buckets[0][0] < oldest_allowed:
+            _, expired = buckets.popleft()
+            for key, count in expired.items():
+                remaining = totals[key] - count
+                if remaining:
+                    totals[key] = remaining
+                else:
+                    del totals[key]
+
+    def add(self, key: str, ts: float) -> int:
+        """Record one event for `key` at epoch seconds `ts` and return the windowed count."""
+        bucket_id = int(ts) // self.bucket_seconds
+        if bucket_id > self._current_id:
+            self._expire(bucket_id)
+            self._current_id = bucket_id
+            self._current = {}
+            self._buckets.append((bucket_id, self._current))
+        elif bucket_id <= self._current_id - self.num_buckets:
+            # Older than the whole window: it can no longer contribute.
+            return self._totals.get(key, 0)
+        # Late events still inside the window are counted in the newest bucket.
+        bucket = self._current
+        bucket[key] = bucket.get(key, 0) + 1
+        totals = self._totals
+        total = totals.get(key, 0) + 1
+        totals[key] = total
+        return total
+
+    def count(self, key: str) -> int:
+        return self._totals.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+
+class AuditAnomalyDetector:
+    """Single-pass anomaly detector for audit log events.
+
+    Events are consumed one at a time via `process`, which returns any
+    anomalies raised by that event. Rules fire once when a windowed count
+    reaches its threshold, so a sustained burst yields one anomaly rather
+    than one per event.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = settings.audit_window_seconds,
+        failed_login_threshold: int = settings.audit_failed_login_threshold,
+        permission_change_threshold: int = settings.audit_permission_change_threshold,
+        user_activity_threshold: int = settings.audit_user_activity_threshold,
+        business_hours: Tuple[int, int] = (settings.audit_business_hours_start, settings.audit_business_hours_end),
+        max_anomalies: int = settings.audit_max_anomalies,
+    ):
+        self.window_seconds = window_seconds
+        self.failed_login_threshold = failed_login_threshold
+        self.permission_change_threshold = permission_change_threshold
+        self.user_activity_threshold = user_activity_threshold
+        self.business_hours = business_hours
+
+        bucket_seconds = max(window_seconds // 15, 1)
+        self.by_user = SlidingWindowCounter(window_seconds, bucket_seconds)
+        self.by_event_type = SlidingWindowCounter(window_seconds, bucket_seconds)
+        self.failed_logins_by_ip = SlidingWindowCounter(window_seconds, bucket_seconds)
+
+        self.events_processed = 0
+        self.anomalies: Deque[AuditAnomaly] = deque(maxlen=max_anomalies)
+        self.counts_by_type: Dict[str, int] = {}
+
+    @staticmethod
+    def _parse_timestamp(value: str) -> datetime:
+        ts = datetime.fromisoformat(value)
+        return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+    @classmethod
+    def event_time(cls, event: Dict[str, Any]) -> float:
+        """Epoch seconds of an event, or -inf when it has no usable timestamp (it is skipped anyway)."""
+        try:
+            return cls._parse_timestamp(event["timestamp"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return float("-inf")
+
+    def _raise(
+        self,
+        anomaly_type: str,
+        severity: str,
+        key: str,
+        event: Dict[str, Any],
+        ts: datetime,
+        count: int,
+        message: str,
+    ) -> AuditAnomaly:
+        anomaly = AuditAnomaly.model_construct(
+            anomaly_type=anomaly_type,
+            severity=severity,
+            key=key,
+            event_id=str(event.get("event_id", "")),
+            event_type=str(event.get("event_type", "")),
+            user_id=str(event.get("user_id", "")),
+            ip_address=str(event.get("ip_address", "")),
+            timestamp=ts,
+            count=count,
+            window_seconds=self.window_seconds,
+            message=message,
+        )
+        self.anomalies.append(anomaly)
+        self.counts_by_type[anomaly_type] = self.counts_by_type.get(anomaly_type, 0) + 1
+        return anomaly
+
+    def process(self, event: Dict[str, Any]) -> List[AuditAnomaly]:
+        """Consume one audit event and return the anomalies it raised."""
+        try:
+            ts = self._parse_timestamp(event["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            return []
+
+        self.events_processed += 1
+        epoch = ts.timestamp()
+        event_type = event.get("event_type", "")
+        user_id = event.get("user_id", "")
+        ip_address = event.get("ip_address", "")
+        raised = []
+
+        user_count = self.by_user.add(user_id, epoch)
+        type_count = self.by_event_type.add(event_type, epoch)
+
+        if event_type == "FAILED_LOGIN":
+            failures = self.failed_logins_by_ip.add(ip_address, epoch)
+            if failures == self.failed_login_threshold:
+                raised.append(self._raise(
+                    "REPEATED_FAILED_LOGIN", "HIGH", ip_address, event, ts, failures,
+                    f"{failures} failed logins from {ip_address} within {self.window_seconds}s",
+                ))
+        elif event_type == "PERMISSION_CHANGE":
+            if type_count == self.permission_change_threshold:
+                raised.append(self._raise(
+                    "PERMISSION_CHANGE_BURST", "HIGH", event_type, event, ts, type_count,
+                    f"{type_count} permission changes within {self.window_seconds}s",
+                ))
+        elif event_type == "TRANSACTION_APPROVAL":
+            start, end = self.business_hours
+            if not start <= ts.hour < end:
+                raised.append(self._raise(
+                    "OFF_HOURS_APPROVAL", "MEDIUM", user_id, event, ts, 1,
+                    f"Transaction approved by {user_id} at {ts.strftime('%H:%M')} UTC outside business hours",
+                ))
+
+        if user_count == self.user_activity_threshold:
+            raised.append(self._raise(
+                "USER_ACTIVITY_SPIKE", "MEDIUM", user_id, event, ts, user_count,
+                f"{user_count} events from {user_id} within {self.window_seconds}s",
+            ))
+
+        return raised
+
+    def process_many(self, events: Iterable[Dict[str, Any]]) -> int:
+        """Consume an event stream and return the number of anomalies raised."""
+        raised = 0
+        for event in events:
+            raised += len(self.process(event))
+        return raised
+
+    def recent_anomalies(self, limit: Optional[int] = None) -> List[AuditAnomaly]:
+        """Return raised anomalies, newest first."""
+        anomalies = list(reversed(self.anomalies))
+        return anomalies[:limit] if limit else anomalies
+
+
+class AuditLogTail:
+    """Feeds an audit log CSV into a detector incrementally.
+
+    Each `poll` reads only the complete lines appended since the previous
+    one, starting from the stored byte offset, and feeds them to the detector
+    in timestamp order, so the file itself may be in any order (the bundled
+    log is newest first). A rotated, truncated or rewritten file (new inode,
+    shorter than the offset, or the last consumed line no longer where it
+    was) starts a fresh detector and re-reads the file from the top; that is
+    also what happens when new events are written at the top of the file.
+    Appended events older than one window before the newest event already
+    processed no longer count towards any rule.
+    """
+
+    def __init__(self, path: Path, detector_factory: Callable[[], AuditAnomalyDetector] = AuditAnomalyDetector):
+        self.path = Path(path)
+        self._detector_factory = detector_factory
+        self._reset(None)
+
+    def _reset(self, stat: Optional[os.stat_result]) -> None:
+        self.detector = self._detector_factory()
+        self._inode = stat.st_ino if stat else None
+        self._mtime_ns = None
+        self._offset = 0
+        self._fieldnames: Optional[List[str]] = None
+        self._last_line = b""
+
+    def _still_appending(self, f, stat: os.stat_result) -> bool:
+        """True if the file is the one read so far, with data only added at the end."""
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            return False
+        if not self._last_line:
+            return True
+        f.seek(self._offset - len(self._last_line))
+        return f.read(len(self._last_line)) == self._last_line
+
+    def poll(self) -> int:
+        """Process lines appended since the last poll; return the number of new events."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            if self._inode is not None:
+                self._reset(None)
+            return 0
+        if stat.st_ino == self._inode and stat.st_mtime_ns == self._mtime_ns and stat.st_size == self._offset:
+            return 0
+
+        try:
+            with open(self.path, "rb") as f:
+                if not self._still_appending(f, stat):
+                    self._reset(stat)
+                f.seek(self._offset)
+                data = f.read()
+        except OSError as e:
+            print(f"Error reading {self.path}: {e}")
+            return 0
+        self._mtime_ns = stat.st_mtime_ns
+
+        # A trailing partial line is still being written; leave it for the next poll
+        complete = data[: data.rfind(b"\n") + 1]
+        if not complete:
+            return 0
+        self._offset += len(complete)
+        self._last_line = complete[complete.rfind(b"\n", 0, len(complete) - 1) + 1:]
+
+        rows = csv.reader(io.StringIO(complete.decode("utf-8", errors="replace"), newline=""))
+        if self._fieldnames is None:
+            self._fieldnames = next(rows, None) or []
+        events = [dict(zip(self._fieldnames, values)) for values in rows if values]
+        events.sort(key=AuditAnomalyDetector.event_time)
+        self.detector.process_many(events)
+        return len(events)
@@ -0,0 +1,71 @@
+import time
+from typing import Optional
+
+
+class CircuitBreaker:
+    """Fail-fast guard for calls to a dependency that is known to be down.
+
+    CLOSED: calls go through. After `failure_threshold` consecutive failures
+    the breaker OPENs and calls are rejected immediately. Once `reset_timeout`
+    has passed it goes HALF_OPEN and lets a single trial call through; that
+    call's outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a half-open trial slot whose call never completed (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+    def trip(self) -> None:
+        """Open the breaker immediately, e.g. when a health probe finds the dependency down."""
+        self.consecutive_failures = max(self.consecutive_failures, self.failure_threshold)
+        self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+    def __init__(self, breaker: CircuitBreaker):
+        super().__init__(f"{breaker.name} unavailable (circuit open)")
+        self.breaker = breaker
@@ -1,45 +1,199 @@
-import json
-import pandas as pd
+import csv
+import functools
+import threading
 from pathlib import Path
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterator, List, Optional, Tuple
+from datetime import date, datetime
+from analytics.compliance import count_sanctions, kyc_compliance_rate
+from analytics.market import market_overview
+from analytics.portfolio import firm_rollup
+from analytics.scoring import compliance_risk_score, overall_risk_score, status_level, treasury_risk_score
+from analytics.treasury import covenant_counts, total_usd
 from config import settings
 from models.schemas import (
     TreasuryData,
     PortfolioData,
+    PortfolioRollup,
     ComplianceData,
     MarketData,
     CashPosition,
     DebtInstrument,
     Holding,
     AMLAlert,
+    AuditAnomalyReport,
+    KycExpiringPage,
+    MarketSentiment,
     NewsItem,
     DashboardSummary,
     StatusLevel,
 )
+from services.audit_anomalies import AuditLogTail
+from services.kyc_index import KycExpiryIndex
+from services.model_builder import build_models, dict_records, frame_records
+from services.news_sentiment import NewsSentimentEngine
+from services.portfolio_partitions import (
+    ROOT_PARTITION_FILES,
+    PortfolioPartition,
+    discover_partitions,
+    find_partition,
+    portfolio_aggregator,
+)
+from services.results_store import results_store
+from services.snapshot import Stamp, file_stamp, snapshot_manager
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Model field -> (source column/key, default, type) for bulk record building
+CASH_POSITION_FIELDS = {
+    "account_name": ("account_name", "", str),
+    "currency": ("currency", "USD", str),
+    "balance": ("balance", 0, float),
+    "available_balance": ("available_balance", 0, float),
+    "bank": ("bank", "", str),
+    "region": ("region", "", str),
+}
+DEBT_INSTRUMENT_FIELDS = {
+    "debt_id": ("debt_id", "", str),
+    "instrument_type": ("instrument_type", "", str),
+    "principal": ("principal", 0, float),
+    "currency": ("currency", "USD", str),
+    "interest_rate": ("interest_rate", 0, float),
+    "maturity_date": ("maturity_date", "", str),
+    "covenant_status": ("covenant_status", "COMPLIANT", str),
+}
+HOLDING_FIELDS = {
+    "ticker": ("ticker", "", str),
+    "name": ("name", "", str),
+    "asset_class": ("asset_class", "", str),
+    "quantity": ("quantity", 0, float),
+    "current_price": ("current_price", 0, float),
+    "market_value": ("market_value", 0, float),
+    "weight_pct": ("weight_pct", 0, float),
+    "unrealized_pnl": ("unrealized_pnl", 0, float),
+}
+AML_ALERT_FIELDS = {
+    "alert_id": ("alert_id", "", str),
+    "type": ("type", "", str),
+    "risk_score": ("risk_score", 0, int),
+    "priority": ("priority", "LOW", str),
+    "status": ("status", "PENDING", str),
+    "entity_name": ("entity_name", "", str),
+    "amount": ("amount", 0, float),
+    "currency": ("currency", "USD", str),
+}
+NEWS_ITEM_FIELDS = {
+    "headline": ("headline", "", str),
+    "source": ("source", "", str),
+    "sentiment": ("sentiment", "NEUTRAL", str),
+    "sentiment_score": ("sentiment_score", 0, float),
+    "impact": ("market_impact", "", str),
+}
+
+
+def cached_on(*relpaths: str):
+    """Cache a zero-argument loader method until one of its source files changes."""
+    def decorator(method: Callable):
+        @functools.wraps(method)
+        def wrapper(self):
+            return self._cached(method.__name__, relpaths, lambda: method(self))
+        return wrapper
+    return decorator
 
 
 class DataLoaderService:
     def __init__(self):
         self.data_path = Path(settings.data_base_path)
+        self._stamps: Dict[Path, Optional[Stamp]] = {}
+        self._audit_tail: Optional[AuditLogTail] = None
+        self._kyc_index = KycExpiryIndex()
+        self._news_engine: Optional[NewsSentimentEngine] = None
+        self._cache: Dict[str, Tuple[Any, Any]] = {}
+        # Guards the incremental indexes, which warm-up fills from a worker thread
+        self._lock = threading.RLock()
 
     def _read_json(self, filepath: Path) -> Dict[str, Any]:
-        """Read JSON file and return dict."""
-        try:
-            with open(filepath, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error reading {filepath}: {e}")
-            return {}
-
-    def _read_csv(self, filepath: Path) -> pd.DataFrame:
-        """Read CSV file and return DataFrame."""
+        """Read JSON file and return dict.
+
+        Served from the shared snapshot when available; treat the result as read-only.
+        """
+        return snapshot_manager.read_json(filepath)[1]
+
+    def _read_csv(self, filepath: Path) -> "pd.DataFrame":
+        """Read CSV file and return DataFrame.
+
+        Served zero-copy from the shared snapshot when available; treat the
+        result as read-only.
+        """
+        return snapshot_manager.read_csv(filepath)[1]
+
+    def _read_json_if_changed(self, filepath: Path) -> Optional[Dict[str, Any]]:
+        """Return the document if the file changed since the last call for this path, else None.
+
+        The stamp recorded is the one of the data actually read, so a write
+        that lands mid-read is picked up by the next call.
+        """
+        stamp = file_stamp(filepath)
+        if filepath in self._stamps and self._stamps[filepath] == stamp:
+            return None
+        stamp, document = snapshot_manager.read_json(filepath)
+        self._stamps[filepath] = stamp
+        return document
+
+    def _signature(self, relpaths: Tuple[str, ...]) -> Tuple[Any, ...]:
+        """Cache signature: the calendar day plus the source files' modification times."""
+        mtimes = []
+        for relpath in relpaths:
+            try:
+                mtimes.append((self.data_path / relpath).stat().st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return (date.today(), tuple(mtimes))
+
+    def _cached(self, key: str, relpaths: Tuple[str, ...], build: Callable[[], Any]) -> Any:
+        """Return a cached result while the source files and the calendar day are unchanged.
+
+        The signature is taken before `build` reads the files, and snapshot
+        reads never return data older than that, so a result is never stored
+        under a newer signature than its data. A write that lands mid-build
+        only makes the next call rebuild.
+        """
+        signature = self._signature(relpaths)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        result = build()
+        self._cache[key] = (signature, result)
+        return result
+
+    def _iter_csv_rows(self, filepath: Path) -> Iterator[Dict[str, str]]:
+        """Stream CSV rows as dicts without materialising a DataFrame.
+
+        A missing file yields no rows; an error part-way through is raised, so
+        a consumer can tell a short read from the end of the file.
+        """
         try:
-            return pd.read_csv(filepath)
-        except Exception as e:
+            f = open(filepath, "r", newline="")
+        except OSError as e:
             print(f"Error reading {filepath}: {e}")
-            return pd.DataFrame()
-
+            return
+        with f:
+            yield from csv.DictReader(f)
+
+    def iter_source_rows(self, relpath: str, key: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the raw rows of a data file, one at a time.
+
+        CSV files are streamed from disk; for JSON files `key` names the list
+        of records inside the document, streamed from the shared snapshot.
+        """
+        filepath = self.data_path / relpath
+        if filepath.suffix == ".csv":
+            yield from self._iter_csv_rows(filepath)
+        else:
+            yield from snapshot_manager.iter_json_records(filepath, key)
+
+    @cached_on("treasury/cash_positions.csv", "treasury/debt_schedule.csv", "treasury/fx_rates.json")
     def get_treasury_data(self) -> TreasuryData:
         """Load and aggregate treasury data."""
         cash_df = self._read_csv(self.data_path / "treasury" / "cash_positions.csv")
@@ -48,48 +202,18 @@ class DataLoaderService:
 
         # Get latest date
         latest_date = cash_df["date"].max() if not cash_df.empty else datetime.now().strftime("%Y-%m-%d")
-        latest_cash = cash_df[cash_df["date"] == latest_date] if not cash_df.empty else pd.DataFrame()
-
-        # FX rates for conversion to USD
-        fx_rates = {"USD": 1, "EUR": 1.08, "GBP": 1.27, "JPY": 0.0067, "CHF": 1.14, "CAD": 0.74}
+        latest_cash = cash_df[cash_df["date"] == latest_date] if not cash_df.empty else cash_df
 
         # Build cash positions
-        cash_positions = []
-        total_cash_usd = 0
-        for _, row in latest_cash.iterrows():
-            position = CashPosition(
-                account_name=row.get("account_name", ""),
-                currency=row.get("currency", "USD"),
-                balance=float(row.get("balance", 0)),
-                available_balance=float(row.get("available_balance", 0)),
-                bank=row.get("bank", ""),
-                region=row.get("region", ""),
-            )
-            cash_positions.append(position)
-            total_cash_usd += position.balance * fx_rates.get(position.currency, 1)
+        cash_records = frame_records(latest_cash, CASH_POSITION_FIELDS)
+        cash_positions = build_models(CashPosition, cash_records)
+        total_cash_usd = total_usd(cash_records, "balance")
 
         # Build debt instruments
-        debt_instruments = []
-        total_debt = 0
-        covenant_breaches = 0
-        covenant_warnings = 0
-        for _, row in debt_df.iterrows():
-            instrument = DebtInstrument(
-                debt_id=str(row.get("debt_id", "")),
-                instrument_type=row.get("instrument_type", ""),
-                principal=float(row.get("principal", 0)),
-                currency=row.get("currency", "USD"),
-                interest_rate=float(row.get("interest_rate", 0)),
-                maturity_date=str(row.get("maturity_date", "")),
-                covenant_status=row.get("covenant_status", "COMPLIANT"),
-            )
-            debt_instruments.append(instrument)
-            total_debt += instrument.principal * fx_rates.get(instrument.currency, 1)
-
-            if instrument.covenant_status == "BREACH":
-                covenant_breaches += 1
-            elif instrument.covenant_status == "WARNING":
-                covenant_warnings += 1
+        debt_records = frame_records(debt_df, DEBT_INSTRUMENT_FIELDS)
+        debt_instruments = build_models(DebtInstrument, debt_records)
+        total_debt = total_usd(debt_records, "principal")
+        covenant_breaches, covenant_warnings = covenant_counts(debt_records)
 
         return TreasuryData(
             date=latest_date,
@@ -103,48 +227,95 @@ class DataLoaderService:
             covenant_warnings=covenant_warnings,
         )
 
-    def get_portfolio_data(self) -> PortfolioData:
-        """Load and aggregate portfolio data."""
-        holdings_data = self._read_json(self.data_path / "portfolio" / "holdings.json")
-        performance_data = self._read_json(self.data_path / "portfolio" / "performance.json")
-        var_df = self._read_csv(self.data_path / "portfolio" / "var_metrics.csv")
-
-        # Get latest VAR metrics
-        latest_var = var_df.iloc[0].to_dict() if not var_df.empty else {}
-
-        # Build holdings list
-        holdings = []
-        for h in holdings_data.get("holdings", []):
-            holding = Holding(
-                ticker=h.get("ticker", ""),
-                name=h.get("name", ""),
-                asset_class=h.get("asset_class", ""),
-                quantity=float(h.get("quantity", 0)),
-                current_price=float(h.get("current_price", 0)),
-                market_value=float(h.get("market_value", 0)),
-                weight_pct=float(h.get("weight_pct", 0)),
-                unrealized_pnl=float(h.get("unrealized_pnl", 0)),
-            )
-            holdings.append(holding)
-
-        # Extract performance metrics
-        ytd = performance_data.get("performance", {}).get("ytd", {})
-        date = var_df["date"].iloc[0] if not var_df.empty else datetime.now().strftime("%Y-%m-%d")
-
-        return PortfolioData(
-            date=date,
-            holdings=holdings,
-            total_aum=float(holdings_data.get("total_aum", 0)),
-            var_95_1d=float(latest_var.get("var_95_1d", 0)) if latest_var else 0,
-            var_99_1d=float(latest_var.get("var_99_1d", 0)) if latest_var else 0,
-            sharpe_ratio=float(latest_var.get("sharpe_ratio", 0)) if latest_var else 0,
-            max_drawdown=float(latest_var.get("max_drawdown", 0)) if latest_var else 0,
-            risk_score=int(latest_var.get("risk_score", 50)) if latest_var else 50,
-            ytd_return=float(ytd.get("return_pct", 0)),
-            benchmark_return=float(ytd.get("benchmark_pct", 0)),
-            alpha=float(ytd.get("alpha", 0)),
+    def _root_portfolio_id(self) -> str:
+        """portfolio_id of the default portfolio (the top-level portfolio/ files)."""
+        holdings = self.data_path / ROOT_PARTITION_FILES[0]
+
+        return self._cached(
+            "portfolio_root_id",
+            ROOT_PARTITION_FILES[:1],
+            lambda: (snapshot_manager.read_json_head(holdings).get("portfolio_id") if holdings.is_file() else None)
+            or settings.default_portfolio_id,
         )
 
+    def _portfolio_partitions(self) -> Dict[str, PortfolioPartition]:
+        return discover_partitions(self.data_path, self._root_portfolio_id())
+
+    def _portfolio_summaries(self, partitions: List[PortfolioPartition]) -> Dict[str, Tuple[Any, Dict[str, Any]]]:
+        """Return portfolio_id -> (signature, summary), each cached and invalidated on its own files.
+
+        Only partitions whose files changed are re-aggregated; when many are
+        stale at once (cold start, bulk data drop) they are aggregated in
+        parallel across worker processes.
+        """
+        loaded: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        stale: List[PortfolioPartition] = []
+        for partition in partitions:
+            signature = self._signature(partition.relpaths)
+            entry = self._cache.get(f"portfolio:{partition.portfolio_id}")
+            if entry is not None and entry[0] == signature:
+                loaded[partition.portfolio_id] = entry
+            else:
+                stale.append(partition)
+                loaded[partition.portfolio_id] = (signature, None)
+
+        if stale:
+            for portfolio_id, summary in portfolio_aggregator.aggregate(self.data_path, stale).items():
+                entry = (loaded[portfolio_id][0], summary)
+                self._cache[f"portfolio:{portfolio_id}"] = entry
+                loaded[portfolio_id] = entry
+        return loaded
+
+    def find_portfolio_partition(self, portfolio_id: Optional[str] = None) -> Optional[PortfolioPartition]:
+        """Files of one portfolio (the default portfolio when no id is given), or None if unknown.
+
+        Only that portfolio's directory is checked; the others are never listed.
+        """
+        root_id = self._root_portfolio_id()
+        return find_partition(self.data_path, root_id, portfolio_id or root_id)
+
+    def list_portfolio_ids(self) -> List[str]:
+        return sorted(self._portfolio_partitions())
+
+    def get_portfolio_data(self, portfolio_id: Optional[str] = None) -> PortfolioData:
+        """Load one portfolio (the default portfolio when no id is given).
+
+        Raises KeyError for an unknown portfolio_id.
+        """
+        partition = self.find_portfolio_partition(portfolio_id)
+        if partition is None:
+            raise KeyError(portfolio_id)
+        portfolio_id = partition.portfolio_id
+
+        signature, summary = self._portfolio_summaries([partition])[portfolio_id]
+        # Holding models are only built when the portfolio itself is requested
+        entry = self._cache.get(f"portfolio_model:{portfolio_id}")
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        holdings = build_models(Holding, dict_records(summary["holdings"], HOLDING_FIELDS))
+        portfolio = PortfolioData(**{**summary, "holdings": holdings})
+        self._cache[f"portfolio_model:{portfolio_id}"] = (signature, portfolio)
+        return portfolio
+
+    def get_portfolio_rollup(self) -> PortfolioRollup:
+        """Firm-wide rollup across every portfolio partition."""
+        partitions = self._portfolio_partitions()
+        summaries = self._portfolio_summaries(list(partitions.values()))
+
+        # Drop cache entries of portfolios that were removed from disk
+        for key in [key for key in self._cache if key.startswith(("portfolio:", "portfolio_model:"))]:
+            if key.split(":", 1)[1] not in partitions:
+                self._cache.pop(key, None)
+
+        signature = tuple((portfolio_id, summaries[portfolio_id][0]) for portfolio_id in sorted(summaries))
+        entry = self._cache.get("portfolio_rollup")
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        rollup = PortfolioRollup(**firm_rollup(summary for _, summary in summaries.values()))
+        self._cache["portfolio_rollup"] = (signature, rollup)
+        return rollup
+
+    @cached_on("compliance/aml_alerts.json", "compliance/kyc_status.json", "compliance/audit_logs.csv")
     def get_compliance_data(self) -> ComplianceData:
         """Load and aggregate compliance data."""
         aml_data = self._read_json(self.data_path / "compliance" / "aml_alerts.json")
@@ -152,22 +323,9 @@ class DataLoaderService:
         audit_df = self._read_csv(self.data_path / "compliance" / "audit_logs.csv")
 
         # Build AML alerts list
-        aml_alerts = []
-        sanctions_matches = 0
-        for alert in aml_data.get("alerts", []):
-            aml_alert = AMLAlert(
-                alert_id=alert.get("alert_id", ""),
-                type=alert.get("type", ""),
-                risk_score=int(alert.get("risk_score", 0)),
-                priority=alert.get("priority", "LOW"),
-                status=alert.get("status", "PENDING"),
-                entity_name=alert.get("entity_name", ""),
-                amount=float(alert.get("amount", 0)),
-                currency=alert.get("currency", "USD"),
-            )
-            aml_alerts.append(aml_alert)
-            if alert.get("type") == "SANCTIONS_MATCH":
-                sanctions_matches += 1
+        alert_records = dict_records(aml_data.get("alerts", []), AML_ALERT_FIELDS)
+        aml_alerts = build_models(AMLAlert, alert_records)
+        sanctions_matches = count_sanctions(alert_records)
 
         # Get summary metrics
         aml_summary = aml_data.get("summary", {})
@@ -176,93 +334,140 @@ class DataLoaderService:
         # Count critical audit events
         critical_audit = len(audit_df[audit_df["risk_level"] == "CRITICAL"]) if not audit_df.empty else 0
 
-        # Calculate KYC compliance rate
-        total_clients = kyc_summary.get("total_clients", 1)
-        compliant = kyc_summary.get("fully_compliant", 0)
-        compliance_rate = (compliant / max(total_clients, 1)) * 100
-
         return ComplianceData(
             date=datetime.now().strftime("%Y-%m-%d"),
             aml_alerts=aml_alerts,
             total_alerts=aml_summary.get("total_alerts", len(aml_alerts)),
             high_priority_count=aml_summary.get("high_priority", 0),
             sanctions_matches=sanctions_matches,
-            kyc_compliance_rate=compliance_rate,
+            kyc_compliance_rate=kyc_compliance_rate(kyc_summary),
             clients_pending_review=kyc_summary.get("pending_review", 0),
             critical_audit_events=critical_audit,
         )
 
+    def get_audit_anomalies(self, limit: Optional[int] = None) -> AuditAnomalyReport:
+        """Run the audit log through the streaming anomaly detector.
+
+        The log is append-only and time-ordered, so each call only feeds the
+        lines appended since the previous one to the detector.
+        """
+        audit_path = self.data_path / "compliance" / "audit_logs.csv"
+        with self._lock:
+            if self._audit_tail is None or self._audit_tail.path != audit_path:
+                self._audit_tail = AuditLogTail(audit_path)
+            self._audit_tail.poll()
+            detector = self._audit_tail.detector
+        return AuditAnomalyReport(
+            date=datetime.now().strftime("%Y-%m-%d"),
+            events_processed=detector.events_processed,
+            total_anomalies=sum(detector.counts_by_type.values()),
+            counts_by_type=dict(detector.counts_by_type),
+            anomalies=detector.recent_anomalies(limit),
+        )
+
+    def get_kyc_expiring(
+        self,
+        days: int = 30,
+        offset: int = 0,
+        limit: int = 50,
+        as_of: Optional[date] = None,
+        include_expired: bool = False,
+    ) -> KycExpiringPage:
+        """Page through clients whose KYC expires within `days`, highest risk first."""
+        kyc_path = self.data_path / "compliance" / "kyc_status.json"
+
+        # Apply only the changed records to the index when the file is updated
+        as_of = as_of or date.today()
+        with self._lock:
+            kyc_data = self._read_json_if_changed(kyc_path)
+            if kyc_data is not None:
+                self._kyc_index.sync(kyc_data.get("expiring_soon", []))
+            total, clients = self._kyc_index.expiring(
+                days, as_of=as_of, offset=offset, limit=limit, include_expired=include_expired
+            )
+        return KycExpiringPage(
+            as_of_date=as_of.isoformat(),
+            days=days,
+            total=total,
+            offset=offset,
+            limit=limit,
+            clients=clients,
+        )
+
+    @cached_on("market/news_feed.json", "market/economic_indicators.json")
     def get_market_data(self) -> MarketData:
         """Load and aggregate market data."""
-        news_data = self._read_json(self.data_path / "market" / "news_feed.json")
+        news_path = self.data_path / "market" / "news_feed.json"
+        news_data = snapshot_manager.read_json_head(news_path)
         indicators = self._read_json(self.data_path / "market" / "economic_indicators.json")
 
-        # Build news items list
-        news_items = []
-        for item in news_data.get("articles", []):
-            news_item = NewsItem(
-                headline=item.get("headline", ""),
-                source=item.get("source", ""),
-                sentiment=item.get("sentiment", "NEUTRAL"),
-                sentiment_score=float(item.get("sentiment_score", 0)),
-                impact=item.get("market_impact", ""),
-            )
-            news_items.append(news_item)
+        # Build news items list, streaming the articles from the snapshot's table when it has one
+        if "articles" in news_data:
+            articles = news_data["articles"]
+        else:
+            articles = snapshot_manager.iter_json_records(news_path, "articles")
+        news_items = build_models(NewsItem, dict_records(articles, NEWS_ITEM_FIELDS))
 
-        # Get market indices
-        indices = indicators.get("indices", {})
-        sp500 = indices.get("sp500", {})
-        rates = indicators.get("interest_rates", {})
+        # Same figures the executive dashboard flow reports
+        overview = market_overview(news_data, indicators, headlines=0)
 
         return MarketData(
             date=datetime.now().strftime("%Y-%m-%d"),
             news_items=news_items,
-            overall_sentiment=news_data.get("market_summary", {}).get("overall_sentiment", "NEUTRAL"),
-            sp500_level=float(sp500.get("value", 0)),
-            sp500_change_pct=float(sp500.get("daily_change_pct", 0)),
-            vix=float(indices.get("vix", {}).get("value", 0)),
-            fed_funds_rate=float(rates.get("fed_funds", 0)),
-            treasury_10y=float(rates.get("treasury_10y", 0)),
+            overall_sentiment=overview["overall_sentiment"] or "NEUTRAL",
+            sp500_level=float(overview["sp500_level"] or 0),
+            sp500_change_pct=float(overview["sp500_change_pct"] or 0),
+            vix=float(overview["vix"] or 0),
+            fed_funds_rate=float(overview["fed_funds_rate"] or 0),
+            treasury_10y=float(overview["ten_year_yield"] or 0),
         )
 
+    def get_market_sentiment(
+        self,
+        window: str = "1d",
+        ticker: Optional[str] = None,
+        as_of: Optional[datetime] = None,
+    ) -> MarketSentiment:
+        """Get rolling news sentiment, ingesting new or edited articles first.
+
+        The window ends at `as_of`, by default at the newest article in the feed.
+        """
+        news_path = self.data_path / "market" / "news_feed.json"
+
+        # Unchanged articles are skipped by id and content hash, so only new or edited ones are processed
+        with self._lock:
+            if self._news_engine is None:
+                self._news_engine = NewsSentimentEngine()
+            news_data = self._read_json_if_changed(news_path)
+            if news_data is not None:
+                for article in news_data.get("articles", []):
+                    self._news_engine.ingest(article)
+            now = as_of.timestamp() if as_of else None
+            return self._news_engine.sentiment(window=window, ticker=ticker, now=now)
+
     def get_dashboard_summary(self) -> DashboardSummary:
         """Generate a consolidated dashboard summary."""
         treasury = self.get_treasury_data()
         portfolio = self.get_portfolio_data()
         compliance = self.get_compliance_data()
 
-        # Calculate risk scores
-        treasury_risk = 50
-        if treasury.covenant_breaches > 0:
-            treasury_risk += 30
-        if treasury.covenant_warnings > 0:
-            treasury_risk += 15
-        treasury_risk = min(treasury_risk, 100)
-
+        # Risk scores use the same rules as the Kestra flows (analytics.scoring)
+        treasury_risk = treasury_risk_score(treasury.covenant_breaches, treasury.covenant_warnings)
         portfolio_risk = portfolio.risk_score
+        compliance_risk = compliance_risk_score(compliance.sanctions_matches, compliance.high_priority_count)
+        overall_risk = overall_risk_score((treasury_risk, portfolio_risk, compliance_risk))
 
-        compliance_risk = 40
-        if compliance.sanctions_matches > 0:
-            compliance_risk += 40
-        compliance_risk += compliance.high_priority_count * 10
-        compliance_risk = min(compliance_risk, 100)
-
-        # Overall risk is weighted average
-        overall_risk = int((treasury_risk + portfolio_risk + compliance_risk) / 3)
-
-        # Determine statuses
         def get_status(score: int) -> StatusLevel:
-            if score >= 80:
-                return StatusLevel.CRITICAL
-            elif score >= 60:
-                return StatusLevel.WARNING
-            return StatusLevel.OK
+            return StatusLevel(status_level(score))
 
         # Count active items
         critical_items = treasury.covenant_breaches + compliance.sanctions_matches
         active_alerts = compliance.total_alerts
         actions_pending = compliance.high_priority_count + (1 if treasury.covenant_breaches > 0 else 0)
 
+        # Execution details come from the local results store, never from Kestra
+        last_execution = results_store.latest_execution(flow_id=settings.kestra_flow_id)
+
         return DashboardSummary(
             timestamp=datetime.utcnow(),
             overall_status=get_status(overall_risk),
@@ -276,6 +481,8 @@ class DataLoaderService:
             critical_items=critical_items,
             active_alerts=active_alerts,
             actions_pending=actions_pending,
+            last_execution_id=last_execution.execution_id if last_execution else None,
+            next_scheduled_run=results_store.get_metadata("next_scheduled_run"),
         )
 
 
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from config import settings
+from models.schemas import ExecutionLogPage
+from services.circuit_breaker import CircuitOpenError
+from services.kestra import kestra_service
+from services.results_store import FINISHED_STATES, log_level_rank, log_timestamp, results_store
+
+
+class LogFilter:
+    """Task, level and timestamp filters for execution log lines."""
+
+    def __init__(self, task_id: Optional[str] = None, min_level: Optional[str] = None, since: Optional[datetime] = None):
+        self.task_id = task_id
+        self.min_level = min_level
+        self.min_rank = log_level_rank(min_level) if min_level else None
+        self.since = since
+        self._since_key = log_timestamp(since)
+
+    def matches(self, entry: Dict[str, Any]) -> bool:
+        if self.task_id and entry.get("taskId") != self.task_id:
+            return False
+        if self.min_rank is not None and log_level_rank(entry.get("level")) < self.min_rank:
+            return False
+        if self._since_key and (log_timestamp(entry.get("timestamp")) or "") < self._since_key:
+            return False
+        return True
+
+    def select(self, logs: List[Dict[str, Any]], after: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Matching lines with index greater than `after`, each with its `index` added."""
+        selected = []
+        for index in range((after + 1) if after is not None else 0, len(logs)):
+            entry = logs[index]
+            if self.matches(entry):
+                selected.append({**entry, "index": index})
+                if limit is not None and len(selected) >= limit:
+                    break
+        return selected
+
+
+class ExecutionLogService:
+    """Filtered, paginated and followable access to Kestra execution logs.
+
+    Kestra only serves the full log list of an execution, so filtering and
+    cursor pagination happen here. Once an execution has finished its logs
+    cannot change; they are stored in the results database on first view and
+    later requests are answered locally without calling Kestra.
+    """
+
+    def __init__(
+        self,
+        follow_interval: float = settings.logs_follow_interval_seconds,
+        follow_max_seconds: float = settings.logs_follow_max_seconds,
+    ):
+        self.follow_interval = follow_interval
+        self.follow_max_seconds = follow_max_seconds
+
+    async def _fetch(self, execution_id: str) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+        """Fetch logs from Kestra; returns (logs, finished), logs None if the execution is unknown.
+
+        The state is read before the logs, so logs of an execution seen as
+        finished are complete and safe to cache.
+        """
+        execution = await kestra_service.get_execution(execution_id)
+        if execution is None:
+            return None, False
+        finished = kestra_service.parse_execution(execution).state.value in FINISHED_STATES
+        logs = await kestra_service.get_execution_logs(execution_id)
+        # An empty list is also what a failed log request returns; don't cache it
+        if finished and logs:
+            await asyncio.to_thread(results_store.save_execution_logs, execution_id, logs)
+        return logs, finished
+
+    async def _cached_page(
+        self, execution_id: str, after: Optional[int], log_filter: LogFilter, limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(
+            results_store.query_execution_logs,
+            execution_id,
+            after=after,
+            since=log_filter.since,
+            task_id=log_filter.task_id,
+            min_level=log_filter.min_level,
+            limit=limit,
+        )
+
+    async def page(
+        self, execution_id: str, log_filter: LogFilter, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> Optional[ExecutionLogPage]:
+        """Matching log lines after the `after` index cursor, at most `limit` of them (all if None).
+
+        Returns None if the execution is unknown.
+        """
+        # One extra line tells whether there is another page
+        probe = limit + 1 if limit is not None else None
+        cached = await asyncio.to_thread(results_store.has_execution_logs, execution_id)
+        if cached:
+            finished = True
+            logs = await self._cached_page(execution_id, after, log_filter, probe)
+        else:
+            all_logs, finished = await self._fetch(execution_id)
+            if all_logs is None:
+                return None
+            logs = log_filter.select(all_logs, after, probe)
+
+        has_more = limit is not None and len(logs) > limit
+        logs = logs[:limit]
+        return ExecutionLogPage(
+            execution_id=execution_id,
+            logs=logs,
+            next_cursor=logs[-1]["index"] if logs else after,
+            has_more=has_more,
+            finished=finished,
+            cached=cached,
+        )
+
+    async def follow(
+        self, execution_id: str, log_filter: LogFilter, after: Optional[int] = None
+    ) -> Optional[AsyncIterator[bytes]]:
+        """Start following an execution's logs; returns None if the execution is unknown.
+
+        The first fetch happens here, before any response is sent, so an
+        unknown execution can still be reported as such.
+        """
+        fetched = None
+        if not await asyncio.to_thread(results_store.has_execution_logs, execution_id):
+            fetched = await self._fetch(execution_id)
+            if fetched[0] is None:
+                return None
+        return self._follow(execution_id, log_filter, after, fetched)
+
+    async def _follow(
+        self,
+        execution_id: str,
+        log_filter: LogFilter,
+        cursor: Optional[int],
+        fetched: Optional[Tuple[Optional[List[Dict[str, Any]]], bool]],
+    ) -> AsyncIterator[bytes]:
+        """Yield matching log lines as NDJSON, polling Kestra for new lines until the execution finishes."""
+        started = time.monotonic()
+        while True:
+            if fetched is None:
+                if await asyncio.to_thread(results_store.has_execution_logs, execution_id):
+                    while True:
+                        logs = await self._cached_page(execution_id, cursor, log_filter, 1000)
+                        if not logs:
+                            return
+                        cursor = logs[-1]["index"]
+                        yield "".join(json.dumps(entry) + "\n" for entry in logs).encode()
+
+                try:
+                    fetched = await self._fetch(execution_id)
+                except CircuitOpenError as e:
+                    # Headers are already sent, so end the stream rather than fail it
+                    print(f"Stopped following logs of {execution_id}: {e}")
+                    return
+            all_logs, finished = fetched
+            fetched = None
+            if all_logs is None:
+                return
+            new_lines = log_filter.select(all_logs, cursor)
+            if new_lines:
+                yield "".join(json.dumps(entry) + "\n" for entry in new_lines).encode()
+            # Skip past non-matching lines too, so they are not rescanned
+            if all_logs:
+                cursor = max(cursor if cursor is not None else -1, len(all_logs) - 1)
+            if finished or time.monotonic() - started >= self.follow_max_seconds:
+                return
+            await asyncio.sleep(self.follow_interval)
+
+
+execution_log_service = ExecutionLogService()
@@ -0,0 +1,455 @@
+import csv
+import io
+import json
+import operator
+import re
+from itertools import islice
+from pathlib import PurePosixPath
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from analytics.portfolio import belongs_to_portfolio
+from config import settings
+from services.data_loader import data_loader_service
+from services.portfolio_partitions import PARTITION_FILE_NAMES
+
+
+# Invalid cells logged individually per export before only the total is reported
+MAX_LOGGED_INVALID_CELLS = 5
+
+
+class ExportError(ValueError):
+    """Raised for an export request that names unknown columns or has a malformed filter."""
+
+
+class ExportDataset:
+    """One exportable table: a data file plus its typed columns."""
+
+    def __init__(
+        self,
+        domain: str,
+        name: str,
+        source: str,
+        columns: Dict[str, str],
+        key: Optional[str] = None,
+        portfolio_id: Optional[str] = None,
+    ):
+        self.domain = domain
+        self.name = name
+        self.source = source
+        self.key = key
+        self.columns = columns
+        # Set on copies that read one portfolio's partition files
+        self.portfolio_id = portfolio_id
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        rows = data_loader_service.iter_source_rows(self.source, self.key)
+        if self.portfolio_id is None:
+            return rows
+        # VaR files may tag rows of several portfolios; same rule as the portfolio summaries
+        return (row for row in rows if belongs_to_portfolio(row, self.portfolio_id))
+
+    def for_portfolio(self, portfolio_id: str) -> Optional["ExportDataset"]:
+        """This portfolio dataset read from one portfolio's files; None if the portfolio is unknown."""
+        partition = data_loader_service.find_portfolio_partition(portfolio_id)
+        if partition is None:
+            return None
+        source = partition.relpaths[PARTITION_FILE_NAMES.index(PurePosixPath(self.source).name)]
+        return ExportDataset(self.domain, self.name, source, self.columns, self.key, partition.portfolio_id)
+
+
+# Column types: "string", "float", "int" or "list" (list of strings)
+EXPORT_DATASETS: Dict[str, Dict[str, ExportDataset]] = {}
+
+
+def _register(dataset: ExportDataset) -> None:
+    EXPORT_DATASETS.setdefault(dataset.domain, {})[dataset.name] = dataset
+
+
+_register(ExportDataset("treasury", "cash_positions", "treasury/cash_positions.csv", {
+    "date": "string",
+    "account_name": "string",
+    "currency": "string",
+    "balance": "float",
+    "available_balance": "float",
+    "bank": "string",
+    "region": "string",
+}))
+_register(ExportDataset("treasury", "debt_schedule", "treasury/debt_schedule.csv", {
+    "debt_id": "string",
+    "instrument_type": "string",
+    "principal": "float",
+    "currency": "string",
+    "interest_rate": "float",
+    "rate_type": "string",
+    "maturity_date": "string",
+    "next_payment_date": "string",
+    "payment_amount": "float",
+    "lender": "string",
+    "covenant_status": "string",
+}))
+_register(ExportDataset("portfolio", "holdings", "portfolio/holdings.json", {
+    "ticker": "string",
+    "name": "string",
+    "asset_class": "string",
+    "sector": "string",
+    "quantity": "float",
+    "avg_cost": "float",
+    "current_price": "float",
+    "market_value": "float",
+    "unrealized_pnl": "float",
+    "weight": "float",
+    "daily_change_pct": "float",
+}, key="holdings"))
+_register(ExportDataset("portfolio", "var_metrics", "portfolio/var_metrics.csv", {
+    "date": "string",
+    "portfolio_id": "string",
+    "var_95_1d": "float",
+    "var_99_1d": "float",
+    "var_95_10d": "float",
+    "cvar_95": "float",
+    "max_drawdown": "float",
+    "sharpe_ratio": "float",
+    "beta": "float",
+    "volatility_30d": "float",
+    "correlation_sp500": "float",
+    "risk_score": "int",
+}))
+_register(ExportDataset("compliance", "aml_alerts", "compliance/aml_alerts.json", {
+    "alert_id": "string",
+    "timestamp": "string",
+    "priority": "string",
+    "status": "string",
+    "type": "string",
+    "client_id": "string",
+    "client_name": "string",
+    "description": "string",
+    "amount": "float",
+    "currency": "string",
+    "risk_score": "int",
+    "flagged_countries": "list",
+    "recommended_action": "string",
+}, key="alerts"))
+_register(ExportDataset("compliance", "audit_logs", "compliance/audit_logs.csv", {
+    "timestamp": "string",
+    "event_id": "string",
+    "event_type": "string",
+    "user_id": "string",
+    "user_role": "string",
+    "action": "string",
+    "resource": "string",
+    "status": "string",
+    "risk_level": "string",
+    "ip_address": "string",
+    "details": "string",
+}))
+_register(ExportDataset("compliance", "kyc_expiring", "compliance/kyc_status.json", {
+    "client_id": "string",
+    "client_name": "string",
+    "kyc_expiry_date": "string",
+    "days_until_expiry": "int",
+    "risk_rating": "string",
+    "last_review_date": "string",
+    "required_documents": "list",
+}, key="expiring_soon"))
+_register(ExportDataset("market", "news", "market/news_feed.json", {
+    "id": "string",
+    "headline": "string",
+    "source": "string",
+    "published_at": "string",
+    "category": "string",
+    "sentiment": "string",
+    "sentiment_score": "float",
+    "relevance_score": "float",
+    "summary": "string",
+    "tickers_mentioned": "list",
+    "impact_assessment": "string",
+}, key="articles"))
+
+# Dataset exported by /export/{domain} when none is named
+DEFAULT_DATASETS = {
+    "treasury": "cash_positions",
+    "portfolio": "holdings",
+    "compliance": "aml_alerts",
+    "market": "news",
+}
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _to_float(value: Any) -> Optional[float]:
+    return None if value is None or value == "" else float(value)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    return None if value is None or value == "" else int(float(value))
+
+
+def _to_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _to_list(value: Any) -> Optional[List[str]]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [item for item in str(value).split(";") if item]
+
+
+CASTS: Dict[str, Callable[[Any], Any]] = {
+    "string": _to_str,
+    "float": _to_float,
+    "int": _to_int,
+    "list": _to_list,
+}
+
+FILTER_PATTERN = re.compile(r"^(\w+)\s*(>=|<=|!=|=|>|<)\s*(.*)$")
+FILTER_OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def parse_filter(expression: str, dataset: ExportDataset) -> Predicate:
+    """Turn `column<op>value` into a row predicate.
+
+    Operators are =, !=, >, >=, <, <=. For = and != the value may be a
+    comma-separated list (`currency=USD,EUR`). Values are cast to the
+    column type, so numeric columns compare numerically.
+    """
+    match = FILTER_PATTERN.match(expression.strip())
+    if not match:
+        raise ExportError(f"Invalid filter '{expression}', expected column<op>value")
+    column, op, raw = match.groups()
+    if column not in dataset.columns:
+        raise ExportError(f"Unknown filter column '{column}' for {dataset.name}")
+    column_type = dataset.columns[column]
+    if column_type == "list":
+        raise ExportError(f"Cannot filter on list column '{column}'")
+    cast = CASTS[column_type]
+    try:
+        values = [cast(value.strip()) for value in raw.split(",")] if op in ("=", "!=") else [cast(raw.strip())]
+    except ValueError:
+        raise ExportError(f"Invalid {column_type} value in filter '{expression}'")
+
+    if op in ("=", "!="):
+        allowed = set(values)
+        negate = op == "!="
+        return lambda row: (row[column] in allowed) != negate
+
+    compare, bound = FILTER_OPERATORS[op], values[0]
+    return lambda row: row[column] is not None and compare(row[column], bound)
+
+
+class ExportQuery:
+    """A validated export request: dataset, projected columns and row filters."""
+
+    def __init__(
+        self,
+        dataset: ExportDataset,
+        columns: Optional[List[str]] = None,
+        filters: Iterable[str] = (),
+        limit: Optional[int] = None,
+    ):
+        if columns:
+            unknown = [name for name in columns if name not in dataset.columns]
+            if unknown:
+                raise ExportError(f"Unknown columns for {dataset.name}: {', '.join(unknown)}")
+        self.dataset = dataset
+        self.columns = columns or list(dataset.columns)
+        self.filters = [parse_filter(expression, dataset) for expression in filters]
+        self.limit = limit
+        self.rows_read = 0
+        self.rows_exported = 0
+        self.invalid_cells = 0
+
+    def _typed_slow(self, raw: Dict[str, Any], casts: List[Tuple[str, Callable[[Any], Any]]]) -> Dict[str, Any]:
+        """Cast a row cell by cell, exporting cells that do not convert as null."""
+        row = {}
+        for name, cast in casts:
+            value = raw.get(name)
+            try:
+                row[name] = cast(value)
+            except (TypeError, ValueError):
+                row[name] = None
+                self.invalid_cells += 1
+                if self.invalid_cells <= MAX_LOGGED_INVALID_CELLS:
+                    print(
+                        f"Export {self.dataset.name}: invalid {self.dataset.columns[name]} {value!r} "
+                        f"in column {name} of row {self.rows_read}, exported as null"
+                    )
+        return row
+
+    def _typed_rows(self, casts: List[Tuple[str, Callable[[Any], Any]]]) -> Iterator[Dict[str, Any]]:
+        for raw in self.dataset.rows():
+            self.rows_read += 1
+            try:
+                yield {name: cast(raw.get(name)) for name, cast in casts}
+            except (TypeError, ValueError):
+                yield self._typed_slow(raw, casts)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield typed, filtered and projected rows one at a time.
+
+        A cell that cannot be converted to its column type is exported as
+        null and logged, rather than failing the export part-way.
+        """
+        types = self.dataset.columns
+        # Filters may reference columns outside the projection
+        needed = list(types) if self.filters else self.columns
+        rows = self._typed_rows([(name, CASTS[types[name]]) for name in needed])
+        if self.filters:
+            filters = self.filters
+            columns = self.columns
+            rows = (
+                {name: row[name] for name in columns}
+                for row in rows
+                if all(check(row) for check in filters)
+            )
+        return islice(rows, self.limit) if self.limit is not None else rows
+
+    def batches(self, size: int = settings.export_chunk_rows) -> Iterator[List[Dict[str, Any]]]:
+        rows = self.rows()
+        while True:
+            batch = list(islice(rows, size))
+            if not batch:
+                break
+            self.rows_exported += len(batch)
+            yield batch
+        if self.invalid_cells:
+            print(f"Export {self.dataset.name}: {self.invalid_cells} invalid cells exported as null")
+
+
+def resolve_dataset(domain: str, name: Optional[str] = None) -> Optional[ExportDataset]:
+    datasets = EXPORT_DATASETS.get(domain)
+    if datasets is None:
+        return None
+    return datasets.get(name or DEFAULT_DATASETS[domain])
+
+
+def _export_failed(query: ExportQuery, error: Exception) -> None:
+    print(f"Export {query.dataset.name} failed after {query.rows_exported} rows: {error}")
+
+
+def stream_ndjson(query: ExportQuery) -> Iterator[bytes]:
+    """NDJSON rows; a stream that fails part-way ends with an `export_error` line."""
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    try:
+        for batch in query.batches():
+            yield "".join(encode(row) + "\n" for row in batch).encode()
+    except Exception as e:
+        _export_failed(query, e)
+        yield (encode({"export_error": str(e), "rows_exported": query.rows_exported}) + "\n").encode()
+        raise
+
+
+def stream_csv(query: ExportQuery) -> Iterator[bytes]:
+    try:
+        yield from _csv_chunks(query)
+    except Exception as e:
+        # No trailer: a CSV consumer would read it as a row. Re-raising aborts the response.
+        _export_failed(query, e)
+        raise
+
+
+def _csv_chunks(query: ExportQuery) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(query.columns)
+    list_columns = [i for i, name in enumerate(query.columns) if query.dataset.columns[name] == "list"]
+    for batch in query.batches():
+        for row in batch:
+            values = list(row.values())
+            for i in list_columns:
+                if values[i] is not None:
+                    values[i] = ";".join(values[i])
+            writer.writerow(values)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def stream_parquet(query: ExportQuery) -> Iterator[bytes]:
+    """Write one Parquet row group per batch and yield the bytes as they are produced."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {
+        "string": pa.string(),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "list": pa.list_(pa.string()),
+    }
+    schema = pa.schema([(name, arrow_types[query.dataset.columns[name]]) for name in query.columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in query.batches():
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+        writer.close()
+        yield sink.drain()
+    except Exception as e:
+        # The footer is never written, so readers reject the partial file
+        _export_failed(query, e)
+        raise
+    finally:
+        if writer.is_open:
+            writer.close()
+
+
+STREAMERS: Dict[str, Callable[[ExportQuery], Iterator[bytes]]] = {
+    "ndjson": stream_ndjson,
+    "csv": stream_csv,
+    "parquet": stream_parquet,
+}
+
+
+def list_datasets() -> List[Tuple[ExportDataset, bool]]:
+    """All datasets with a flag marking each domain's default."""
+    return [
+        (dataset, DEFAULT_DATASETS[domain] == name)
+        for domain, datasets in EXPORT_DATASETS.items()
+        for name, dataset in datasets.items()
+    ]
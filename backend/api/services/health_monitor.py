@@ -0,0 +1,170 @@
+import asyncio
+import httpx
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+from config import settings
+from models.schemas import ComponentHealth
+from services.kestra import kestra_service
+
+# Files the data endpoints cannot work without
+REQUIRED_DATA_FILES = [
+    "treasury/cash_positions.csv",
+    "treasury/debt_schedule.csv",
+    "treasury/fx_rates.json",
+    "portfolio/holdings.json",
+    "portfolio/performance.json",
+    "portfolio/var_metrics.csv",
+    "compliance/aml_alerts.json",
+    "compliance/kyc_status.json",
+    "compliance/audit_logs.csv",
+    "market/news_feed.json",
+    "market/economic_indicators.json",
+]
+
+
+class ComponentProbe:
+    """Latest result and rolling latency for one probed dependency."""
+
+    def __init__(self, name: str, window: int = settings.health_latency_window):
+        self.name = name
+        self.status = "unknown"
+        self.error: Optional[str] = None
+        self.last_checked: Optional[datetime] = None
+        self.last_success: Optional[datetime] = None
+        self.consecutive_failures = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, status: str, latency_ms: float, error: Optional[str] = None) -> None:
+        now = datetime.utcnow()
+        self.status = status
+        self.error = error
+        self.last_checked = now
+        self._latencies.append(latency_ms)
+        if status == "healthy":
+            self.last_success = now
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+
+    def to_model(self) -> ComponentHealth:
+        latencies = self._latencies
+        return ComponentHealth(
+            status=self.status,
+            last_checked=self.last_checked,
+            last_success=self.last_success,
+            latency_ms=round(latencies[-1], 2) if latencies else None,
+            avg_latency_ms=round(sum(latencies) / len(latencies), 2) if latencies else None,
+            consecutive_failures=self.consecutive_failures,
+            error=self.error,
+        )
+
+
+class HealthMonitor:
+    """Probes Kestra, Ollama and the data directory concurrently in the background.
+
+    `/health` answers from the latest stored results instead of probing on the
+    request path. Kestra probe results also drive the Kestra circuit breaker,
+    so API calls fail fast while Kestra is known to be down.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.health_probe_interval_seconds,
+        timeout: float = settings.health_probe_timeout_seconds,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.data_path = Path(settings.data_base_path)
+        self.components: Dict[str, ComponentProbe] = {
+            name: ComponentProbe(name) for name in ("kestra", "ollama", "data")
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def _probe_kestra(self) -> Tuple[str, Optional[str]]:
+        result = await kestra_service.check_health(self.client)
+        return result.get("status", "unknown"), result.get("error")
+
+    async def _probe_ollama(self) -> Tuple[str, Optional[str]]:
+        try:
+            response = await self.client.get(f"{settings.ollama_host}/api/tags")
+            return ("healthy" if response.status_code == 200 else "unhealthy"), None
+        except Exception as e:
+            return "unreachable", str(e)
+
+    def _check_data_files(self) -> Tuple[str, Optional[str]]:
+        missing = [name for name in REQUIRED_DATA_FILES if not (self.data_path / name).is_file()]
+        if missing:
+            return "unhealthy", f"Missing data files: {', '.join(missing)}"
+        return "healthy", None
+
+    async def _probe_data(self) -> Tuple[str, Optional[str]]:
+        return await asyncio.to_thread(self._check_data_files)
+
+    async def _timed(self, name: str, probe: Callable[[], Awaitable[Tuple[str, Optional[str]]]]) -> None:
+        started = time.perf_counter()
+        try:
+            status, error = await asyncio.wait_for(probe(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            status, error = "unreachable", f"Probe timed out after {self.timeout}s"
+        except Exception as e:
+            status, error = "unreachable", str(e)
+        self.components[name].record(status, (time.perf_counter() - started) * 1000, error)
+
+    async def probe_all(self) -> None:
+        """Run every probe concurrently and update the stored results."""
+        await asyncio.gather(
+            self._timed("kestra", self._probe_kestra),
+            self._timed("ollama", self._probe_ollama),
+            self._timed("data", self._probe_data),
+        )
+        kestra_status = self.components["kestra"].status
+        if kestra_status == "healthy":
+            kestra_service.breaker.record_success()
+        elif kestra_status == "unreachable":
+            kestra_service.breaker.trip()
+
+    @property
+    def has_results(self) -> bool:
+        return all(probe.last_checked is not None for probe in self.components.values())
+
+    def snapshot(self) -> Dict[str, ComponentHealth]:
+        return {name: probe.to_model() for name, probe in self.components.items()}
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Health probe error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+health_monitor = HealthMonitor()
@@ -7,6 +7,7 @@ from models.schemas import (
     ExecutionStatus,
     ExecutionState,
 )
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 
 class KestraService:
@@ -15,6 +16,36 @@ class KestraService:
         self.namespace = settings.kestra_namespace
         self.flow_id = settings.kestra_flow_id
         self.webhook_key = "finance-orchestrator-trigger"
+        self.breaker = CircuitBreaker(
+            "Kestra",
+            failure_threshold=settings.kestra_breaker_failure_threshold,
+            reset_timeout=settings.kestra_breaker_reset_seconds,
+        )
+
+    async def _request(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the circuit breaker.
+
+        Fails fast with CircuitOpenError while Kestra is known to be down.
+        Any exception raised by the call and any 5xx response counts as a
+        failure; a cancelled call only releases its half-open trial slot.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.breaker)
+        succeeded: Optional[bool] = None
+        try:
+            response = await client.request(method, url, **kwargs)
+            succeeded = response.status_code < 500
+        except Exception:
+            succeeded = False
+            raise
+        finally:
+            if succeeded is None:
+                self.breaker.release()
+            elif succeeded:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+        return response
 
     async def trigger_workflow(
         self,
@@ -34,7 +65,7 @@ class KestraService:
 
         async with httpx.AsyncClient(timeout=30.0) as client:
             try:
-                response = await client.post(url, json=payload)
+                response = await self._request(client, "POST", url, json=payload)
                 response.raise_for_status()
                 data = response.json()
 
@@ -44,6 +75,8 @@ class KestraService:
                     message=f"Workflow {self.flow_id} triggered successfully",
                     timestamp=datetime.utcnow(),
                 )
+            except CircuitOpenError:
+                raise
             except httpx.HTTPStatusError as e:
                 return WorkflowTriggerResponse(
                     execution_id="",
@@ -59,56 +92,83 @@ class KestraService:
                     timestamp=datetime.utcnow(),
                 )
 
-    async def get_execution_status(self, execution_id: str) -> Optional[ExecutionStatus]:
-        """Get the status of a specific execution."""
+    @staticmethod
+    def parse_execution(data: Dict[str, Any]) -> ExecutionStatus:
+        """Convert a raw Kestra execution payload to an ExecutionStatus."""
+        state_map = {
+            "CREATED": ExecutionState.CREATED,
+            "RUNNING": ExecutionState.RUNNING,
+            "SUCCESS": ExecutionState.SUCCESS,
+            "FAILED": ExecutionState.FAILED,
+            "KILLED": ExecutionState.KILLED,
+            "WARNING": ExecutionState.WARNING,
+        }
+
+        # Kestra nests state details in an object; older payloads use a flat string
+        state = data.get("state", "")
+        state_info = state if isinstance(state, dict) else {}
+        current = state_info.get("current", "") if state_info else state
+
+        return ExecutionStatus(
+            execution_id=data.get("id", ""),
+            flow_id=data.get("flowId", ""),
+            namespace=data.get("namespace", ""),
+            state=state_map.get(current, ExecutionState.CREATED),
+            start_date=data.get("startDate") or state_info.get("startDate"),
+            end_date=data.get("endDate") or state_info.get("endDate"),
+            duration_ms=data.get("duration"),
+            outputs=data.get("outputs"),
+        )
+
+    async def get_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Get the raw execution payload, including task runs and their outputs.
+
+        Returns None if the request fails; raises CircuitOpenError while Kestra is down.
+        """
         url = f"{self.base_url}/api/v1/executions/{execution_id}"
 
         async with httpx.AsyncClient(timeout=30.0) as client:
             try:
-                response = await client.get(url)
+                response = await self._request(client, "GET", url)
                 response.raise_for_status()
-                data = response.json()
-
-                state_map = {
-                    "CREATED": ExecutionState.CREATED,
-                    "RUNNING": ExecutionState.RUNNING,
-                    "SUCCESS": ExecutionState.SUCCESS,
-                    "FAILED": ExecutionState.FAILED,
-                    "KILLED": ExecutionState.KILLED,
-                }
-
-                return ExecutionStatus(
-                    execution_id=data.get("id", ""),
-                    flow_id=data.get("flowId", ""),
-                    namespace=data.get("namespace", ""),
-                    state=state_map.get(data.get("state", ""), ExecutionState.CREATED),
-                    start_date=data.get("startDate"),
-                    end_date=data.get("endDate"),
-                    duration_ms=data.get("duration"),
-                    outputs=data.get("outputs"),
-                )
+                return response.json()
+            except CircuitOpenError:
+                raise
             except Exception:
                 return None
 
+    async def get_execution_status(self, execution_id: str) -> Optional[ExecutionStatus]:
+        """Get the status of a specific execution."""
+        data = await self.get_execution(execution_id)
+        if data is None:
+            return None
+        try:
+            return self.parse_execution(data)
+        except Exception:
+            return None
+
     async def list_executions(
-        self, limit: int = 10, state: Optional[str] = None
+        self, limit: int = 10, state: Optional[str] = None, page: int = 1
     ) -> list[Dict[str, Any]]:
-        """List recent executions."""
+        """List recent executions, newest first; `page` counts from 1 in pages of `limit`."""
         url = f"{self.base_url}/api/v1/executions"
         params = {
             "namespace": self.namespace,
             "flowId": self.flow_id,
             "size": limit,
+            "page": page,
         }
         if state:
             params["state"] = state
 
         async with httpx.AsyncClient(timeout=30.0) as client:
             try:
-                response = await client.get(url, params=params)
+                response = await self._request(client, "GET", url, params=params)
                 response.raise_for_status()
                 data = response.json()
                 return data.get("results", [])
+            except CircuitOpenError:
+                raise
             except Exception:
                 return []
 
@@ -118,25 +178,55 @@ class KestraService:
 
         async with httpx.AsyncClient(timeout=30.0) as client:
             try:
-                response = await client.get(url)
+                response = await self._request(client, "GET", url)
                 response.raise_for_status()
                 return response.json()
+            except CircuitOpenError:
+                raise
             except Exception:
                 return []
 
-    async def check_health(self) -> Dict[str, Any]:
-        """Check Kestra health status."""
-        url = f"{self.base_url}/api/v1/plugins"
+    async def get_next_scheduled_run(self) -> Optional[str]:
+        """Get the next scheduled execution date of the orchestrator flow."""
+        url = f"{self.base_url}/api/v1/triggers/search"
+        params = {"namespace": self.namespace, "q": self.flow_id, "size": 50}
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with httpx.AsyncClient(timeout=30.0) as client:
             try:
-                response = await client.get(url)
-                return {
-                    "status": "healthy" if response.status_code == 200 else "unhealthy",
-                    "code": response.status_code,
-                }
-            except Exception as e:
-                return {"status": "unreachable", "error": str(e)}
+                response = await self._request(client, "GET", url, params=params)
+                response.raise_for_status()
+                results = response.json().get("results", [])
+            except CircuitOpenError:
+                raise
+            except Exception:
+                return None
+
+        next_dates = []
+        for result in results:
+            context = result.get("triggerContext", result)
+            if context.get("flowId") == self.flow_id and context.get("nextExecutionDate"):
+                next_dates.append(context["nextExecutionDate"])
+        return min(next_dates) if next_dates else None
+
+    async def check_health(self, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        """Check Kestra health status.
+
+        Probes bypass the circuit breaker, since they are what closes it again.
+        """
+        url = f"{self.base_url}/api/v1/plugins"
+
+        if client is None:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                return await self.check_health(client)
+
+        try:
+            response = await client.get(url)
+            return {
+                "status": "healthy" if response.status_code == 200 else "unhealthy",
+                "code": response.status_code,
+            }
+        except Exception as e:
+            return {"status": "unreachable", "error": str(e)}
 
 
 kestra_service = KestraService()
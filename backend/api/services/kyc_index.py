@@ -0,0 +1,188 @@
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from models.schemas import KycExpiringClient
+
+# Query order for risk ratings; unknown ratings sort last
+RISK_ORDER = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+UNRATED = "UNRATED"
+
+# Above this many keys per rating, sync rebuilds the array instead of bisecting
+BULK_THRESHOLD = 256
+
+
+class KycExpiryIndex:
+    """Sorted index of KYC expiry dates, partitioned by risk rating.
+
+    Each risk rating holds a sorted array of `(expiry_ordinal, client_id)`
+    keys, so "who expires in the next N days" is a pair of bisects per rating
+    and results come back ordered by risk, then expiry. Records are synced
+    incrementally: only added, removed or changed clients touch the arrays.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, List[Tuple[int, str]]] = {rating: [] for rating in RISK_ORDER + [UNRATED]}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._placement: Dict[str, Tuple[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def _rating(record: Dict[str, Any]) -> str:
+        rating = str(record.get("risk_rating", "")).upper()
+        return rating if rating in RISK_ORDER else UNRATED
+
+    @staticmethod
+    def _expiry_ordinal(record: Dict[str, Any]) -> Optional[int]:
+        try:
+            return date.fromisoformat(str(record.get("kyc_expiry_date", ""))[:10]).toordinal()
+        except ValueError:
+            return None
+
+    def _remove(self, client_id: str) -> None:
+        rating, ordinal = self._placement.pop(client_id)
+        keys = self._keys[rating]
+        pos = bisect_left(keys, (ordinal, client_id))
+        if pos < len(keys) and keys[pos] == (ordinal, client_id):
+            del keys[pos]
+        del self._records[client_id]
+
+    def upsert(self, record: Dict[str, Any]) -> bool:
+        """Insert or update one client record. Returns True if the index changed."""
+        client_id = str(record.get("client_id", ""))
+        ordinal = self._expiry_ordinal(record)
+        if not client_id or ordinal is None:
+            return False
+        if self._records.get(client_id) == record:
+            return False
+
+        rating = self._rating(record)
+        if client_id in self._records:
+            if self._placement[client_id] == (rating, ordinal):
+                self._records[client_id] = record
+                return True
+            self._remove(client_id)
+
+        insort(self._keys[rating], (ordinal, client_id))
+        self._records[client_id] = record
+        self._placement[client_id] = (rating, ordinal)
+        return True
+
+    def remove(self, client_id: str) -> bool:
+        if client_id not in self._records:
+            return False
+        self._remove(client_id)
+        return True
+
+    def sync(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Bring the index in line with a full record set. Returns the number of changes.
+
+        Small diffs are applied with bisect inserts/deletes; large ones (such as
+        the initial load) are applied per rating with a single sort or filter.
+        """
+        unchanged = set()
+        incoming: Dict[str, Tuple[Dict[str, Any], str, int]] = {}
+        records_by_id = self._records
+        for record in records:
+            client_id = str(record.get("client_id", ""))
+            if records_by_id.get(client_id) == record:
+                unchanged.add(client_id)
+                continue
+            ordinal = self._expiry_ordinal(record)
+            if client_id and ordinal is not None:
+                incoming[client_id] = (record, self._rating(record), ordinal)
+
+        removals: Dict[str, List[Tuple[int, str]]] = {}
+        insertions: Dict[str, List[Tuple[int, str]]] = {}
+        changes = 0
+        if len(unchanged) != len(self._placement) or incoming:
+            for client_id, (rating, ordinal) in list(self._placement.items()):
+                if client_id in unchanged:
+                    continue
+                entry = incoming.get(client_id)
+                if entry is None or (entry[1], entry[2]) != (rating, ordinal):
+                    removals.setdefault(rating, []).append((ordinal, client_id))
+                    del self._placement[client_id]
+                    if entry is None:
+                        del records_by_id[client_id]
+                        changes += 1
+        for client_id, (record, rating, ordinal) in incoming.items():
+            if client_id not in self._placement:
+                insertions.setdefault(rating, []).append((ordinal, client_id))
+                self._placement[client_id] = (rating, ordinal)
+            records_by_id[client_id] = record
+            changes += 1
+
+        for rating, keys_to_remove in removals.items():
+            keys = self._keys[rating]
+            if len(keys_to_remove) > BULK_THRESHOLD:
+                drop = set(keys_to_remove)
+                self._keys[rating] = [key for key in keys if key not in drop]
+                continue
+            for key in keys_to_remove:
+                pos = bisect_left(keys, key)
+                if pos < len(keys) and keys[pos] == key:
+                    del keys[pos]
+        for rating, keys_to_add in insertions.items():
+            keys = self._keys[rating]
+            if len(keys_to_add) > BULK_THRESHOLD:
+                keys.extend(keys_to_add)
+                keys.sort()
+                continue
+            for key in keys_to_add:
+                insort(keys, key)
+        return changes
+
+    def _ranges(self, start: int, end: int) -> List[Tuple[str, int, int]]:
+        ranges = []
+        for rating in RISK_ORDER + [UNRATED]:
+            keys = self._keys[rating]
+            lo = bisect_left(keys, (start,))
+            hi = bisect_left(keys, (end + 1,))
+            if hi > lo:
+                ranges.append((rating, lo, hi))
+        return ranges
+
+    def expiring(
+        self,
+        days: int,
+        as_of: Optional[date] = None,
+        offset: int = 0,
+        limit: int = 50,
+        include_expired: bool = False,
+    ) -> Tuple[int, List[KycExpiringClient]]:
+        """Return `(total, page)` of clients expiring within `days` of `as_of`.
+
+        Results are ordered by risk rating, then expiry date. `days_until_expiry`
+        is computed against `as_of` (today by default) rather than taken from
+        the report.
+        """
+        today = (as_of or date.today()).toordinal()
+        start = 0 if include_expired else today
+        ranges = self._ranges(start, today + days)
+        total = sum(hi - lo for _, lo, hi in ranges)
+
+        page = []
+        skip = offset
+        for rating, lo, hi in ranges:
+            if len(page) >= limit:
+                break
+            size = hi - lo
+            if skip >= size:
+                skip -= size
+                continue
+            take = min(limit - len(page), size - skip)
+            for ordinal, client_id in self._keys[rating][lo + skip:lo + skip + take]:
+                record = self._records[client_id]
+                page.append(KycExpiringClient(
+                    client_id=client_id,
+                    client_name=record.get("client_name", ""),
+                    kyc_expiry_date=date.fromordinal(ordinal).isoformat(),
+                    days_until_expiry=ordinal - today,
+                    risk_rating=record.get("risk_rating", UNRATED),
+                    last_review_date=record.get("last_review_date"),
+                    required_documents=record.get("required_documents", []),
+                ))
+            skip = 0
+        return total, page
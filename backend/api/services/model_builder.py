@@ -0,0 +1,81 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple, Type, TypeVar
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from config import settings
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Field name -> (source column/key, default, target type)
+FieldSpec = Dict[str, Tuple[str, Any, type]]
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model_cls: Type[ModelT]) -> TypeAdapter:
+    """Prebuilt validator for `List[model_cls]`, created once per model."""
+    return TypeAdapter(List[model_cls])
+
+
+def build_models(model_cls: Type[ModelT], records: List[Dict[str, Any]]) -> List[ModelT]:
+    """Build model instances from records in a single validation call.
+
+    The whole list goes through one prebuilt `TypeAdapter`, so the per-row
+    work stays inside pydantic-core. Records are normally already cast by
+    `frame_records`/`dict_records`; with STRICT_VALIDATION they hold the raw
+    source values and are validated in strict mode, rejecting any value that
+    would need coercion.
+    """
+    return list_adapter(model_cls).validate_python(records, strict=settings.strict_validation or None)
+
+
+def frame_records(df: "pd.DataFrame", spec: FieldSpec) -> List[Dict[str, Any]]:
+    """Convert DataFrame columns to typed records in bulk.
+
+    Each column is filled and cast once, instead of converting value by value
+    per row; missing columns take the default. With STRICT_VALIDATION the
+    source values are passed through uncast (empty cells as None), so bad data
+    fails validation instead of being coerced.
+    """
+    size = len(df)
+    names = list(spec)
+    strict = settings.strict_validation
+    columns = []
+    for column, default, cast in spec.values():
+        if column not in df.columns:
+            columns.append([default if strict else cast(default)] * size)
+        elif strict:
+            series = df[column].astype(object)
+            columns.append(series.where(series.notna(), None).tolist())
+        else:
+            columns.append(df[column].fillna(default).astype(cast).tolist())
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def dict_records(items: Iterable[Dict[str, Any]], spec: FieldSpec) -> List[Dict[str, Any]]:
+    """Map JSON objects to typed records using the same spec format as `frame_records`.
+
+    With STRICT_VALIDATION present values are passed through uncast.
+    """
+    fields = [(name, column, default, cast) for name, (column, default, cast) in spec.items()]
+    if settings.strict_validation:
+        return [{name: item.get(column, default) for name, column, default, _ in fields} for item in items]
+    return [
+        {name: cast(item.get(column, default)) for name, column, default, cast in fields}
+        for item in items
+    ]
+
+
+def model_response(model: BaseModel) -> Any:
+    """Serialize a response model straight to JSON.
+
+    FastAPI validates a returned model against `response_model` again before
+    serializing it. Returning a ready `Response` skips that second pass; the
+    declared `response_model` still drives the OpenAPI schema. With
+    STRICT_VALIDATION the model is returned as-is so FastAPI validates it.
+    """
+    if settings.strict_validation:
+        return model
+    return Response(content=model.model_dump_json(), media_type="application/json")
@@ -0,0 +1,375 @@
+import hashlib
+import heapq
+import json
+import random
+import re
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from config import settings
+from models.schemas import MarketSentiment, SentimentAggregate
+
+# Window name -> (bucket size in seconds, number of buckets)
+SENTIMENT_WINDOWS = {
+    "1h": (60, 60),
+    "1d": (900, 96),
+}
+
+# Keeps a * crc32 + b inside uint64 for vectorised hashing
+_MERSENNE_PRIME = (1 << 31) - 1
+_TOKEN_RE = re.compile(r"[a-z0-9$%.+]+")
+
+
+def sentiment_label(score: float) -> str:
+    if score >= 0.15:
+        return "POSITIVE"
+    if score <= -0.15:
+        return "NEGATIVE"
+    return "NEUTRAL"
+
+
+class HeadlineMinHash:
+    """MinHash signatures over headline word shingles, bucketed with LSH.
+
+    A signature of `bands * rows` hashes is split into bands; two headlines
+    become duplicate candidates when any band matches exactly, and are
+    confirmed when their estimated Jaccard similarity reaches the threshold.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 4, threshold: float = 0.6, seed: int = 1):
+        import numpy as np
+
+        rng = random.Random(seed)
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        size = bands * rows
+        self._a = np.array([rng.randrange(1, _MERSENNE_PRIME) for _ in range(size)], dtype=np.uint64)[:, None]
+        self._b = np.array([rng.randrange(0, _MERSENNE_PRIME) for _ in range(size)], dtype=np.uint64)[:, None]
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], str] = {}
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+
+    @staticmethod
+    def _shingles(headline: str) -> List[int]:
+        tokens = _TOKEN_RE.findall(headline.lower())
+        if len(tokens) < 2:
+            grams = tokens
+        else:
+            grams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return [zlib.crc32(gram.encode()) for gram in grams] or [0]
+
+    def signature(self, headline: str) -> Tuple[int, ...]:
+        import numpy as np
+
+        hashes = np.array(self._shingles(headline), dtype=np.uint64)
+        permuted = (self._a * hashes + self._b) % np.uint64(_MERSENNE_PRIME)
+        return tuple(permuted.min(axis=1).tolist())
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def find_duplicate(self, signature: Tuple[int, ...]) -> Optional[str]:
+        """Return the id of an indexed headline similar to `signature`, if any."""
+        checked = set()
+        for key in self._band_keys(signature):
+            candidate = self._buckets.get(key)
+            if candidate is None or candidate in checked:
+                continue
+            checked.add(candidate)
+            other = self._signatures[candidate]
+            matches = sum(1 for x, y in zip(signature, other) if x == y)
+            if matches / len(signature) >= self.threshold:
+                return candidate
+        return None
+
+    def add(self, article_id: str, signature: Tuple[int, ...]) -> None:
+        self._signatures[article_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, article_id)
+
+    def remove(self, article_id: str) -> None:
+        signature = self._signatures.pop(article_id, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            if self._buckets.get(key) == article_id:
+                del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+class RollingSentiment:
+    """Relevance-weighted sentiment over a ring of fixed time buckets.
+
+    Updates touch a single slot; reads sum at most `num_buckets` slots, so
+    both are independent of how many articles have been ingested.
+    """
+
+    __slots__ = ("bucket_seconds", "num_buckets", "_ids", "_weighted", "_weights", "_counts")
+
+    def __init__(self, bucket_seconds: int, num_buckets: int):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self._ids = [-1] * num_buckets
+        self._weighted = [0.0] * num_buckets
+        self._weights = [0.0] * num_buckets
+        self._counts = [0] * num_buckets
+
+    def add(self, ts: float, score: float, weight: float) -> None:
+        bucket_id = int(ts) // self.bucket_seconds
+        slot = bucket_id % self.num_buckets
+        if self._ids[slot] != bucket_id:
+            if self._ids[slot] > bucket_id:
+                # Slot already holds a newer bucket: the article is outside the window
+                return
+            self._ids[slot] = bucket_id
+            self._weighted[slot] = 0.0
+            self._weights[slot] = 0.0
+            self._counts[slot] = 0
+        self._weighted[slot] += score * weight
+        self._weights[slot] += weight
+        self._counts[slot] += 1
+
+    def remove(self, ts: float, score: float, weight: float) -> None:
+        """Take back an earlier `add`; a no-op once its bucket has left the ring."""
+        bucket_id = int(ts) // self.bucket_seconds
+        slot = bucket_id % self.num_buckets
+        if self._ids[slot] != bucket_id or not self._counts[slot]:
+            return
+        self._weighted[slot] -= score * weight
+        self._weights[slot] -= weight
+        self._counts[slot] -= 1
+
+    def totals(self, now: float) -> Tuple[int, float, float]:
+        """Return `(count, weighted_score_sum, weight_sum)` for the window ending at `now`."""
+        current = int(now) // self.bucket_seconds
+        oldest = current - self.num_buckets + 1
+        count, weighted, weights = 0, 0.0, 0.0
+        for slot, bucket_id in enumerate(self._ids):
+            if oldest <= bucket_id <= current:
+                count += self._counts[slot]
+                weighted += self._weighted[slot]
+                weights += self._weights[slot]
+        return count, weighted, weights
+
+
+class _Ingested(NamedTuple):
+    """What one ingested article contributed, so an edited copy can replace it.
+
+    A collapsed duplicate records what it would contribute and the article it
+    was collapsed onto, so it can take that article's place if it is retracted.
+    """
+
+    ts: float
+    digest: str
+    unique: bool
+    score: float
+    weight: float
+    targets: Tuple[Dict[str, RollingSentiment], ...]
+    signature: Tuple[int, ...]
+    primary: Optional[str] = None
+
+
+def _content_digest(article: Dict[str, Any]) -> str:
+    encoded = json.dumps(article, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class NewsSentimentEngine:
+    """Incremental market-news ingestion with near-duplicate collapsing.
+
+    Articles are ingested one at a time. Near-duplicate headlines (typically
+    syndicated copies) are collapsed onto the first article seen, and only
+    unique articles feed the rolling sentiment aggregates kept per category
+    and per ticker (tickers are upper-cased). An article re-ingested with
+    changed content replaces its earlier contribution; if it had duplicates
+    collapsed onto it, the earliest of them takes its place first. Windows
+    end at the newest article ingested unless a reference time is given, so
+    a feed that is not live still reports its own latest window.
+    """
+
+    def __init__(self, dedup_threshold: float = settings.news_dedup_threshold):
+        self.minhash = HeadlineMinHash(threshold=dedup_threshold)
+        self.retention_seconds = max(buckets * size for size, buckets in SENTIMENT_WINDOWS.values())
+        self._overall = self._new_windows()
+        self._by_category: Dict[str, Dict[str, RollingSentiment]] = {}
+        self._by_ticker: Dict[str, Dict[str, RollingSentiment]] = {}
+        self._seen: Dict[str, _Ingested] = {}
+        # Article id -> ids of the duplicates collapsed onto it, in ingest order
+        self._duplicates: Dict[str, List[str]] = {}
+        # Min-heap of (published ts, article id); entries of edited articles are skipped lazily
+        self._retention: List[Tuple[float, str]] = []
+        self.latest_ts: Optional[float] = None
+        self.articles_ingested = 0
+        self.duplicates_collapsed = 0
+
+    @staticmethod
+    def _new_windows() -> Dict[str, RollingSentiment]:
+        return {name: RollingSentiment(size, buckets) for name, (size, buckets) in SENTIMENT_WINDOWS.items()}
+
+    @staticmethod
+    def _parse_timestamp(value: Any) -> Optional[float]:
+        try:
+            ts = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp()
+
+    def _expire(self) -> None:
+        cutoff = self.latest_ts - self.retention_seconds
+        retention = self._retention
+        while retention and retention[0][0] < cutoff:
+            ts, article_id = heapq.heappop(retention)
+            entry = self._seen.get(article_id)
+            if entry is not None and entry.ts == ts:
+                del self._seen[article_id]
+                self.minhash.remove(article_id)
+                self._forget_duplicate(article_id, entry)
+                self._duplicates.pop(article_id, None)
+
+    def _forget_duplicate(self, article_id: str, entry: _Ingested) -> None:
+        duplicates = self._duplicates.get(entry.primary) if entry.primary else None
+        if duplicates and article_id in duplicates:
+            duplicates.remove(article_id)
+
+    @staticmethod
+    def _apply(entry: _Ingested) -> None:
+        for windows in entry.targets:
+            for rolling in windows.values():
+                rolling.add(entry.ts, entry.score, entry.weight)
+
+    def _promote(self, primary_id: str) -> None:
+        """Let the earliest duplicate collapsed onto `primary_id` count in its place."""
+        duplicates = self._duplicates.pop(primary_id, [])
+        if not duplicates:
+            return
+        article_id, rest = duplicates[0], duplicates[1:]
+        entry = self._seen[article_id]._replace(unique=True, primary=None)
+        self._seen[article_id] = entry
+        self.minhash.add(article_id, entry.signature)
+        self.duplicates_collapsed -= 1
+        self.articles_ingested += 1
+        self._apply(entry)
+        for duplicate_id in rest:
+            self._seen[duplicate_id] = self._seen[duplicate_id]._replace(primary=article_id)
+        if rest:
+            self._duplicates[article_id] = rest
+
+    def _retract(self, article_id: str, entry: _Ingested) -> None:
+        """Undo an article's earlier contribution before its edited copy is ingested."""
+        del self._seen[article_id]
+        if not entry.unique:
+            self._forget_duplicate(article_id, entry)
+            self.duplicates_collapsed -= 1
+            return
+        self.minhash.remove(article_id)
+        self.articles_ingested -= 1
+        for windows in entry.targets:
+            for rolling in windows.values():
+                rolling.remove(entry.ts, entry.score, entry.weight)
+        self._promote(article_id)
+
+    def ingest(self, article: Dict[str, Any]) -> bool:
+        """Ingest one article. Returns True if it was new or changed and not a near-duplicate.
+
+        Articles may arrive in any order; those older than the retention
+        period, measured from the newest article ingested, are ignored.
+        """
+        article_id = str(article.get("id") or article.get("headline", ""))
+        ts = self._parse_timestamp(article.get("published_at"))
+        if not article_id or ts is None:
+            return False
+        digest = _content_digest(article)
+        previous = self._seen.get(article_id)
+        if previous is not None:
+            if previous.digest == digest:
+                return False
+            self._retract(article_id, previous)
+        if self.latest_ts is not None and ts < self.latest_ts - self.retention_seconds:
+            return False
+
+        heapq.heappush(self._retention, (ts, article_id))
+        if self.latest_ts is None or ts > self.latest_ts:
+            self.latest_ts = ts
+            self._expire()
+
+        score = float(article.get("sentiment_score", 0) or 0)
+        weight = float(article.get("relevance_score", 1) or 0)
+        targets = [self._overall]
+        category = article.get("category")
+        if category:
+            targets.append(self._by_category.setdefault(category, self._new_windows()))
+        tickers = {str(ticker).strip().upper() for ticker in article.get("tickers_mentioned") or []}
+        for ticker in sorted(tickers - {""}):
+            targets.append(self._by_ticker.setdefault(ticker, self._new_windows()))
+
+        signature = self.minhash.signature(str(article.get("headline", "")))
+        primary = self.minhash.find_duplicate(signature)
+        if primary is not None:
+            self._seen[article_id] = _Ingested(ts, digest, False, score, weight, tuple(targets), signature, primary)
+            self._duplicates.setdefault(primary, []).append(article_id)
+            self.duplicates_collapsed += 1
+            return False
+        self.minhash.add(article_id, signature)
+        self.articles_ingested += 1
+        entry = _Ingested(ts, digest, True, score, weight, tuple(targets), signature)
+        self._apply(entry)
+        self._seen[article_id] = entry
+        return True
+
+    def _aggregate(self, key: str, rolling: RollingSentiment, now: float) -> SentimentAggregate:
+        count, weighted, weights = rolling.totals(now)
+        score = weighted / weights if weights else 0.0
+        return SentimentAggregate(
+            key=key,
+            article_count=count,
+            weighted_score=round(score, 4),
+            label=sentiment_label(score),
+        )
+
+    def sentiment(
+        self,
+        window: str = "1d",
+        ticker: Optional[str] = None,
+        limit: int = 20,
+        now: Optional[float] = None,
+    ) -> MarketSentiment:
+        """Snapshot rolling sentiment for the window ending at `now`.
+
+        `now` is in epoch seconds and defaults to the newest article ingested
+        (the current time before any article has been).
+        """
+        if now is None:
+            now = self.latest_ts if self.latest_ts is not None else time.time()
+
+        by_category = [
+            self._aggregate(category, windows[window], now)
+            for category, windows in self._by_category.items()
+        ]
+        if ticker:
+            windows = self._by_ticker.get(ticker.upper())
+            by_ticker = [self._aggregate(ticker.upper(), windows[window], now)] if windows else []
+        else:
+            by_ticker = [
+                self._aggregate(symbol, windows[window], now)
+                for symbol, windows in self._by_ticker.items()
+            ]
+
+        by_category = sorted((a for a in by_category if a.article_count), key=lambda a: -a.article_count)
+        by_ticker = sorted((a for a in by_ticker if a.article_count), key=lambda a: -a.article_count)
+
+        return MarketSentiment(
+            window=window,
+            as_of=datetime.fromtimestamp(now, tz=timezone.utc),
+            ticker=ticker.upper() if ticker else None,
+            overall=self._aggregate("ALL", self._overall[window], now),
+            by_category=by_category,
+            by_ticker=by_ticker[:limit],
+            articles_ingested=self.articles_ingested,
+            duplicates_collapsed=self.duplicates_collapsed,
+        )
@@ -0,0 +1,560 @@
+import asyncio
+import html
+import smtplib
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import httpx
+from config import settings
+from models.schemas import AlertPriority, ChannelStats, NotificationRequest, NotificationStats
+from services.results_store import results_store
+
+PRIORITY_EMOJI = {"LOW": "ℹ️", "MEDIUM": "⚠️", "HIGH": "🔶", "CRITICAL": "🚨"}
+PRIORITY_COLOR = {"LOW": "#00ff00", "MEDIUM": "#ffff00", "HIGH": "#ffa500", "CRITICAL": "#ff0000"}
+PRIORITY_PREFIX = {"HIGH": "[ACTION REQUIRED] ", "CRITICAL": "[URGENT] "}
+# Audit rows kept for the next flush while the results store is failing; the oldest are dropped beyond this
+MAX_UNWRITTEN_AUDIT_ROWS = 10_000
+
+
+class Digest(NamedTuple):
+    """Alerts of one alert_type and priority bound for one channel destination."""
+
+    digest_id: str
+    channel: str
+    destination: str
+    alert_type: str
+    priority: str
+    alerts: List[NotificationRequest]
+
+    @property
+    def title(self) -> str:
+        if len(self.alerts) == 1:
+            return self.alerts[0].title
+        return f"{len(self.alerts)} {self.alert_type} alerts"
+
+    @property
+    def text(self) -> str:
+        if len(self.alerts) == 1:
+            return self.alerts[0].message
+        return "\n\n".join(f"• {alert.title}\n{alert.message}" for alert in self.alerts)
+
+
+def slack_payload(digest: Digest) -> Dict[str, Any]:
+    return {
+        "channel": digest.destination,
+        "username": "Finance AI Agent",
+        "icon_emoji": ":robot_face:",
+        "attachments": [
+            {
+                "color": PRIORITY_COLOR.get(digest.priority, "#ffff00"),
+                "title": f"{PRIORITY_EMOJI.get(digest.priority, '📢')} {digest.title}",
+                "text": digest.text,
+                "fields": [
+                    {"title": "Alert Type", "value": digest.alert_type, "short": True},
+                    {"title": "Priority", "value": digest.priority, "short": True},
+                ],
+                "footer": "Kestra Finance AI Orchestrator",
+                "ts": int(time.time()),
+            }
+        ],
+    }
+
+
+def email_content(digest: Digest) -> Dict[str, Any]:
+    header_color = PRIORITY_COLOR.get(digest.priority, "#ffff00")
+    text_color = "white" if digest.priority in ("CRITICAL", "HIGH") else "black"
+    # Alert text comes from callers of the API; never let it through as markup
+    alert_type, priority = html.escape(digest.alert_type), html.escape(digest.priority)
+    return {
+        "to": digest.destination.split(","),
+        "subject": f"{PRIORITY_PREFIX.get(digest.priority, '')}{digest.title}",
+        "body_text": digest.text,
+        "body_html": f"""
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <div style="background-color: {header_color}; padding: 10px; color: {text_color};">
+                <h2>{alert_type} Alert - {priority} Priority</h2>
+            </div>
+            <div style="padding: 20px;">
+                <h3>{html.escape(digest.title)}</h3>
+                <pre style="background-color: #f5f5f5; padding: 15px; white-space: pre-wrap;">{html.escape(digest.text)}</pre>
+                <hr>
+                <p style="color: #666; font-size: 12px;">
+                    Generated by Kestra Finance AI Orchestrator<br>
+                    Timestamp: {datetime.utcnow().isoformat()}Z
+                </p>
+            </div>
+        </body>
+        </html>
+        """,
+    }
+
+
+def incident_ticket(digest: Digest) -> Dict[str, Any]:
+    return {
+        "ticket_type": "INCIDENT",
+        "priority": "P1",
+        "title": digest.title,
+        "description": digest.text,
+        "category": digest.alert_type,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "assigned_to": digest.destination,
+        "status": "OPEN",
+        "sla_response": "15 minutes",
+        "sla_resolution": "4 hours",
+    }
+
+
+class RateLimiter:
+    """Token bucket: `rate` sends per second on average, bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Wait for a token. Returns the seconds spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class NotificationChannel(ABC):
+    """Where digests go. Subclasses implement `send` and close any pooled connection in `close`."""
+
+    backend = "base"
+
+    def __init__(self, name: str, rate: float, burst: int = settings.notification_burst):
+        self.name = name
+        self.limiter = RateLimiter(rate, burst)
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited_seconds = 0.0
+
+    @abstractmethod
+    async def send(self, digest: Digest) -> None:
+        """Deliver one digest; raise to have it retried."""
+
+    async def close(self) -> None:
+        pass
+
+    def to_model(self) -> ChannelStats:
+        return ChannelStats(
+            channel=self.name,
+            backend=self.backend,
+            sent=self.sent,
+            failed=self.failed,
+            retries=self.retries,
+            rate_limited_seconds=round(self.rate_limited_seconds, 3),
+        )
+
+
+class SlackChannel(NotificationChannel):
+    """Posts digests to a Slack incoming webhook over one keep-alive HTTP client."""
+
+    backend = "slack-webhook"
+
+    def __init__(self, webhook_url: str, rate: float = settings.notification_slack_rate, timeout: float = 10.0):
+        super().__init__("slack", rate)
+        self.webhook_url = webhook_url
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=httpx.Limits(max_keepalive_connections=4))
+        return self._client
+
+    async def send(self, digest: Digest) -> None:
+        response = await self.client.post(self.webhook_url, json=slack_payload(digest))
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class EmailChannel(NotificationChannel):
+    """Sends digests over one SMTP connection, reopened when the server drops it."""
+
+    backend = "smtp"
+
+    def __init__(
+        self,
+        host: str,
+        port: int = settings.smtp_port,
+        username: str = settings.smtp_username,
+        password: str = settings.smtp_password,
+        sender: str = settings.smtp_sender,
+        rate: float = settings.notification_email_rate,
+        timeout: float = 10.0,
+    ):
+        super().__init__("email", rate)
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.timeout = timeout
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.port == 587:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            self._smtp = smtp
+        return self._smtp
+
+    def _disconnect(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def _send_sync(self, message: EmailMessage) -> None:
+        with self._lock:
+            try:
+                self._connection().send_message(message)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Drop the connection; the retry opens a fresh one
+                self._disconnect()
+                raise
+
+    async def send(self, digest: Digest) -> None:
+        content = email_content(digest)
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(content["to"])
+        message["Subject"] = content["subject"]
+        message.set_content(content["body_text"])
+        message.add_alternative(content["body_html"], subtype="html")
+        await asyncio.to_thread(self._send_sync, message)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._disconnect)
+
+
+class LogChannel(NotificationChannel):
+    """Local stand-in that prints what would have been sent."""
+
+    backend = "log"
+
+    async def send(self, digest: Digest) -> None:
+        print(f"[{self.name}] {digest.priority} {digest.alert_type} digest {digest.digest_id} "
+              f"({len(digest.alerts)} alerts) -> {digest.destination}: {digest.title}")
+
+
+class MemoryChannel(NotificationChannel):
+    """Local stand-in that keeps every digest in `sent_digests`, e.g. for tests and benchmarks."""
+
+    backend = "memory"
+
+    def __init__(self, name: str, rate: float = 0, burst: int = 1):
+        super().__init__(name, rate, burst)
+        self.sent_digests: List[Digest] = []
+
+    async def send(self, digest: Digest) -> None:
+        self.sent_digests.append(digest)
+
+
+def default_channels() -> Dict[str, NotificationChannel]:
+    """Slack and email when configured, otherwise log stand-ins. Tickets always go to the log."""
+    slack = SlackChannel(settings.slack_webhook_url) if settings.slack_webhook_url else (
+        LogChannel("slack", settings.notification_slack_rate)
+    )
+    email = EmailChannel(settings.smtp_host) if settings.smtp_host else (
+        LogChannel("email", settings.notification_email_rate)
+    )
+    ticket = LogChannel("ticket", settings.notification_ticket_rate)
+    return {channel.name: channel for channel in (slack, email, ticket)}
+
+
+def alert_channels(alert: NotificationRequest) -> List[str]:
+    """Channels an alert goes to: its Slack and email flags, plus a ticket when CRITICAL."""
+    channels = []
+    if alert.include_slack:
+        channels.append("slack")
+    if alert.include_email and alert.recipients:
+        channels.append("email")
+    if alert.priority == AlertPriority.CRITICAL:
+        channels.append("ticket")
+    return channels
+
+
+def route_digests(alert_type: str, priority: str, alerts: List[NotificationRequest], digest_id: str) -> List[Digest]:
+    """Split one alert_type/priority group into a digest per channel destination.
+
+    Slack digests go per Slack channel and email digests per recipient list,
+    so no one receives alerts addressed to someone else. CRITICAL groups also
+    open one incident ticket.
+    """
+    destinations: Dict[Tuple[str, str], List[NotificationRequest]] = {}
+    for alert in alerts:
+        for channel in alert_channels(alert):
+            if channel == "slack":
+                destination = alert.slack_channel
+            elif channel == "email":
+                destination = ",".join(sorted(alert.recipients))
+            else:
+                destination = "on-call-team"
+            destinations.setdefault((channel, destination), []).append(alert)
+    return [
+        Digest(digest_id, channel, destination, alert_type, priority, grouped)
+        for (channel, destination), grouped in destinations.items()
+    ]
+
+
+class PendingGroup:
+    """Alerts of one alert_type and priority waiting for their window to close."""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.alerts: List[Tuple[str, NotificationRequest]] = []
+
+
+class NotificationDispatcher:
+    """Queues alerts in-process and sends them as digests.
+
+    Alerts sharing an alert_type and priority are held for a window (shorter
+    for CRITICAL) and then sent as one digest per channel destination, so an
+    incident produces a handful of messages instead of one per alert. Each
+    channel has its own rate limit and retries with exponential backoff. The
+    audit log for everything flushed together is one batched write to the
+    results store; rows from a failed write are kept and written with the
+    next flush.
+    """
+
+    def __init__(
+        self,
+        channels: Optional[Dict[str, NotificationChannel]] = None,
+        window: float = settings.notification_window_seconds,
+        critical_window: float = settings.notification_critical_window_seconds,
+        max_digest_size: int = settings.notification_max_digest_size,
+        queue_size: int = settings.notification_queue_size,
+        retries: int = settings.notification_retries,
+        retry_backoff: float = settings.notification_retry_backoff_seconds,
+        drain_timeout: float = 10.0,
+    ):
+        self.channels = channels if channels is not None else default_channels()
+        self.window = window
+        self.critical_window = critical_window
+        self.max_digest_size = max_digest_size
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.drain_timeout = drain_timeout
+        self.alerts_received = 0
+        self.alerts_dropped = 0
+        self.audit_rows_written = 0
+        self.audit_rows_dropped = 0
+        self._unwritten_audit: List[Dict[str, Any]] = []
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._pending: Dict[Tuple[str, str], PendingGroup] = {}
+        self._full: List[Tuple[Tuple[str, str], List[Tuple[str, NotificationRequest]]]] = []
+        self._deliveries: set = set()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def register_channel(self, channel: NotificationChannel) -> None:
+        """Add a channel or replace the one with the same name."""
+        self.channels[channel.name] = channel
+
+    def submit(self, alerts: List[NotificationRequest]) -> int:
+        """Queue alerts without waiting. A batch is accepted whole or not at all;
+        returns the number queued (0 when the queue has no room for the batch)."""
+        maxsize = self._queue.maxsize
+        if maxsize > 0 and maxsize - self._queue.qsize() < len(alerts):
+            self.alerts_dropped += len(alerts)
+            return 0
+        received_at = datetime.utcnow().isoformat()
+        for alert in alerts:
+            self._queue.put_nowait((received_at, alert))
+        self.alerts_received += len(alerts)
+        return len(alerts)
+
+    def _add(self, received_at: str, alert: NotificationRequest) -> None:
+        key = (alert.alert_type.upper(), alert.priority.value)
+        group = self._pending.get(key)
+        if group is None:
+            window = self.critical_window if alert.priority == AlertPriority.CRITICAL else self.window
+            group = self._pending[key] = PendingGroup(time.monotonic() + window)
+        group.alerts.append((received_at, alert))
+        if len(group.alerts) >= self.max_digest_size:
+            # Send a full group now; the next alert of this kind opens a new window
+            self._full.append((key, self._pending.pop(key).alerts))
+
+    def _drain_queue(self) -> None:
+        while not self._queue.empty():
+            self._add(*self._queue.get_nowait())
+
+    def _take_due(self, force: bool = False) -> List[Tuple[Tuple[str, str], List[Tuple[str, NotificationRequest]]]]:
+        now = time.monotonic()
+        due = [key for key, group in self._pending.items() if force or group.deadline <= now]
+        taken, self._full = self._full, []
+        return taken + [(key, self._pending.pop(key).alerts) for key in due]
+
+    async def _flush(self, groups: List[Tuple[Tuple[str, str], List[Tuple[str, NotificationRequest]]]]) -> None:
+        audit_rows, digests = [], []
+        for (alert_type, priority), entries in groups:
+            digest_id = uuid.uuid4().hex[:12]
+            digests.extend(route_digests(alert_type, priority, [alert for _, alert in entries], digest_id))
+            for received_at, alert in entries:
+                audit_rows.append({
+                    "digest_id": digest_id,
+                    "alert_type": alert_type,
+                    "priority": priority,
+                    "title": alert.title,
+                    "message": alert.message,
+                    "channels": alert_channels(alert),
+                    "recipients": alert.recipients,
+                    "slack_channel": alert.slack_channel if alert.include_slack else None,
+                    "received_at": received_at,
+                })
+
+        await self._write_audit(audit_rows)
+
+        for digest in digests:
+            task = asyncio.create_task(self._deliver(digest))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+    async def _write_audit(self, audit_rows: List[Dict[str, Any]]) -> None:
+        """Write these rows after any left over from a failed write; on failure keep them all for next time."""
+        rows = self._unwritten_audit + audit_rows
+        if not rows:
+            return
+        try:
+            self.audit_rows_written += await asyncio.to_thread(results_store.save_notification_audit, rows)
+            self._unwritten_audit = []
+        except Exception as e:
+            excess = max(0, len(rows) - MAX_UNWRITTEN_AUDIT_ROWS)
+            self.audit_rows_dropped += excess
+            self._unwritten_audit = rows[excess:]
+            print(f"Notification audit write failed, {len(self._unwritten_audit)} rows kept for the next flush: {e}")
+
+    async def _deliver(self, digest: Digest) -> None:
+        channel = self.channels.get(digest.channel)
+        if channel is None:
+            return
+        error: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            channel.rate_limited_seconds += await channel.limiter.acquire()
+            try:
+                await channel.send(digest)
+                channel.sent += 1
+                return
+            except Exception as e:
+                error = e
+            if attempt < self.retries:
+                channel.retries += 1
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+        channel.failed += 1
+        print(f"Notification to {channel.name} {digest.destination} failed after {self.retries + 1} attempts: {error}")
+
+    async def flush(self) -> None:
+        """Send everything queued or pending now, without waiting for windows to close."""
+        self._drain_queue()
+        groups = self._take_due(force=True)
+        if groups:
+            await self._flush(groups)
+        else:
+            await self._write_audit([])
+
+    async def _next_alert(self, timeout: Optional[float]) -> None:
+        """Wait up to `timeout` for an alert and queue it, returning early when stopping."""
+        get = asyncio.ensure_future(self._queue.get())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait((get, stopping), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopping.cancel()
+            # Cancelling a get that has not returned leaves its alert in the queue
+            if not get.done():
+                get.cancel()
+        if get.done() and not get.cancelled():
+            self._add(*get.result())
+            self._drain_queue()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                timeout = None
+                if self._pending:
+                    timeout = max(0.0, min(group.deadline for group in self._pending.values()) - time.monotonic())
+                await self._next_alert(timeout)
+                groups = self._take_due()
+                if groups:
+                    await self._flush(groups)
+            except Exception as e:
+                print(f"Notification dispatch error: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop, send what is still queued or pending, then close channel connections.
+
+        The loop is signalled rather than cancelled, so a flush in progress
+        completes and no popped group is lost.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Notification flush on shutdown failed: {e}")
+        if self._deliveries:
+            _, unfinished = await asyncio.wait(set(self._deliveries), timeout=self.drain_timeout)
+            for task in unfinished:
+                task.cancel()
+        for channel in self.channels.values():
+            await channel.close()
+
+    def stats(self) -> NotificationStats:
+        return NotificationStats(
+            queue_depth=self.queue_depth,
+            pending_alerts=sum(len(group.alerts) for group in self._pending.values())
+            + sum(len(alerts) for _, alerts in self._full),
+            alerts_received=self.alerts_received,
+            alerts_dropped=self.alerts_dropped,
+            digests_sent=sum(channel.sent for channel in self.channels.values()),
+            audit_rows_written=self.audit_rows_written,
+            channels=[channel.to_model() for channel in self.channels.values()],
+        )
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,130 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from analytics.portfolio import partition_summary
+from config import settings
+from services.snapshot import snapshot_manager
+
+# The default portfolio's files, at the top of the portfolio domain
+ROOT_PARTITION_FILES = ("portfolio/holdings.json", "portfolio/performance.json", "portfolio/var_metrics.csv")
+PARTITION_FILE_NAMES = ("holdings.json", "performance.json", "var_metrics.csv")
+
+
+class PortfolioPartition(NamedTuple):
+    portfolio_id: str
+    # holdings, performance, var_metrics (relative to the data path)
+    relpaths: Tuple[str, str, str]
+
+
+def discover_partitions(data_path: Path, root_portfolio_id: str) -> Dict[str, PortfolioPartition]:
+    """Map portfolio_id -> partition files.
+
+    The top-level portfolio/ files are the default portfolio; every directory
+    under `portfolio_partitions_dir` is one more portfolio named after the
+    directory. A directory named like the default portfolio takes precedence.
+    """
+    partitions: Dict[str, PortfolioPartition] = {}
+    if (data_path / ROOT_PARTITION_FILES[0]).is_file():
+        partitions[root_portfolio_id] = PortfolioPartition(root_portfolio_id, ROOT_PARTITION_FILES)
+
+    base = settings.portfolio_partitions_dir.strip("/")
+    try:
+        entries = sorted(os.scandir(data_path / base), key=lambda entry: entry.name)
+    except OSError:
+        return partitions
+    for entry in entries:
+        if entry.is_dir() and not entry.name.startswith("."):
+            partitions[entry.name] = PortfolioPartition(
+                entry.name, tuple(f"{base}/{entry.name}/{name}" for name in PARTITION_FILE_NAMES)
+            )
+    return partitions
+
+
+def find_partition(data_path: Path, root_portfolio_id: str, portfolio_id: str) -> Optional[PortfolioPartition]:
+    """Look up one partition without scanning the partitions directory."""
+    if not portfolio_id or portfolio_id.startswith(".") or "/" in portfolio_id or "\\" in portfolio_id:
+        return None
+    base = settings.portfolio_partitions_dir.strip("/")
+    if (data_path / base / portfolio_id).is_dir():
+        return PortfolioPartition(portfolio_id, tuple(f"{base}/{portfolio_id}/{name}" for name in PARTITION_FILE_NAMES))
+    if portfolio_id == root_portfolio_id and (data_path / ROOT_PARTITION_FILES[0]).is_file():
+        return PortfolioPartition(portfolio_id, ROOT_PARTITION_FILES)
+    return None
+
+
+def load_partition(portfolio_id: str, relpaths: Tuple[str, str, str], data_path: str) -> Dict[str, Any]:
+    """Read one portfolio's holdings, performance and VaR files and summarise them.
+
+    Reads go through the shared snapshot, like every other data read, so the
+    default portfolio and the partitions are served the same way in the API
+    process and in pool workers. Top-level and picklable so it can run in a
+    worker process.
+    """
+    holdings_path, performance_path, var_path = (Path(data_path) / relpath for relpath in relpaths)
+    var_frame = snapshot_manager.read_csv(var_path)[1].astype(object)
+    return partition_summary(
+        portfolio_id,
+        snapshot_manager.read_json(holdings_path)[1],
+        snapshot_manager.read_json(performance_path)[1],
+        var_frame.where(var_frame.notna(), None).to_dict("records"),
+    )
+
+
+class PartitionAggregator:
+    """Aggregates portfolio partitions, fanning out to worker processes for large batches.
+
+    Each partition is summarised by `load_partition`; workers map the same
+    published snapshot files as the API process, so a file parsed once is
+    not parsed again per worker. Small batches (a single changed portfolio, say) run inline, where the
+    pool's start-up and pickling would cost more than the work.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.portfolio_workers,
+        parallel_min: int = settings.portfolio_parallel_min,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min = parallel_min
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the API process runs threads (warm-up, probes)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def aggregate(self, data_path: Path, partitions: List[PortfolioPartition]) -> Dict[str, Dict[str, Any]]:
+        """Return portfolio_id -> partition summary for every given partition."""
+        ids = [partition.portfolio_id for partition in partitions]
+        relpaths = [partition.relpaths for partition in partitions]
+        paths = [str(data_path)] * len(partitions)
+        if self.workers <= 1 or len(partitions) < self.parallel_min:
+            return dict(zip(ids, map(load_partition, ids, relpaths, paths)))
+
+        chunksize = max(1, len(partitions) // (self.workers * 4))
+        try:
+            summaries = list(self._executor().map(load_partition, ids, relpaths, paths, chunksize=chunksize))
+        except Exception as e:
+            # A broken pool (e.g. a worker killed by the OOM killer) must not take the endpoint down
+            print(f"Parallel portfolio aggregation failed, running inline: {e}")
+            self.shutdown()
+            summaries = list(map(load_partition, ids, relpaths, paths))
+        return dict(zip(ids, summaries))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+portfolio_aggregator = PartitionAggregator()
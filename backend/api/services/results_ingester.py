@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional, Set
+from config import settings
+from services.circuit_breaker import CircuitOpenError
+from services.kestra import kestra_service
+from services.results_store import FINISHED_STATES, agent_results_from_execution, results_store
+
+
+class ResultsIngester:
+    """Background task that copies finished Kestra executions into the results store.
+
+    Executions arrive either by polling Kestra on an interval or by webhook
+    callback (`ingest_execution`). Either way the execution is read from
+    Kestra itself, never taken from the caller. Retention and compaction run
+    on their own, slower schedule.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = settings.results_poll_interval_seconds,
+        compaction_interval: float = settings.results_compaction_interval_seconds,
+    ):
+        self.poll_interval = poll_interval
+        self.compaction_interval = compaction_interval
+        self._task: Optional[asyncio.Task] = None
+        self._last_compaction = 0.0
+        # Executions seen still running, checked directly until they finish
+        self._unfinished: Set[str] = set()
+
+    async def _store(self, data: Dict[str, Any]) -> bool:
+        execution = kestra_service.parse_execution(data)
+        if execution.state.value not in FINISHED_STATES:
+            return False
+
+        results = agent_results_from_execution(data)
+        await asyncio.to_thread(results_store.save_execution, execution, results)
+        return True
+
+    async def ingest_execution(self, execution_id: str) -> bool:
+        """Fetch one execution from Kestra and store it. Returns True if it was finished and stored."""
+        data = await kestra_service.get_execution(execution_id)
+        return data is not None and await self._store(data)
+
+    async def poll_once(self) -> int:
+        """Ingest finished executions not yet in the store. Returns the number stored.
+
+        Pages back through Kestra's executions, newest first, until one that
+        is already stored, so a burst larger than a page is not lost.
+        Executions still running are remembered and fetched directly on later
+        polls: by the time they finish, newer stored executions may hide them
+        from the page scan.
+        """
+        stored = 0
+        batch = settings.results_poll_batch_size
+        remembered = set(self._unfinished)
+        for page in range(1, settings.results_poll_max_pages + 1):
+            summaries = await kestra_service.list_executions(limit=batch, page=page)
+            caught_up = False
+            for summary in summaries:
+                execution_id = summary.get("id")
+                if not execution_id:
+                    continue
+                remembered.discard(execution_id)
+                if await asyncio.to_thread(results_store.has_finished_execution, execution_id):
+                    caught_up = True
+                    continue
+                if await self.ingest_execution(execution_id):
+                    stored += 1
+                    self._unfinished.discard(execution_id)
+                else:
+                    self._unfinished.add(execution_id)
+            if caught_up or len(summaries) < batch:
+                break
+
+        for execution_id in remembered:
+            data = await kestra_service.get_execution(execution_id)
+            if data is None:
+                self._unfinished.discard(execution_id)  # no longer known to Kestra
+            elif await self._store(data):
+                stored += 1
+                self._unfinished.discard(execution_id)
+
+        next_run = await kestra_service.get_next_scheduled_run()
+        if next_run:
+            await asyncio.to_thread(results_store.set_metadata, "next_scheduled_run", next_run)
+        return stored
+
+    async def maintain(self) -> None:
+        """Apply retention and compact the database."""
+        await asyncio.to_thread(results_store.apply_retention)
+        await asyncio.to_thread(results_store.compact)
+        self._last_compaction = time.monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+                if time.monotonic() - self._last_compaction >= self.compaction_interval:
+                    await self.maintain()
+            except asyncio.CancelledError:
+                raise
+            except CircuitOpenError:
+                pass  # Kestra is down; the health monitor closes the circuit once it is back
+            except Exception as e:
+                print(f"Results ingestion error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+results_ingester = ResultsIngester()
@@ -0,0 +1,500 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from config import settings
+from models.schemas import AgentAlert, AgentResult, ExecutionState, ExecutionStatus, LogLevel, StatusLevel
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id TEXT PRIMARY KEY,
+    flow_id      TEXT NOT NULL,
+    namespace    TEXT NOT NULL,
+    state        TEXT NOT NULL,
+    start_date   TEXT,
+    end_date     TEXT,
+    duration_ms  INTEGER,
+    outputs      TEXT,
+    ingested_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_flow_time ON executions (flow_id, start_date DESC);
+CREATE INDEX IF NOT EXISTS idx_executions_state_time ON executions (state, start_date DESC);
+CREATE INDEX IF NOT EXISTS idx_executions_time ON executions (start_date DESC);
+
+CREATE TABLE IF NOT EXISTS agent_results (
+    execution_id TEXT NOT NULL REFERENCES executions (execution_id) ON DELETE CASCADE,
+    agent        TEXT NOT NULL,
+    risk_score   INTEGER NOT NULL,
+    status       TEXT NOT NULL,
+    metrics      TEXT NOT NULL,
+    ai_summary   TEXT NOT NULL,
+    alerts       TEXT NOT NULL,
+    timestamp    TEXT NOT NULL,
+    PRIMARY KEY (execution_id, agent)
+);
+CREATE INDEX IF NOT EXISTS idx_agent_results_agent_time ON agent_results (agent, timestamp DESC);
+
+-- Logs of finished executions; a row in execution_log_sets marks an execution as cached
+CREATE TABLE IF NOT EXISTS execution_log_sets (
+    execution_id TEXT PRIMARY KEY,
+    line_count   INTEGER NOT NULL,
+    cached_at    TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS execution_logs (
+    execution_id TEXT NOT NULL,
+    idx          INTEGER NOT NULL,
+    timestamp    TEXT,
+    task_id      TEXT,
+    level_rank   INTEGER NOT NULL,
+    entry        TEXT NOT NULL,
+    PRIMARY KEY (execution_id, idx)
+) WITHOUT ROWID;
+
+-- One row per alert accepted by the notification dispatcher, written once per digest flush
+CREATE TABLE IF NOT EXISTS notification_audit (
+    id           INTEGER PRIMARY KEY,
+    digest_id    TEXT NOT NULL,
+    alert_type   TEXT NOT NULL,
+    priority     TEXT NOT NULL,
+    title        TEXT NOT NULL,
+    message      TEXT NOT NULL,
+    channels     TEXT NOT NULL,
+    recipients   TEXT NOT NULL,
+    slack_channel TEXT,
+    received_at  TEXT NOT NULL,
+    logged_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notification_audit_time ON notification_audit (received_at DESC);
+
+CREATE TABLE IF NOT EXISTS metadata (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FINISHED_STATES = {
+    ExecutionState.SUCCESS.value,
+    ExecutionState.WARNING.value,
+    ExecutionState.FAILED.value,
+    ExecutionState.KILLED.value,
+}
+
+
+LOG_LEVEL_RANKS = {level.value: rank for rank, level in enumerate(LogLevel)}
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def log_timestamp(value: Any) -> Optional[str]:
+    """Normalise a log timestamp to naive UTC ISO with microseconds, so timestamps sort as strings."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds")
+
+
+def log_level_rank(level: Optional[str]) -> int:
+    """Severity rank of a Kestra log level; unknown levels rank as INFO."""
+    return LOG_LEVEL_RANKS.get((level or "").upper(), LOG_LEVEL_RANKS[LogLevel.INFO.value])
+
+
+class ResultsStore:
+    """Embedded SQLite store for finished Kestra executions, agent results and logs.
+
+    The dashboard and history endpoints read from here instead of calling
+    Kestra. The database runs in WAL mode: writes share one connection and
+    are serialized by a lock, while each reading thread has its own
+    connection, so reads neither wait for writes nor for each other.
+    """
+
+    def __init__(self, db_path: str = settings.results_db_path):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _read(self, sql: str, params: Tuple[Any, ...] = ()) -> List[sqlite3.Row]:
+        """Run a query on the calling thread's read connection."""
+        if self.db_path == ":memory:":
+            # Every connection to :memory: is a separate database
+            with self._lock:
+                return self.conn.execute(sql, params).fetchall()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._conn is None:
+                with self._lock:
+                    self.conn  # creates the database and schema
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON")
+            with self._readers_lock:
+                self._readers.append(conn)
+            self._local.conn = conn
+        return conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            with self._readers_lock:
+                for conn in self._readers:
+                    conn.close()
+                self._readers = []
+                self._local = threading.local()
+
+    # Writes
+
+    def save_execution(self, execution: ExecutionStatus, agent_results: Optional[List[AgentResult]] = None) -> None:
+        """Insert or replace an execution together with its agent results."""
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO executions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        execution.execution_id,
+                        execution.flow_id,
+                        execution.namespace,
+                        execution.state.value,
+                        _iso(execution.start_date),
+                        _iso(execution.end_date),
+                        execution.duration_ms,
+                        json.dumps(execution.outputs) if execution.outputs is not None else None,
+                        datetime.utcnow().isoformat(),
+                    ),
+                )
+                conn.execute("DELETE FROM agent_results WHERE execution_id = ?", (execution.execution_id,))
+                conn.executemany(
+                    "INSERT INTO agent_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            execution.execution_id,
+                            result.agent,
+                            result.risk_score,
+                            result.status.value,
+                            json.dumps(result.metrics),
+                            result.ai_summary,
+                            json.dumps([alert.model_dump() for alert in result.alerts]),
+                            _iso(result.timestamp),
+                        )
+                        for result in agent_results or []
+                    ],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def save_execution_logs(self, execution_id: str, logs: List[Dict[str, Any]]) -> None:
+        """Replace the cached log lines of a finished execution."""
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN")
+            try:
+                conn.execute("DELETE FROM execution_logs WHERE execution_id = ?", (execution_id,))
+                conn.executemany(
+                    "INSERT INTO execution_logs VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            execution_id,
+                            index,
+                            log_timestamp(entry.get("timestamp")),
+                            entry.get("taskId"),
+                            log_level_rank(entry.get("level")),
+                            json.dumps(entry),
+                        )
+                        for index, entry in enumerate(logs)
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO execution_log_sets VALUES (?, ?, ?)",
+                    (execution_id, len(logs), datetime.utcnow().isoformat()),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def save_notification_audit(self, rows: List[Dict[str, Any]]) -> int:
+        """Append audit rows for a flushed batch of alerts in one transaction. Returns rows written."""
+        if not rows:
+            return 0
+        logged_at = datetime.utcnow().isoformat()
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    """
+                    INSERT INTO notification_audit
+                        (digest_id, alert_type, priority, title, message, channels, recipients, slack_channel,
+                         received_at, logged_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            row["digest_id"],
+                            row["alert_type"],
+                            row["priority"],
+                            row["title"],
+                            row["message"],
+                            json.dumps(row["channels"]),
+                            json.dumps(row["recipients"]),
+                            row.get("slack_channel"),
+                            row["received_at"],
+                            logged_at,
+                        )
+                        for row in rows
+                    ],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def set_metadata(self, key: str, value: Optional[str]) -> None:
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO metadata VALUES (?, ?)", (key, value))
+
+    # Reads
+
+    def get_metadata(self, key: str) -> Optional[str]:
+        rows = self._read("SELECT value FROM metadata WHERE key = ?", (key,))
+        return rows[0]["value"] if rows else None
+
+    def has_finished_execution(self, execution_id: str) -> bool:
+        rows = self._read("SELECT state FROM executions WHERE execution_id = ?", (execution_id,))
+        return bool(rows) and rows[0]["state"] in FINISHED_STATES
+
+    def has_execution_logs(self, execution_id: str) -> bool:
+        return bool(self._read("SELECT 1 FROM execution_log_sets WHERE execution_id = ?", (execution_id,)))
+
+    def query_execution_logs(
+        self,
+        execution_id: str,
+        after: Optional[int] = None,
+        since: Optional[datetime] = None,
+        task_id: Optional[str] = None,
+        min_level: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return cached log lines in index order, each with its `index` added; all of them if `limit` is None."""
+        clauses, params = ["execution_id = ?"], [execution_id]
+        if after is not None:
+            clauses.append("idx > ?")
+            params.append(after)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(log_timestamp(since))
+        if task_id:
+            clauses.append("task_id = ?")
+            params.append(task_id)
+        if min_level:
+            clauses.append("level_rank >= ?")
+            params.append(log_level_rank(min_level))
+        rows = self._read(
+            f"SELECT idx, entry FROM execution_logs WHERE {' AND '.join(clauses)} ORDER BY idx LIMIT ?",
+            (*params, limit if limit is not None else -1),
+        )
+        return [{**json.loads(row["entry"]), "index": row["idx"]} for row in rows]
+
+    @staticmethod
+    def _row_to_execution(row: sqlite3.Row) -> ExecutionStatus:
+        return ExecutionStatus(
+            execution_id=row["execution_id"],
+            flow_id=row["flow_id"],
+            namespace=row["namespace"],
+            state=row["state"],
+            start_date=row["start_date"],
+            end_date=row["end_date"],
+            duration_ms=row["duration_ms"],
+            outputs=json.loads(row["outputs"]) if row["outputs"] else None,
+        )
+
+    def list_executions(
+        self,
+        flow_id: Optional[str] = None,
+        state: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 50,
+    ) -> List[ExecutionStatus]:
+        """Return stored executions, newest first."""
+        clauses, params = [], []
+        if flow_id:
+            clauses.append("flow_id = ?")
+            params.append(flow_id)
+        if state:
+            clauses.append("state = ?")
+            params.append(state)
+        if since:
+            clauses.append("start_date >= ?")
+            params.append(since.isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._read(f"SELECT * FROM executions {where} ORDER BY start_date DESC LIMIT ?", (*params, limit))
+        return [self._row_to_execution(row) for row in rows]
+
+    def latest_execution(self, flow_id: Optional[str] = None, state: Optional[str] = None) -> Optional[ExecutionStatus]:
+        executions = self.list_executions(flow_id=flow_id, state=state, limit=1)
+        return executions[0] if executions else None
+
+    def latest_agent_results(self) -> List[AgentResult]:
+        """Return the most recent result for each agent."""
+        rows = self._read(
+            """
+            SELECT r.* FROM agent_results r
+            JOIN (SELECT agent, MAX(timestamp) AS timestamp FROM agent_results GROUP BY agent) latest
+              ON r.agent = latest.agent AND r.timestamp = latest.timestamp
+            ORDER BY r.agent
+            """
+        )
+        return [
+            AgentResult(
+                agent=row["agent"],
+                risk_score=row["risk_score"],
+                status=row["status"],
+                metrics=json.loads(row["metrics"]),
+                ai_summary=row["ai_summary"],
+                alerts=[AgentAlert(**alert) for alert in json.loads(row["alerts"])],
+                timestamp=row["timestamp"],
+            )
+            for row in rows
+        ]
+
+    # Maintenance
+
+    def apply_retention(
+        self,
+        max_age_days: int = settings.results_retention_days,
+        max_executions: int = settings.results_max_executions,
+        audit_max_age_days: int = settings.notification_audit_retention_days,
+    ) -> int:
+        """Delete executions past the retention window or row cap, cached logs
+        past the retention window and old notification audit rows. Returns
+        execution rows removed.
+
+        Executions are aged by start date, falling back to the ingest time for
+        executions that never started; dates are compared as instants so
+        timezone-suffixed and naive timestamps age alike.
+        """
+        cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).isoformat()
+        audit_cutoff = (datetime.utcnow() - timedelta(days=audit_max_age_days)).isoformat()
+        with self._lock:
+            conn = self.conn
+            removed = conn.execute(
+                "DELETE FROM executions WHERE julianday(COALESCE(start_date, ingested_at)) < julianday(?)",
+                (cutoff,),
+            ).rowcount
+            removed += conn.execute(
+                """
+                DELETE FROM executions WHERE execution_id IN (
+                    SELECT execution_id FROM executions
+                    ORDER BY julianday(COALESCE(start_date, ingested_at)) DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (max_executions,),
+            ).rowcount
+            conn.execute("DELETE FROM execution_log_sets WHERE cached_at < ?", (cutoff,))
+            conn.execute(
+                "DELETE FROM execution_logs WHERE execution_id NOT IN (SELECT execution_id FROM execution_log_sets)"
+            )
+            conn.execute("DELETE FROM notification_audit WHERE received_at < ?", (audit_cutoff,))
+        return removed
+
+    def compact(self) -> None:
+        """Return freed pages to the filesystem and truncate the WAL."""
+        with self._lock:
+            conn = self.conn
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA optimize")
+
+
+def _risk_score(value: Any, agent: str) -> int:
+    """Parse a risk score flow output; flows may emit floats, numeric strings or labels."""
+    if value is None or value == "":
+        return 0
+    try:
+        return round(float(value))
+    except (TypeError, ValueError, OverflowError):
+        print(f"Ignoring non-numeric {agent} risk score: {value!r}")
+        return 0
+
+
+def agent_results_from_execution(data: Dict[str, Any]) -> List[AgentResult]:
+    """Extract per-agent AI summaries from a raw Kestra execution payload.
+
+    Summaries come from the Ollama request tasks of the orchestrator flow;
+    risk scores come from flow outputs where available.
+    """
+    outputs = data.get("outputs") or {}
+    summary_tasks = {
+        "treasury_ai_summary": "treasury",
+        "portfolio_ai_summary": "portfolio",
+        "compliance_ai_summary": "compliance",
+        "generate_unified_summary": "executive",
+    }
+
+    results = []
+    for task_run in data.get("taskRunList") or []:
+        agent = summary_tasks.get(task_run.get("taskId", ""))
+        if agent is None:
+            continue
+        body = (task_run.get("outputs") or {}).get("body", "")
+        try:
+            summary = json.loads(body).get("response", "") if isinstance(body, str) else body.get("response", "")
+        except (ValueError, AttributeError):
+            summary = str(body)
+
+        risk_score = _risk_score(outputs.get(f"{agent}_risk_score", outputs.get("overall_risk_score")), agent)
+        if risk_score >= 80:
+            status = StatusLevel.CRITICAL
+        elif risk_score >= 60:
+            status = StatusLevel.WARNING
+        else:
+            status = StatusLevel.OK
+
+        end_date = (task_run.get("state") or {}).get("endDate") or data.get("state", {}).get("endDate")
+        results.append(AgentResult(
+            agent=agent,
+            risk_score=risk_score,
+            status=status,
+            metrics={key: value for key, value in outputs.items() if isinstance(value, (int, float))},
+            ai_summary=summary or "",
+            alerts=[],
+            timestamp=end_date or datetime.utcnow(),
+        ))
+    return results
+
+
+results_store = ResultsStore()
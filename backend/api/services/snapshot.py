@@ -0,0 +1,321 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+from config import settings
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# (st_mtime_ns, st_size) of the source file a snapshot entry was built from
+Stamp = Tuple[int, int]
+
+TABLE_FILE = "table.arrow"
+DOCUMENT_FILE = "document.json"
+# Published copies kept per source file; older ones are only needed by workers mid-swap
+KEEP_VERSIONS = 2
+PUBLISH_ATTEMPTS = 3
+
+
+def default_snapshot_dir() -> Path:
+    """Prefer tmpfs so snapshot files live in shared memory."""
+    if settings.snapshot_dir:
+        return Path(settings.snapshot_dir)
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return base / "finance-api-snapshot"
+
+
+def file_stamp(filepath: Path) -> Optional[Stamp]:
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _strip_nulls(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Tables are the union of every record's keys; drop the ones a record did not have
+    return {key: value for key, value in row.items() if value is not None}
+
+
+def _records_table(records: List[Any]) -> Optional["pa.Table"]:
+    """Convert a list of JSON objects to an Arrow table, if it round-trips exactly."""
+    import pyarrow as pa
+
+    if not records or not all(isinstance(record, dict) for record in records):
+        return None
+    columns: Dict[str, None] = {}
+    for record in records:
+        columns.update(dict.fromkeys(record))
+    try:
+        table = pa.table({column: [record.get(column) for record in records] for column in columns})
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    # Mixed int/float columns, explicit nulls and ragged nested objects stay as JSON
+    restored = [_strip_nulls(row) for row in table.to_pylist()]
+    if json.dumps(restored, sort_keys=True) != json.dumps(records, sort_keys=True):
+        return None
+    return table
+
+
+def _write_table(path: Path, table: "pa.Table") -> None:
+    import pyarrow as pa
+
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _map_table(path: Path) -> "pa.Table":
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+class SnapshotEntry:
+    """One published, immutable copy of one source file.
+
+    CSV files are stored as an Arrow IPC file. JSON documents are stored with
+    every top-level list of records split out into its own Arrow file, and the
+    rest of the document as JSON. Arrow files are memory-mapped, so every
+    worker reads the same physical pages. Everything is opened on
+    construction, so the entry stays readable after its files are pruned.
+    """
+
+    def __init__(self, path: Path, stamp: Stamp):
+        self.path = path
+        self.stamp = stamp
+        self._frame: Optional["pd.DataFrame"] = None
+        self._document: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        if (path / TABLE_FILE).exists():
+            self.table: Optional["pa.Table"] = _map_table(path / TABLE_FILE)
+            self.document: Dict[str, Any] = {}
+            self.tables: Dict[str, "pa.Table"] = {}
+        else:
+            self.table = None
+            with open(path / DOCUMENT_FILE, "r") as f:
+                stored = json.load(f)
+            self.document = stored["document"]
+            self.tables = {key: _map_table(path / f"table-{i}.arrow") for i, key in enumerate(stored["tables"])}
+
+    def frame(self) -> "pd.DataFrame":
+        """A read-only DataFrame backed by the mapped Arrow buffers."""
+        import pandas as pd
+
+        with self._lock:
+            if self._frame is None:
+                self._frame = self.table.to_pandas(types_mapper=pd.ArrowDtype)
+            return self._frame
+
+    def json_document(self) -> Dict[str, Any]:
+        """The full JSON document, with record lists rebuilt from their tables.
+
+        Rebuilt once per entry and then shared by every caller, like `frame()`.
+        The rebuilt lists live in this worker's own memory; readers that only
+        need one list should stream it with `records()` instead.
+        """
+        if not self.tables:
+            return self.document
+        with self._lock:
+            if self._document is None:
+                document = dict(self.document)
+                for key, table in self.tables.items():
+                    document[key] = [_strip_nulls(row) for row in table.to_pylist()]
+                self._document = document
+            return self._document
+
+    def records(self, key: str, batch_rows: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream one record list of the JSON document, `batch_rows` records at a time."""
+        table = self.tables.get(key)
+        if table is None:
+            yield from self.document.get(key) or []
+            return
+        for batch in table.to_batches(max_chunksize=batch_rows):
+            for row in batch.to_pylist():
+                yield _strip_nulls(row)
+
+
+class SnapshotManager:
+    """Publishes and maps shared copies of data files across API worker processes.
+
+    Each source file is published on its own, keyed by its modification time
+    and size, the first time any worker reads that version of the file. A read
+    costs one `stat` of the requested file: an already-published version is
+    mapped directly, otherwise the file is parsed, written to a staging
+    directory and renamed into place. Publishing needs no lock; when two
+    workers race, the rename of the second fails and it maps the first one's
+    copy.
+
+    Every read returns the stamp of the data it returned, and that data is
+    never older than a `stat` of the file taken before the read started.
+    """
+
+    def __init__(self, snapshot_dir: Optional[Path] = None):
+        self.snapshot_dir = snapshot_dir or default_snapshot_dir()
+        self._entries: Dict[Path, SnapshotEntry] = {}
+        self._lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        return settings.snapshot_enabled
+
+    # Publishing
+
+    def _entry_dir(self, filepath: Path) -> Path:
+        digest = hashlib.sha1(os.path.abspath(filepath).encode()).hexdigest()[:12]
+        return self.snapshot_dir / f"{filepath.name}-{digest}"
+
+    @staticmethod
+    def _build(filepath: Path, target: Path) -> None:
+        import pandas as pd
+        import pyarrow as pa
+
+        if filepath.suffix == ".csv":
+            _write_table(target / TABLE_FILE, pa.Table.from_pandas(pd.read_csv(filepath), preserve_index=False))
+            return
+        with open(filepath, "r") as f:
+            document = json.load(f)
+        tables = []
+        if isinstance(document, dict):
+            for key, value in list(document.items()):
+                table = _records_table(value) if isinstance(value, list) else None
+                if table is not None:
+                    _write_table(target / f"table-{len(tables)}.arrow", table)
+                    tables.append(key)
+                    del document[key]
+        with open(target / DOCUMENT_FILE, "w") as f:
+            json.dump({"document": document, "tables": tables}, f)
+
+    @staticmethod
+    def _prune(entry_dir: Path) -> None:
+        versions = []
+        for path in entry_dir.iterdir():
+            mtime, _, size = path.name.partition("-")
+            if mtime.isdigit() and size.isdigit():
+                versions.append(((int(mtime), int(size)), path))
+        for _, path in sorted(versions, reverse=True)[KEEP_VERSIONS:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _publish(self, filepath: Path, stamp: Stamp) -> Optional[SnapshotEntry]:
+        """Map the published copy of `filepath` at `stamp` or newer, publishing it if needed."""
+        entry_dir = self._entry_dir(filepath)
+        for _ in range(PUBLISH_ATTEMPTS):
+            target = entry_dir / f"{stamp[0]}-{stamp[1]}"
+            if target.is_dir():
+                return SnapshotEntry(target, stamp)
+
+            entry_dir.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=entry_dir))
+            try:
+                os.chmod(staging, 0o755)
+                self._build(filepath, staging)
+                # A write during the parse leaves a mixed copy: retry at the new stamp
+                after = file_stamp(filepath)
+                if after != stamp:
+                    if after is None:
+                        return None
+                    stamp = after
+                    continue
+                try:
+                    os.rename(staging, target)
+                except OSError:
+                    pass  # Another worker published this version first
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            self._prune(entry_dir)
+            return SnapshotEntry(target, stamp)
+        return None
+
+    def entry(self, filepath: Path) -> Optional[SnapshotEntry]:
+        """Return the published copy of the file's current version, or None to read it directly."""
+        if not self.enabled():
+            return None
+        stamp = file_stamp(filepath)
+        if stamp is None:
+            return None
+        entry = self._entries.get(filepath)
+        if entry is not None and entry.stamp == stamp:
+            return entry
+        with self._lock:
+            entry = self._entries.get(filepath)
+            if entry is not None and entry.stamp == stamp:
+                return entry
+            try:
+                entry = self._publish(filepath, stamp)
+            except Exception as e:
+                print(f"Snapshot unavailable for {filepath}, reading directly: {e}")
+                return None
+            if entry is not None:
+                self._entries[filepath] = entry
+            return entry
+
+    def publish_all(self, data_path: Path) -> int:
+        """Publish every data file under `data_path`; used by warm-up, never on a request."""
+        published = 0
+        for filepath in sorted(data_path.rglob("*")):
+            if filepath.suffix in (".csv", ".json") and filepath.is_file() and self.entry(filepath) is not None:
+                published += 1
+        return published
+
+    # Reading
+
+    def read_json(self, filepath: Path) -> Tuple[Optional[Stamp], Dict[str, Any]]:
+        """Return `(stamp, document)`; treat the document as read-only."""
+        entry = self.entry(filepath)
+        if entry is not None:
+            return entry.stamp, entry.json_document()
+        stamp = file_stamp(filepath)
+        try:
+            with open(filepath, "r") as f:
+                return stamp, json.load(f)
+        except Exception as e:
+            print(f"Error reading {filepath}: {e}")
+            return stamp, {}
+
+    def read_json_head(self, filepath: Path) -> Dict[str, Any]:
+        """The document without the record lists the snapshot stores as tables.
+
+        Those lists are read with `iter_json_records`; any key still present
+        here was not split out. Without a snapshot this is the whole document.
+        """
+        entry = self.entry(filepath)
+        if entry is not None:
+            return entry.document
+        return self.read_json(filepath)[1]
+
+    def read_csv(self, filepath: Path) -> Tuple[Optional[Stamp], "pd.DataFrame"]:
+        """Return `(stamp, frame)`; the frame is zero-copy from the snapshot when available, so read-only."""
+        # pandas is imported on first use to keep API start-up fast
+        import pandas as pd
+
+        entry = self.entry(filepath)
+        if entry is not None:
+            return entry.stamp, entry.frame()
+        stamp = file_stamp(filepath)
+        try:
+            return stamp, pd.read_csv(filepath)
+        except Exception as e:
+            print(f"Error reading {filepath}: {e}")
+            return stamp, pd.DataFrame()
+
+    def iter_json_records(self, filepath: Path, key: str) -> Iterator[Dict[str, Any]]:
+        """Stream the records under `key` of a JSON file.
+
+        Served a batch at a time from the mapped Arrow table when snapshots are
+        enabled, so memory does not grow with the list; otherwise (or when the
+        list did not convert to a table) the whole document is parsed first.
+        """
+        entry = self.entry(filepath)
+        if entry is not None:
+            yield from entry.records(key, settings.export_chunk_rows)
+            return
+        yield from (self.read_json(filepath)[1].get(key) or [])
+
+
+snapshot_manager = SnapshotManager()
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import settings
+from services.data_loader import data_loader_service
+from services.snapshot import snapshot_manager
+
+
+class WarmupState:
+    """Background pre-loading of every data domain after start-up.
+
+    The API accepts traffic as soon as it has imported, so liveness answers
+    immediately; readiness stays false until every domain has been loaded and
+    aggregated once, so the first real request hits warm caches. If a step
+    fails the worker is degraded rather than ready; the failed steps are
+    retried in the background every `retry_interval` seconds until they succeed.
+    """
+
+    def __init__(self, retry_interval: float = settings.warmup_retry_interval_seconds):
+        self.retry_interval = retry_interval
+        self.ready = False
+        self.completed = False
+        self.started_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
+        self.duration_ms: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._retrying = False
+
+    def _steps(self) -> List[Tuple[str, Callable[[], Any]]]:
+        return [
+            ("snapshot", lambda: snapshot_manager.publish_all(data_loader_service.data_path)),
+            ("treasury", data_loader_service.get_treasury_data),
+            ("portfolio", data_loader_service.get_portfolio_rollup),
+            ("compliance", data_loader_service.get_compliance_data),
+            ("market", data_loader_service.get_market_data),
+            ("audit_anomalies", data_loader_service.get_audit_anomalies),
+            ("kyc_expiry", data_loader_service.get_kyc_expiring),
+            ("market_sentiment", data_loader_service.get_market_sentiment),
+        ]
+
+    async def _run_steps(self, steps: List[Tuple[str, Callable[[], Any]]]) -> None:
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                await asyncio.to_thread(step)
+                self.errors.pop(name, None)
+            except Exception as e:
+                self.errors[name] = str(e)
+                print(f"Warm-up step {name} failed: {e}")
+            self.steps[name] = round((time.perf_counter() - step_started) * 1000, 2)
+
+    async def run(self) -> None:
+        self.started_at = datetime.utcnow()
+        started = time.perf_counter()
+        await self._run_steps(self._steps())
+        self.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.completed_at = datetime.utcnow()
+        self.completed = True
+        self.ready = not self.errors
+        if self.ready:
+            print(f"Warm-up complete in {self.duration_ms}ms")
+        else:
+            print(f"Warm-up finished in {self.duration_ms}ms with failed steps: {', '.join(self.errors)}")
+
+    async def retry_failed(self) -> bool:
+        """Re-run the steps that failed; returns True once every step has succeeded.
+
+        Only one retry runs at a time; a call made while one is running returns at once.
+        """
+        if self.completed and self.errors and not self._retrying:
+            self._retrying = True
+            try:
+                await self._run_steps([(name, step) for name, step in self._steps() if name in self.errors])
+                self.ready = not self.errors
+            finally:
+                self._retrying = False
+        return self.ready
+
+    async def _run_until_ready(self) -> None:
+        await self.run()
+        while not self.ready:
+            await asyncio.sleep(self.retry_interval)
+            await self.retry_failed()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_until_ready())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def state(self) -> str:
+        if self.ready:
+            return "ready"
+        return "degraded" if self.completed else "warming_up"
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "duration_ms": self.duration_ms,
+            "steps_ms": self.steps,
+            "errors": self.errors,
+        }
+
+
+warmup = WarmupState()
@@ -0,0 +1,32 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Settings are read at import time, so point the stores at a scratch directory
+# before any application module is imported
+_STATE_DIR = Path(tempfile.mkdtemp(prefix="finance-api-tests-"))
+SAMPLE_DATA = Path(__file__).resolve().parents[2] / "data"
+os.environ.setdefault("RESULTS_DB_PATH", str(_STATE_DIR / "results.db"))
+os.environ.setdefault("SNAPSHOT_DIR", str(_STATE_DIR / "snapshot"))
+os.environ.setdefault("DATA_PATH", str(SAMPLE_DATA))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    """A private, writable copy of the sample data directory."""
+    target = tmp_path / "data"
+    shutil.copytree(SAMPLE_DATA, target)
+    return target
+
+
+@pytest.fixture
+def loader(data_dir: Path, monkeypatch):
+    """A fresh DataLoaderService reading from `data_dir`."""
+    from config import settings
+    from services.data_loader import DataLoaderService
+
+    monkeypatch.setattr(settings, "data_base_path", str(data_dir))
+    return DataLoaderService()
@@ -0,0 +1,9 @@
+import os
+from pathlib import Path
+
+
+def bump(path: Path, text: str) -> None:
+    """Rewrite a file and move its mtime forward, whatever the filesystem's timestamp granularity."""
+    stat = os.stat(path)
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
@@ -0,0 +1,181 @@
+import json
+from datetime import date
+
+import pytest
+
+from analytics.compliance import aml_summary, audit_summary, compliance_assessment, compliance_overview, kyc_summary
+from analytics.executive import executive_assessment
+from analytics.files import read_csv, read_json
+from analytics.market import market_overview
+from analytics.outputs import emit_outputs, task_input
+from analytics.portfolio import (
+    belongs_to_portfolio,
+    holdings_summary,
+    partition_summary,
+    performance_summary,
+    portfolio_assessment,
+    portfolio_overview,
+    var_summary,
+)
+from analytics.treasury import cash_summary, debt_summary, fx_summary, treasury_assessment, treasury_overview
+from tests.conftest import SAMPLE_DATA
+
+
+def sample_json(relpath: str):
+    return read_json(relpath, str(SAMPLE_DATA))
+
+
+def sample_csv(relpath: str):
+    return read_csv(relpath, str(SAMPLE_DATA))
+
+
+@pytest.fixture(scope="module")
+def treasury():
+    cash = cash_summary(sample_csv("treasury/cash_positions.csv"))
+    fx = fx_summary(sample_json("treasury/fx_rates.json"))
+    debt = debt_summary(sample_csv("treasury/debt_schedule.csv"), today=date(2024, 12, 11))
+    return cash, fx, debt
+
+
+@pytest.fixture(scope="module")
+def compliance():
+    aml = aml_summary(sample_json("compliance/aml_alerts.json"), high_priority_threshold=3)
+    audit = audit_summary(sample_csv("compliance/audit_logs.csv"), ["PERMISSION_CHANGE", " "])
+    kyc = kyc_summary(sample_json("compliance/kyc_status.json"))
+    return aml, audit, kyc
+
+
+@pytest.fixture(scope="module")
+def portfolio():
+    holdings = holdings_summary(sample_json("portfolio/holdings.json"))
+    var = var_summary(sample_csv("portfolio/var_metrics.csv"), var_threshold=200_000, risk_score_threshold=75)
+    performance = performance_summary(sample_json("portfolio/performance.json"))
+    return holdings, var, performance
+
+
+def test_csv_cells_are_numeric():
+    row = sample_csv("treasury/debt_schedule.csv")[0]
+    assert isinstance(row["principal"], (int, float)) and isinstance(row["debt_id"], str)
+
+
+def test_treasury_summaries(treasury):
+    cash, fx, debt = treasury
+    assert cash["as_of_date"] == "2024-12-11"
+    assert cash["account_count"] == 8
+    assert cash["total_usd_equivalent"] == 14_025_700.0
+    assert cash["totals_by_currency"]["JPY"]["balance"] == 125_000_000
+    assert list(cash["regional_distribution_pct"])[0] == "North America"
+
+    assert fx["total_unhedged_exposure_usd"] == 1_098_100.0
+    assert [alert["currency"] for alert in fx["low_hedge_alerts"]] == ["EUR"]
+
+    assert (debt["facility_count"], debt["total_debt_usd"], debt["weighted_avg_rate"]) == (6, 22_240_000.0, 6.01)
+    assert (debt["covenant_breaches"], debt["covenant_warnings"]) == (1, 1)
+    assert debt["upcoming_payment_count"] == 5
+
+    assessment = treasury_assessment(cash, fx, debt)
+    assert (assessment["risk_score"], assessment["status"]) == (95, "CRITICAL")
+    assert assessment["net_position_usd"] == -8_214_300.0
+    assert {alert["type"] for alert in assessment["alerts"]} == {"COVENANT_BREACH", "COVENANT_WARNING", "HEDGE_RATIO_LOW"}
+
+
+def test_compliance_summaries(compliance):
+    aml, audit, kyc = compliance
+    assert aml["critical_alerts_count"] == 3
+    assert len(aml["sanctions_alerts"]) == 1
+    assert aml["requires_immediate_action"]
+
+    assert audit["total_events"] == 12
+    assert audit["critical_events_count"] == 5
+    assert audit["failed_login_attempts"] == 1
+    assert [row["event_type"] for row in audit["escalation_events"]] == ["PERMISSION_CHANGE"]
+    assert audit["security_concerns"]
+
+    assert kyc["compliance_rate"] == 80.8
+    assert len(kyc["urgent_expirations"]) == 2 and kyc["kyc_action_required"]
+
+    assessment = compliance_assessment(aml, audit, kyc)
+    assert (assessment["risk_score"], assessment["rag_status"], assessment["critical_items"]) == (100, "RED", 5)
+    assert assessment["escalation_required"]
+
+
+def test_portfolio_summaries(portfolio):
+    holdings, var, performance = portfolio
+    assert holdings["position_count"] == 9
+    assert [p["ticker"] for p in holdings["concentrated_positions"]] == ["US10Y", "LQD"]
+    assert var["as_of_date"] == "2024-12-11"
+    assert var["current"]["risk_score"] == 72
+    assert not var["var_breach"]
+    assert performance["periods"]["ytd"] == {"return_pct": 12.35, "benchmark_pct": 14.8, "alpha": -2.45}
+
+    assessment = portfolio_assessment(holdings, var, performance)
+    assert (assessment["risk_rating"], assessment["status"]) == (7, "WARNING")
+    assert assessment["rebalancing_recommended"]
+    assert "Address benchmark underperformance" in assessment["priority_actions"]
+
+
+def test_partition_summary_keeps_untagged_var_rows():
+    var_rows = [
+        {"date": "2024-12-10", "portfolio_id": None, "var_95_1d": 1.0, "risk_score": 10},
+        {"date": "2024-12-11", "portfolio_id": "", "var_95_1d": 2.0, "risk_score": 20},
+        {"date": "2024-12-12", "portfolio_id": "OTHER", "var_95_1d": 3.0, "risk_score": 30},
+    ]
+    assert [belongs_to_portfolio(row, "PF-A") for row in var_rows] == [True, True, False]
+    performance = {"performance": {"ytd": {"return_pct": 10.0, "benchmark_return": 8.0}}}
+    summary = partition_summary("PF-A", {"total_aum": 1.0}, performance, var_rows)
+    assert (summary["date"], summary["var_95_1d"], summary["risk_score"]) == ("2024-12-11", 2.0, 20)
+    assert summary["benchmark_return"] == 8.0
+
+
+def test_executive_assessment_rolls_up_domain_overviews():
+    treasury = treasury_overview(
+        sample_csv("treasury/cash_positions.csv"),
+        sample_json("treasury/fx_rates.json"),
+        sample_csv("treasury/debt_schedule.csv"),
+    )
+    portfolio = portfolio_overview(
+        sample_json("portfolio/holdings.json"),
+        sample_json("portfolio/performance.json"),
+        sample_csv("portfolio/var_metrics.csv"),
+    )
+    compliance = compliance_overview(sample_json("compliance/aml_alerts.json"), sample_json("compliance/kyc_status.json"))
+    assessment = executive_assessment(treasury, portfolio, compliance)
+    assert assessment["domain_status"] == {"treasury": "CRITICAL", "portfolio": "WARNING", "compliance": "CRITICAL"}
+    assert (assessment["overall_status"], assessment["overall_risk_score"]) == ("CRITICAL", 89)
+    assert assessment["requires_ceo_attention"]
+
+
+def test_market_overview_reads_indicator_sections():
+    overview = market_overview(sample_json("market/news_feed.json"), sample_json("market/economic_indicators.json"))
+    assert (overview["sp500_level"], overview["sp500_change_pct"], overview["vix"]) == (4782.5, 0.42, 13.25)
+    assert (overview["fed_funds_rate"], overview["ten_year_yield"]) == (5.25, 4.15)
+    assert len(overview["top_headlines"]) == 3
+
+
+def test_api_and_flows_agree_on_shared_figures(loader):
+    market = loader.get_market_data()
+    overview = market_overview(sample_json("market/news_feed.json"), sample_json("market/economic_indicators.json"))
+    assert (market.sp500_level, market.vix, market.fed_funds_rate, market.treasury_10y) == (
+        overview["sp500_level"], overview["vix"], overview["fed_funds_rate"], overview["ten_year_yield"],
+    )
+
+    treasury = loader.get_treasury_data()
+    cash = cash_summary(sample_csv("treasury/cash_positions.csv"))
+    assert treasury.total_cash_usd == pytest.approx(cash["total_usd_equivalent"])
+    assert (treasury.covenant_breaches, treasury.covenant_warnings) == (1, 1)
+
+    compliance = loader.get_compliance_data()
+    assert compliance.kyc_compliance_rate == pytest.approx(80.8, abs=0.05)
+
+
+def test_emit_outputs_and_task_input(capsys, monkeypatch):
+    emit_outputs(summary={"risk_score": 72}, when=date(2024, 12, 11))
+    marker = capsys.readouterr().out.strip().splitlines()[-1]
+    assert marker.startswith("::") and marker.endswith("::")
+    assert json.loads(marker[2:-2]) == {"outputs": {"summary": {"risk_score": 72}, "when": "2024-12-11"}}
+
+    monkeypatch.setenv("TREASURY", json.dumps({"risk_score": 95}))
+    monkeypatch.setenv("EMPTY", "")
+    assert task_input("TREASURY") == {"risk_score": 95}
+    assert task_input("EMPTY", default={}) == {}
+    assert task_input("MISSING") is None
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+
+from services.audit_anomalies import AuditAnomalyDetector, AuditLogTail, SlidingWindowCounter
+
+HEADER = "timestamp,event_id,event_type,user_id,user_role,action,resource,status,risk_level,ip_address,details\n"
+START = datetime(2024, 12, 11, 9, 0, tzinfo=timezone.utc)
+
+
+def audit_line(minute: int, event_type: str = "DATA_ACCESS", user: str = "USR-001", ip: str = "10.0.0.1") -> str:
+    ts = (START + timedelta(minutes=minute)).isoformat().replace("+00:00", "Z")
+    return f"{ts},EVT-{minute},{event_type},{user},TRADER,READ,ledger,SUCCESS,LOW,{ip},test\n"
+
+
+def test_sliding_window_counts_expire_with_time():
+    counter = SlidingWindowCounter(window_seconds=300, bucket_seconds=60)
+    assert counter.add("a", 0) == 1
+    assert counter.add("a", 90) == 2
+    assert counter.add("b", 120) == 1
+    assert counter.add("a", 299) == 3
+    # Whole buckets expire: the 0s and 90s buckets have left the window by 400s
+    assert counter.add("a", 400) == 2
+    assert counter.count("b") == 1
+    assert counter.add("a", 600) == 2
+    assert counter.count("b") == 0
+    assert len(counter) == 1
+
+
+def test_sliding_window_ignores_events_older_than_window():
+    counter = SlidingWindowCounter(window_seconds=300, bucket_seconds=60)
+    counter.add("a", 1000)
+    assert counter.add("a", 100) == 1
+    assert counter.add("a", 900) == 2
+
+
+def test_detector_raises_each_rule_once_per_burst():
+    detector = AuditAnomalyDetector(window_seconds=600, failed_login_threshold=3, user_activity_threshold=100)
+    events = [
+        {"timestamp": (START + timedelta(minutes=i)).isoformat(), "event_type": "FAILED_LOGIN",
+         "user_id": "USR-9", "ip_address": "203.0.113.5", "event_id": f"E{i}"}
+        for i in range(6)
+    ]
+    events.append({"timestamp": "2024-12-11T23:15:00Z", "event_type": "TRANSACTION_APPROVAL",
+                   "user_id": "USR-2", "ip_address": "10.0.0.2", "event_id": "E-late"})
+    assert detector.process_many(events) == 2
+    assert detector.counts_by_type == {"REPEATED_FAILED_LOGIN": 1, "OFF_HOURS_APPROVAL": 1}
+    assert detector.recent_anomalies(1)[0].anomaly_type == "OFF_HOURS_APPROVAL"
+
+
+def test_detector_skips_events_without_timestamp():
+    detector = AuditAnomalyDetector()
+    assert detector.process({"event_type": "LOGIN"}) == []
+    assert detector.events_processed == 0
+
+
+def test_tail_reads_only_appended_lines(tmp_path):
+    path = tmp_path / "audit_logs.csv"
+    path.write_text(HEADER + audit_line(0) + audit_line(1))
+    tail = AuditLogTail(path)
+    assert tail.poll() == 2
+    assert tail.poll() == 0
+
+    with open(path, "a") as f:
+        f.write(audit_line(2) + audit_line(3, event_type="FAILED_LOGIN")[:20])
+    assert tail.poll() == 1  # the partial line waits for its newline
+    with open(path, "a") as f:
+        f.write(audit_line(3, event_type="FAILED_LOGIN")[20:])
+    assert tail.poll() == 1
+    assert tail.detector.events_processed == 4
+    assert tail.detector.by_user.count("USR-001") == 4
+
+
+def test_tail_restarts_when_file_is_rewritten(tmp_path):
+    path = tmp_path / "audit_logs.csv"
+    path.write_text(HEADER + audit_line(0) + audit_line(1) + audit_line(2))
+    tail = AuditLogTail(path)
+    tail.poll()
+    first_detector = tail.detector
+
+    # Truncated and rewritten: shorter than the stored offset
+    path.write_text(HEADER + audit_line(5, user="USR-002"))
+    assert tail.poll() == 1
+    assert tail.detector is not first_detector
+    assert tail.detector.events_processed == 1
+
+    # Same length, different content
+    path.write_text(HEADER + audit_line(5, user="USR-003") + audit_line(6))
+    tail.poll()
+    assert tail.detector.events_processed == 2
+    assert tail.detector.by_user.count("USR-002") == 0
+
+    path.unlink()
+    assert tail.poll() == 0
+    assert tail.detector.events_processed == 0
+
+
+def test_tail_handles_newest_first_logs(tmp_path):
+    # A failed login every two minutes for an hour
+    lines = [audit_line(minute, event_type="FAILED_LOGIN", ip="203.0.113.5") for minute in range(0, 60, 2)]
+    reports = []
+    for name, ordered in (("oldest_first.csv", lines), ("newest_first.csv", lines[::-1])):
+        path = tmp_path / name
+        path.write_text(HEADER + "".join(ordered))
+        tail = AuditLogTail(path, lambda: AuditAnomalyDetector(window_seconds=600, failed_login_threshold=5))
+        assert tail.poll() == 30
+        reports.append((tail.detector.counts_by_type, tail.detector.failed_logins_by_ip.count("203.0.113.5")))
+    assert reports[0] == reports[1]
+    assert reports[0][0]["REPEATED_FAILED_LOGIN"] > 1
+
+
+def test_loader_feeds_appended_audit_events(loader, data_dir):
+    report = loader.get_audit_anomalies()
+    assert report.events_processed == 12
+
+    with open(data_dir / "compliance" / "audit_logs.csv", "a") as f:
+        for minute in range(10):
+            f.write(f"2024-12-11T10:{minute:02d}:00Z,EVT-X{minute},FAILED_LOGIN,USR-404,EXTERNAL,LOGIN,"
+                    f"auth,FAILURE,HIGH,198.51.100.7,Bad password\n")
+    report = loader.get_audit_anomalies()
+    assert report.events_processed == 22
+    assert report.counts_by_type.get("REPEATED_FAILED_LOGIN") == 1
@@ -0,0 +1,121 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.kestra import KestraService, kestra_service
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_breaker_opens_half_opens_and_closes(clock):
+    breaker = CircuitBreaker("dep", failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one trial call at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_release_frees_the_trial_slot(clock):
+    breaker = CircuitBreaker("dep", failure_threshold=1, reset_timeout=5)
+    breaker.trip()
+    clock.now += 5
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def service_with(handler) -> KestraService:
+    service = KestraService()
+    service.breaker = CircuitBreaker("Kestra", failure_threshold=2, reset_timeout=30)
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+def request(service: KestraService):
+    return service._request(service.client, "GET", "http://kestra/api/v1/plugins")
+
+
+def test_request_counts_errors_and_server_failures(clock):
+    def handler(request):
+        raise ValueError("malformed response")
+
+    service = service_with(handler)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            asyncio.run(request(service))
+    assert service.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(request(service))
+
+    service = service_with(lambda request: httpx.Response(503))
+    asyncio.run(request(service))
+    assert service.breaker.consecutive_failures == 1
+    service = service_with(lambda request: httpx.Response(404))
+    asyncio.run(request(service))
+    assert service.breaker.consecutive_failures == 0
+
+
+def test_cancelled_trial_call_does_not_wedge_the_breaker(clock):
+    async def handler(request):
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    service = service_with(handler)
+    service.breaker.trip()
+    clock.now += 30
+
+    async def cancel_trial():
+        task = asyncio.create_task(request(service))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert service.breaker.allow()
+
+
+def test_open_circuit_answers_503(monkeypatch, clock):
+    from main import app
+
+    monkeypatch.setattr(kestra_service, "breaker", CircuitBreaker("Kestra", failure_threshold=1, reset_timeout=30))
+    kestra_service.breaker.trip()
+    client = TestClient(app)
+    response = client.get("/workflows/executions/abc123")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    assert client.post("/workflows/trigger", json={}).status_code == 503
+    assert client.post("/workflows/trigger/treasury").status_code == 503
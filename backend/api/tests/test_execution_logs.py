@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services import execution_logs
+from services.kestra import kestra_service
+from services.results_store import ResultsStore
+
+LOGS = [{"taskId": "fetch_data", "level": "INFO", "message": f"line {i}"} for i in range(1200)]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    from main import app
+
+    executions = {"done": {"id": "done", "state": {"current": "SUCCESS"}}}
+
+    async def get_execution(execution_id):
+        return executions.get(execution_id)
+
+    async def get_execution_logs(execution_id):
+        return list(LOGS)
+
+    monkeypatch.setattr(execution_logs, "results_store", ResultsStore(str(tmp_path / "results.db")))
+    monkeypatch.setattr(kestra_service, "get_execution", get_execution)
+    monkeypatch.setattr(kestra_service, "get_execution_logs", get_execution_logs)
+    return TestClient(app)
+
+
+def test_logs_are_unbounded_by_default(client):
+    for expected_cached in (False, True):
+        page = client.get("/workflows/executions/done/logs").json()
+        assert len(page["logs"]) == len(LOGS)
+        assert page["has_more"] is False
+        assert page["cached"] is expected_cached
+
+
+def test_limit_pages_with_the_cursor(client):
+    for _ in range(2):  # from Kestra, then from the local cache
+        first = client.get("/workflows/executions/done/logs", params={"limit": 1000}).json()
+        assert len(first["logs"]) == 1000 and first["has_more"]
+        rest = client.get(
+            "/workflows/executions/done/logs", params={"limit": 1000, "after": first["next_cursor"]}
+        ).json()
+        assert [entry["index"] for entry in rest["logs"]] == list(range(1000, 1200))
+        assert rest["has_more"] is False
+
+
+def test_unknown_execution_is_404(client):
+    assert client.get("/workflows/executions/missing/logs").status_code == 404
+    assert client.get("/workflows/executions/missing/logs", params={"follow": True}).status_code == 404
+
+
+def test_follow_streams_every_line_of_a_finished_execution(client):
+    response = client.get("/workflows/executions/done/logs", params={"follow": True, "after": 1099})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [entry["index"] for entry in lines] == list(range(1100, 1200))
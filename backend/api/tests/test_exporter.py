@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+from services.data_loader import data_loader_service
+from services.exporter import ExportError, ExportQuery, resolve_dataset, stream_csv, stream_ndjson, stream_parquet
+
+
+@pytest.fixture
+def export_data(data_dir, monkeypatch):
+    monkeypatch.setattr(data_loader_service, "data_path", data_dir)
+    return data_dir
+
+
+def ndjson_rows(query: ExportQuery) -> list:
+    return [json.loads(line) for line in b"".join(stream_ndjson(query)).decode().splitlines()]
+
+
+def test_formats_agree_on_filtered_projection(export_data):
+    dataset = resolve_dataset("treasury", "debt_schedule")
+    make = lambda: ExportQuery(dataset, columns=["debt_id", "principal"], filters=["principal>=2000000", "currency=USD"])
+
+    rows = ndjson_rows(make())
+    assert rows and all(row["principal"] >= 2_000_000 for row in rows)
+    assert list(rows[0]) == ["debt_id", "principal"]
+
+    parsed_csv = list(csv.DictReader(io.StringIO(b"".join(stream_csv(make())).decode())))
+    assert [row["debt_id"] for row in parsed_csv] == [row["debt_id"] for row in rows]
+
+    table = pq.read_table(io.BytesIO(b"".join(stream_parquet(make()))))
+    assert table.column_names == ["debt_id", "principal"]
+    assert table.to_pylist() == rows
+
+
+def test_json_dataset_streams_with_list_columns(export_data):
+    dataset = resolve_dataset("market")
+    rows = ndjson_rows(ExportQuery(dataset, columns=["id", "tickers_mentioned"], limit=2))
+    articles = json.loads((export_data / "market" / "news_feed.json").read_text())["articles"]
+    assert rows == [{"id": a["id"], "tickers_mentioned": a["tickers_mentioned"]} for a in articles[:2]]
+
+    parsed_csv = list(csv.reader(io.StringIO(b"".join(stream_csv(ExportQuery(dataset, columns=["tickers_mentioned"], limit=1))).decode())))
+    assert parsed_csv[1] == [";".join(articles[0]["tickers_mentioned"])]
+
+
+def test_invalid_filters_and_columns_are_rejected(export_data):
+    dataset = resolve_dataset("treasury")
+    for bad in (["balance>lots"], ["nope=1"], ["balance"]):
+        with pytest.raises(ExportError):
+            ExportQuery(dataset, filters=bad)
+    with pytest.raises(ExportError):
+        ExportQuery(dataset, columns=["balance", "nope"])
+
+
+def test_invalid_cells_are_exported_as_null(export_data):
+    path = export_data / "treasury" / "debt_schedule.csv"
+    lines = path.read_text().splitlines()
+    lines[2] = lines[2].replace("2000000.00", "two million")
+    path.write_text("\n".join(lines) + "\n")
+
+    query = ExportQuery(resolve_dataset("treasury", "debt_schedule"), columns=["debt_id", "principal"])
+    rows = ndjson_rows(query)
+    assert len(rows) == len(lines) - 1
+    assert rows[1] == {"debt_id": "DEBT002", "principal": None}
+    assert query.invalid_cells == 1
+    assert query.rows_exported == len(rows)
+
+
+def test_failed_stream_ends_with_error_trailer(export_data, monkeypatch):
+    dataset = resolve_dataset("treasury")
+
+    def broken_rows():
+        yield {"account_name": "Ops", "balance": "10"}
+        raise OSError("disk went away")
+
+    monkeypatch.setattr(dataset, "rows", broken_rows)
+    chunks = []
+    with pytest.raises(OSError):
+        for chunk in stream_ndjson(ExportQuery(dataset, columns=["account_name"])):
+            chunks.append(chunk)
+    trailer = json.loads(b"".join(chunks).decode().splitlines()[-1])
+    assert trailer == {"export_error": "disk went away", "rows_exported": 0}
+
+    with pytest.raises(OSError):
+        b"".join(stream_csv(ExportQuery(dataset, columns=["account_name"])))
+
+
+def test_export_endpoint(export_data):
+    from main import app
+
+    client = TestClient(app)
+    response = client.get("/export/compliance", params={"format": "csv", "where": "priority=HIGH", "columns": "alert_id,priority"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows and {row["priority"] for row in rows} == {"HIGH"}
+    assert client.get("/export/compliance", params={"where": "priority~HIGH"}).status_code == 400
+    assert client.get("/export/nowhere").status_code == 404
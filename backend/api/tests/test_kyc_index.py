@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+from services import kyc_index
+from services.kyc_index import KycExpiryIndex
+
+AS_OF = date(2024, 12, 11)
+
+
+def client(client_id: str, days: int, rating: str = "MEDIUM", **extra) -> dict:
+    return {
+        "client_id": client_id,
+        "client_name": f"Client {client_id}",
+        "kyc_expiry_date": (AS_OF + timedelta(days=days)).isoformat(),
+        "risk_rating": rating,
+        **extra,
+    }
+
+
+def page_ids(index: KycExpiryIndex, days: int = 30, **kwargs) -> list:
+    return [c.client_id for c in index.expiring(days, as_of=AS_OF, **kwargs)[1]]
+
+
+def test_expiring_orders_by_risk_then_date():
+    index = KycExpiryIndex()
+    index.sync([
+        client("A", 20, "LOW"),
+        client("B", 5, "HIGH"),
+        client("C", 2, "HIGH"),
+        client("D", 10, "CRITICAL"),
+        client("E", 3, "unknown"),
+        client("F", 45, "CRITICAL"),
+        client("G", -3, "HIGH"),
+    ])
+    assert page_ids(index) == ["D", "C", "B", "A", "E"]
+    total, page = index.expiring(30, as_of=AS_OF)
+    assert total == 5
+    assert page[1].days_until_expiry == 2
+    assert page[-1].risk_rating == "unknown"
+    assert page_ids(index, include_expired=True)[:3] == ["D", "G", "C"]
+
+
+def test_expiring_pages_across_ratings():
+    index = KycExpiryIndex()
+    index.sync([client(f"H{i}", i, "HIGH") for i in range(3)] + [client(f"L{i}", i, "LOW") for i in range(3)])
+    assert page_ids(index, offset=0, limit=4) == ["H0", "H1", "H2", "L0"]
+    assert page_ids(index, offset=2, limit=3) == ["H2", "L0", "L1"]
+    assert page_ids(index, offset=6, limit=3) == []
+
+
+def test_sync_applies_only_changes():
+    index = KycExpiryIndex()
+    records = [client("A", 1), client("B", 2), client("C", 3)]
+    assert index.sync(records) == 3
+    assert index.sync(records) == 0
+
+    changed = [client("A", 1), client("B", 25, "HIGH"), client("D", 4), client("bad", 1, kyc_expiry_date="n/a")]
+    assert index.sync(changed) == 3  # B moved, C removed, D added
+    assert len(index) == 3
+    assert page_ids(index) == ["B", "A", "D"]
+
+
+def test_bulk_sync_matches_incremental(monkeypatch):
+    records = [client(f"C{i:03d}", i % 40, ["HIGH", "LOW"][i % 2]) for i in range(60)]
+    incremental = KycExpiryIndex()
+    for record in records:
+        incremental.upsert(record)
+
+    monkeypatch.setattr(kyc_index, "BULK_THRESHOLD", 4)
+    bulk = KycExpiryIndex()
+    bulk.sync(records)
+    bulk.sync(records[10:])
+    incremental.sync(records[10:])
+    assert page_ids(bulk, limit=100) == page_ids(incremental, limit=100)
+    assert len(bulk) == 50
+
+
+def test_upsert_and_remove():
+    index = KycExpiryIndex()
+    assert index.upsert(client("A", 5))
+    assert not index.upsert(client("A", 5))
+    assert index.upsert(client("A", 5, last_review_date="2024-01-01"))
+    assert index.expiring(30, as_of=AS_OF)[1][0].last_review_date == "2024-01-01"
+    assert index.remove("A")
+    assert not index.remove("A")
+    assert page_ids(index) == []
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from config import settings
+from models.schemas import AMLAlert, DebtInstrument
+from services.data_loader import AML_ALERT_FIELDS, DEBT_INSTRUMENT_FIELDS
+from services.model_builder import build_models, dict_records, frame_records
+
+DEBT = pd.DataFrame({
+    "debt_id": ["D1", "D2"],
+    "instrument_type": ["Term Loan", "Bond"],
+    "principal": [1_000_000, None],
+    "currency": ["USD", "EUR"],
+    "interest_rate": [5.5, 4.25],
+    "maturity_date": ["2027-06-15", "2029-01-01"],
+})
+
+
+@pytest.fixture
+def strict(monkeypatch):
+    monkeypatch.setattr(settings, "strict_validation", True)
+
+
+def test_fast_path_casts_and_fills_defaults():
+    records = frame_records(DEBT, DEBT_INSTRUMENT_FIELDS)
+    assert records[0]["principal"] == 1_000_000.0
+    assert records[1]["principal"] == 0.0
+    assert records[1]["covenant_status"] == "COMPLIANT"  # missing column
+    debts = build_models(DebtInstrument, records)
+    assert [debt.debt_id for debt in debts] == ["D1", "D2"]
+
+
+def test_strict_mode_passes_raw_values(strict):
+    records = frame_records(DEBT, DEBT_INSTRUMENT_FIELDS)
+    assert records[0]["principal"] == 1_000_000
+    assert records[1]["principal"] is None
+    with pytest.raises(ValidationError):
+        build_models(DebtInstrument, records)
+    assert len(build_models(DebtInstrument, records[:1])) == 1
+
+
+def test_strict_mode_rejects_values_the_fast_path_would_coerce(strict):
+    alerts = [{"alert_id": "A1", "type": "SANCTIONS", "risk_score": "95", "amount": 1200.5}]
+    records = dict_records(alerts, AML_ALERT_FIELDS)
+    assert records[0]["risk_score"] == "95"
+    assert records[0]["priority"] == "LOW"
+    with pytest.raises(ValidationError):
+        build_models(AMLAlert, records)
+
+
+def test_fast_path_coerces_json_values():
+    alerts = [{"alert_id": "A1", "type": "SANCTIONS", "risk_score": "95", "amount": "1200.5"}]
+    [alert] = build_models(AMLAlert, dict_records(alerts, AML_ALERT_FIELDS))
+    assert alert.risk_score == 95
+    assert alert.amount == 1200.5
@@ -0,0 +1,121 @@
+from datetime import datetime, timezone
+
+from services.news_sentiment import HeadlineMinHash, NewsSentimentEngine, RollingSentiment
+
+NOON = datetime(2024, 12, 11, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def article(article_id: str, headline: str, hour: int = 12, score: float = 0.5, **extra) -> dict:
+    return {
+        "id": article_id,
+        "headline": headline,
+        "published_at": f"2024-12-11T{hour:02d}:00:00Z",
+        "category": "RATES",
+        "sentiment_score": score,
+        "relevance_score": 1.0,
+        "tickers_mentioned": ["TLT"],
+        **extra,
+    }
+
+
+def test_minhash_flags_near_duplicate_headlines():
+    minhash = HeadlineMinHash(threshold=0.5)
+    original = minhash.signature("Federal Reserve signals potential rate cut in first quarter")
+    minhash.add("a", original)
+    copy = minhash.signature("Federal Reserve signals potential rate cut in first quarter, sources say")
+    unrelated = minhash.signature("Oil prices slide as OPEC output rises")
+    assert minhash.find_duplicate(copy) == "a"
+    assert minhash.find_duplicate(unrelated) is None
+    minhash.remove("a")
+    assert minhash.find_duplicate(copy) is None
+    assert len(minhash) == 0
+
+
+def test_rolling_sentiment_window_and_remove():
+    rolling = RollingSentiment(bucket_seconds=60, num_buckets=10)
+    rolling.add(0, 1.0, 2.0)
+    rolling.add(120, -1.0, 1.0)
+    assert rolling.totals(300) == (2, 1.0, 3.0)
+    assert rolling.totals(630) == (1, -1.0, 1.0)
+    rolling.remove(120, -1.0, 1.0)
+    assert rolling.totals(300) == (1, 2.0, 2.0)
+
+
+def test_engine_collapses_syndicated_copies():
+    engine = NewsSentimentEngine(dedup_threshold=0.5)
+    assert engine.ingest(article("1", "Treasury yields fall after weak jobs report"))
+    assert not engine.ingest(article("2", "Treasury yields fall after weak jobs report - Reuters", score=-1.0))
+    assert not engine.ingest(article("1", "Treasury yields fall after weak jobs report"))
+    result = engine.sentiment(now=NOON)
+    assert result.overall.article_count == 1
+    assert result.overall.weighted_score == 0.5
+    assert result.duplicates_collapsed == 1
+
+
+def test_sentiment_decays_when_news_stops():
+    engine = NewsSentimentEngine()
+    engine.ingest(article("1", "Equities rally on earnings beat"))
+    assert engine.sentiment(window="1h", now=NOON + 600).overall.article_count == 1
+    assert engine.sentiment(window="1h", now=NOON + 2 * 3600).overall.article_count == 0
+    assert engine.sentiment(window="1d", now=NOON + 2 * 86400).overall.label == "NEUTRAL"
+    # Without a reference time the window ends at the newest article, so a 2024 feed still reports
+    assert engine.sentiment().overall.article_count == 1
+    assert engine.sentiment().as_of == datetime(2024, 12, 11, 12, 0, tzinfo=timezone.utc)
+
+
+def test_edited_article_is_rescored():
+    engine = NewsSentimentEngine()
+    engine.ingest(article("1", "Bank beats estimates", score=0.8))
+    assert engine.ingest(article("1", "Bank beats estimates, guidance cut", score=-0.6, tickers_mentioned=["XLF"]))
+    result = engine.sentiment(now=NOON)
+    assert result.overall.article_count == 1
+    assert result.overall.weighted_score == -0.6
+    assert [a.key for a in result.by_ticker] == ["XLF"]
+    assert result.articles_ingested == 1
+
+
+def test_out_of_order_articles_expire_by_timestamp():
+    engine = NewsSentimentEngine()
+    engine.retention_seconds = 3 * 3600
+    engine.ingest(article("late", "Late morning headline on credit spreads", hour=10))
+    engine.ingest(article("early", "Early headline about the dollar index", hour=6))
+    engine.ingest(article("noon", "Noon headline on crude inventories", hour=12))
+    # 10:00 arrived before 06:00; only the 06:00 article is past the 09:00 cutoff
+    assert set(engine._seen) == {"late", "noon"}
+    # An article older than the retention period is ignored outright
+    assert not engine.ingest(article("stale", "Stale overnight headline about gold", hour=1))
+
+
+def test_tickers_are_upper_cased_at_ingest():
+    engine = NewsSentimentEngine()
+    engine.ingest(article("1", "Bond funds draw inflows", tickers_mentioned=["tlt", " TLT", "hyg", ""]))
+    engine.ingest(article("2", "Credit spreads tighten further", tickers_mentioned=["HYG"]))
+    result = engine.sentiment(now=NOON)
+    assert sorted((a.key, a.article_count) for a in result.by_ticker) == [("HYG", 2), ("TLT", 1)]
+    assert engine.sentiment(ticker="hyg", now=NOON).by_ticker[0].article_count == 2
+
+
+def test_edited_primary_hands_over_to_its_duplicate():
+    engine = NewsSentimentEngine(dedup_threshold=0.5)
+    headline = "Treasury yields fall after weak jobs report"
+    assert engine.ingest(article("1", headline, score=0.5))
+    assert not engine.ingest(article("2", f"{headline} - Reuters", score=-0.5, tickers_mentioned=["IEF"]))
+    assert not engine.ingest(article("3", f"{headline} - Bloomberg", score=0.1))
+
+    # The primary's edit turns it into another story; its first copy now counts instead
+    assert engine.ingest(article("1", "Oil prices slide as OPEC output rises", score=0.9))
+    result = engine.sentiment(now=NOON)
+    assert (result.articles_ingested, result.duplicates_collapsed) == (2, 1)
+    assert result.overall.weighted_score == 0.2  # (0.9 - 0.5) / 2
+    assert "IEF" in {a.key for a in result.by_ticker}
+
+    # The remaining copy is now collapsed onto the promoted article
+    assert engine.ingest(article("2", "Gold climbs to a record", score=0.0))
+    assert engine.sentiment(now=NOON).articles_ingested == 3
+    assert engine.sentiment(now=NOON).duplicates_collapsed == 0
+
+
+def test_bundled_feed_reports_without_a_reference_time(loader):
+    result = loader.get_market_sentiment(window="1d")
+    assert result.overall.article_count > 0
+    assert result.as_of.year == 2024
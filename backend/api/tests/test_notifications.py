@@ -0,0 +1,167 @@
+import asyncio
+import time
+
+import pytest
+
+from models.schemas import AlertPriority, NotificationRequest
+from services import notifications
+from services.notifications import (
+    Digest,
+    MemoryChannel,
+    NotificationChannel,
+    NotificationDispatcher,
+    RateLimiter,
+    email_content,
+)
+from services.results_store import ResultsStore
+
+
+def alert(title: str, priority: str = "HIGH", **fields) -> NotificationRequest:
+    fields.setdefault("message", f"{title} details")
+    return NotificationRequest(alert_type="COMPLIANCE", priority=AlertPriority(priority), title=title, **fields)
+
+
+class FlakyChannel(MemoryChannel):
+    def __init__(self, failures: int):
+        super().__init__("slack")
+        self.failures = failures
+
+    async def send(self, digest: Digest) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("webhook unavailable")
+        await super().send(digest)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    monkeypatch.setattr(notifications, "results_store", store)
+    return store
+
+
+@pytest.fixture
+def channels():
+    return {name: MemoryChannel(name) for name in ("slack", "email", "ticket")}
+
+
+def test_alerts_are_digested_per_destination(store, channels):
+    async def scenario():
+        dispatcher = NotificationDispatcher(channels, window=60, critical_window=60, retry_backoff=0)
+        dispatcher.start()
+        dispatcher.submit([
+            alert("A1"),
+            alert("A2", slack_channel="#executive-alerts"),
+            alert("A3", recipients=["cfo@company.com"]),
+            alert("C1", priority="CRITICAL"),
+        ])
+        await asyncio.sleep(0.05)
+        assert not any(channel.sent_digests for channel in channels.values())  # windows still open
+        await dispatcher.stop()
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    slack = {(d.priority, d.destination): [a.title for a in d.alerts] for d in channels["slack"].sent_digests}
+    assert slack == {
+        ("HIGH", "#finance-alerts"): ["A1", "A3"],
+        ("HIGH", "#executive-alerts"): ["A2"],
+        ("CRITICAL", "#finance-alerts"): ["C1"],
+    }
+    email = {(d.priority, d.destination): [a.title for a in d.alerts] for d in channels["email"].sent_digests}
+    assert email[("HIGH", "team@company.com")] == ["A1", "A2"]
+    assert email[("HIGH", "cfo@company.com")] == ["A3"]
+    assert [d.title for d in channels["ticket"].sent_digests] == ["C1"]
+    assert dispatcher.audit_rows_written == 4
+
+
+def test_full_digest_is_sent_before_its_window_closes(store, channels):
+    async def scenario():
+        dispatcher = NotificationDispatcher(channels, window=60, max_digest_size=3)
+        dispatcher.start()
+        dispatcher.submit([alert(f"A{i}", include_email=False) for i in range(4)])
+        await asyncio.sleep(0.1)
+        sent = [len(d.alerts) for d in channels["slack"].sent_digests]
+        await dispatcher.stop()
+        return sent
+
+    assert asyncio.run(scenario()) == [3]
+    assert [len(d.alerts) for d in channels["slack"].sent_digests] == [3, 1]
+
+
+def test_stop_during_a_flush_loses_nothing(store, channels, monkeypatch):
+    save = store.save_notification_audit
+
+    def slow_save(rows):
+        time.sleep(0.2)
+        return save(rows)
+
+    monkeypatch.setattr(store, "save_notification_audit", slow_save)
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(channels, window=0, critical_window=0)
+        dispatcher.start()
+        dispatcher.submit([alert("A1", include_email=False), alert("A2", include_email=False)])
+        await asyncio.sleep(0.05)  # the loop is now inside the audit write
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert sorted(a.title for d in channels["slack"].sent_digests for a in d.alerts) == ["A1", "A2"]
+
+
+def test_failed_sends_are_retried(store):
+    channel = FlakyChannel(failures=2)
+
+    async def scenario():
+        dispatcher = NotificationDispatcher({"slack": channel}, retries=2, retry_backoff=0)
+        dispatcher.submit([alert("A1", include_email=False)])
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert (channel.sent, channel.retries, channel.failed) == (1, 2, 0)
+
+
+def test_rate_limiter_spaces_sends_after_the_burst():
+    async def scenario():
+        limiter = RateLimiter(rate=20, burst=2)
+        return [await limiter.acquire() for _ in range(4)]
+
+    waits = asyncio.run(scenario())
+    assert waits[:2] == [0.0, 0.0]
+    assert all(wait == pytest.approx(0.05, abs=0.02) for wait in waits[2:])
+
+
+def test_email_html_escapes_alert_text():
+    digest = Digest("d1", "email", "cco@company.com", "COMPLIANCE", "HIGH", [alert("<b>Wire</b>", message="<script>x</script>")])
+    body = email_content(digest)["body_html"]
+    assert "<script>" not in body and "&lt;script&gt;" in body
+    assert "&lt;b&gt;Wire&lt;/b&gt;" in body
+
+
+def test_channels_must_implement_send():
+    with pytest.raises(TypeError):
+        NotificationChannel("custom", rate=1)
+
+
+def test_failed_audit_write_is_kept_for_the_next_flush(store, channels, monkeypatch):
+    save = store.save_notification_audit
+    failures = [ConnectionError("database is locked")]
+
+    def flaky_save(rows):
+        if failures:
+            raise failures.pop()
+        return save(rows)
+
+    monkeypatch.setattr(store, "save_notification_audit", flaky_save)
+
+    async def scenario():
+        dispatcher = NotificationDispatcher(channels, retry_backoff=0)
+        dispatcher.submit([alert("A1", include_email=False)])
+        await dispatcher.flush()
+        assert dispatcher.audit_rows_written == 0
+        dispatcher.submit([alert("A2", include_email=False)])
+        await dispatcher.stop()
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+    assert dispatcher.audit_rows_written == 2
+    assert [row[0] for row in store.conn.execute("SELECT title FROM notification_audit ORDER BY id")] == ["A1", "A2"]
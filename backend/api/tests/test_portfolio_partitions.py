@@ -0,0 +1,117 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from services import data_loader, portfolio_partitions
+from services.data_loader import data_loader_service
+from tests.helpers import bump
+
+
+def write_portfolio(data_dir: Path, portfolio_id: str, aum: float, var_95: float, risk_score: int) -> Path:
+    directory = data_dir / settings.portfolio_partitions_dir / portfolio_id
+    directory.mkdir(parents=True)
+    (directory / "holdings.json").write_text(json.dumps({
+        "portfolio_id": portfolio_id,
+        "portfolio_name": f"Portfolio {portfolio_id}",
+        "total_aum": aum,
+        "holdings": [],
+    }))
+    (directory / "performance.json").write_text(json.dumps({
+        "performance": {"ytd": {"return_pct": 10.0, "benchmark_return": 8.0, "alpha": 2.0}},
+    }))
+    with open(directory / "var_metrics.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "portfolio_id", "var_95_1d", "risk_score"])
+        writer.writerow(["2024-12-10", portfolio_id, var_95 / 2, risk_score - 10])
+        writer.writerow(["2024-12-11", portfolio_id, var_95, risk_score])
+        # Another portfolio's row in the same file is ignored
+        writer.writerow(["2024-12-12", "OTHER", 1.0, 99])
+    return directory
+
+
+@pytest.fixture
+def portfolios(data_dir):
+    write_portfolio(data_dir, "PF-A", 10_000_000, 100_000, 40)
+    write_portfolio(data_dir, "PF-B", 30_000_000, 300_000, 80)
+    return data_dir
+
+
+@pytest.fixture
+def aggregated(monkeypatch):
+    """Record which portfolios each aggregation pass summarised."""
+    calls = []
+    aggregator = portfolio_partitions.PartitionAggregator(workers=1)
+
+    def aggregate(data_path, partitions):
+        calls.append(sorted(partition.portfolio_id for partition in partitions))
+        return aggregator.aggregate(data_path, partitions)
+
+    monkeypatch.setattr(data_loader.portfolio_aggregator, "aggregate", aggregate)
+    return calls
+
+
+def test_rollup_covers_default_and_partitions(portfolios, loader):
+    default = loader.get_portfolio_data()
+    rollup = loader.get_portfolio_rollup()
+
+    assert [line.portfolio_id for line in rollup.portfolios] == ["CORP-MAIN-001", "PF-A", "PF-B"]
+    assert rollup.total_aum == pytest.approx(default.total_aum + 40_000_000)
+    assert rollup.total_var_95_1d == pytest.approx(default.var_95_1d + 400_000)
+    assert rollup.max_risk_score == max(default.risk_score, 80)
+
+    pf_b = loader.get_portfolio_data("PF-B")
+    assert (pf_b.var_95_1d, pf_b.risk_score, pf_b.date) == (300_000, 80, "2024-12-11")
+
+
+def test_snapshot_and_direct_reads_agree(portfolios, loader, monkeypatch):
+    with_snapshot = loader.get_portfolio_rollup()
+    monkeypatch.setattr(settings, "snapshot_enabled", False)
+    fresh = data_loader.DataLoaderService()
+    assert fresh.get_portfolio_rollup() == with_snapshot
+
+
+def test_only_changed_portfolios_are_reaggregated(portfolios, loader, aggregated):
+    loader.get_portfolio_rollup()
+    assert aggregated == [["CORP-MAIN-001", "PF-A", "PF-B"]]
+
+    loader.get_portfolio_rollup()
+    assert len(aggregated) == 1
+
+    holdings = portfolios / settings.portfolio_partitions_dir / "PF-A" / "holdings.json"
+    bump(holdings, holdings.read_text().replace("10000000", "20000000"))
+    rollup = loader.get_portfolio_rollup()
+    assert aggregated[1:] == [["PF-A"]]
+    assert rollup.portfolios[1].total_aum == 20_000_000
+
+
+def test_single_portfolio_does_not_list_partitions(portfolios, loader, monkeypatch):
+    def scandir(path):
+        raise AssertionError(f"listed {path}")
+
+    monkeypatch.setattr(portfolio_partitions.os, "scandir", scandir)
+    assert loader.get_portfolio_data("PF-A").total_aum == 10_000_000
+    with pytest.raises(KeyError):
+        loader.get_portfolio_data("PF-MISSING")
+
+
+def test_export_filters_by_portfolio(portfolios, monkeypatch):
+    from main import app
+
+    monkeypatch.setattr(data_loader_service, "data_path", portfolios)
+    client = TestClient(app)
+
+    response = client.get("/export/portfolio", params={"portfolio_id": "PF-A", "dataset": "var_metrics"})
+    assert response.status_code == 200
+    assert 'filename="var_metrics-PF-A.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["date"], row["portfolio_id"]) for row in rows] == [("2024-12-10", "PF-A"), ("2024-12-11", "PF-A")]
+
+    default = client.get("/export/portfolio", params={"portfolio_id": "CORP-MAIN-001"})
+    assert default.text == client.get("/export/portfolio").text
+
+    assert client.get("/export/portfolio", params={"portfolio_id": "PF-MISSING"}).status_code == 404
+    assert client.get("/export/treasury", params={"portfolio_id": "PF-A"}).status_code == 400
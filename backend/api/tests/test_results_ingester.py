@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from services import results_ingester as ingester_module
+from services.kestra import kestra_service
+from services.results_ingester import ResultsIngester
+from services.results_store import ResultsStore
+
+
+class FakeKestra:
+    """Executions newest first, served in pages like Kestra's search endpoint."""
+
+    def __init__(self):
+        self.executions = []
+        self.fetched = []
+
+    def run(self, execution_id: str, state: str = "SUCCESS") -> None:
+        self.executions.insert(0, {
+            "id": execution_id,
+            "flowId": "finance-ai-orchestrator",
+            "namespace": "finance",
+            "state": {"current": state, "startDate": "2024-12-11T10:00:00Z"},
+            "taskRunList": [],
+        })
+
+    def finish(self, execution_id: str) -> None:
+        for execution in self.executions:
+            if execution["id"] == execution_id:
+                execution["state"]["current"] = "SUCCESS"
+
+    async def list_executions(self, limit=10, state=None, page=1):
+        return self.executions[(page - 1) * limit: page * limit]
+
+    async def get_execution(self, execution_id):
+        self.fetched.append(execution_id)
+        return next((e for e in self.executions if e["id"] == execution_id), None)
+
+    async def get_next_scheduled_run(self):
+        return None
+
+
+@pytest.fixture
+def kestra(tmp_path, monkeypatch):
+    fake = FakeKestra()
+    for name in ("list_executions", "get_execution", "get_next_scheduled_run"):
+        monkeypatch.setattr(kestra_service, name, getattr(fake, name))
+    monkeypatch.setattr(ingester_module, "results_store", ResultsStore(str(tmp_path / "results.db")))
+    monkeypatch.setattr(settings, "results_poll_batch_size", 10)
+    return fake
+
+
+def stored(ids):
+    return [ingester_module.results_store.has_finished_execution(execution_id) for execution_id in ids]
+
+
+def test_poll_pages_back_to_the_last_stored_execution(kestra):
+    ingester = ResultsIngester()
+    for i in range(25):
+        kestra.run(f"old-{i}")
+    assert asyncio.run(ingester.poll_once()) == 25
+
+    for i in range(35):  # more than a page between two polls
+        kestra.run(f"new-{i}")
+    kestra.fetched.clear()
+    assert asyncio.run(ingester.poll_once()) == 35
+    assert all(stored(f"new-{i}" for i in range(35)))
+    assert not any(execution_id.startswith("old-") for execution_id in kestra.fetched)
+
+
+def test_running_executions_are_stored_once_finished(kestra):
+    ingester = ResultsIngester()
+    kestra.run("slow", state="RUNNING")
+    kestra.run("fast")
+    assert asyncio.run(ingester.poll_once()) == 1
+
+    for i in range(15):  # the stored "fast" now sits between the new runs and "slow"
+        kestra.run(f"next-{i}")
+    kestra.finish("slow")
+    assert asyncio.run(ingester.poll_once()) == 16
+    assert stored(["slow"]) == [True]
+
+
+def test_callback_only_trusts_kestra(kestra):
+    from main import app
+
+    client = TestClient(app)
+    forged = {"id": "forged", "state": {"current": "SUCCESS"}, "taskRunList": [{"outputs": {"ai_summary": "fake"}}]}
+    response = client.post("/workflows/callback", json={"execution_id": "forged", "execution": forged})
+    assert response.json() == {"execution_id": "forged", "stored": False}
+
+    kestra.run("real")
+    assert client.post("/workflows/callback", json={"execution_id": "real"}).json()["stored"] is True
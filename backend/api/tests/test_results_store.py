@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from models.schemas import ExecutionState, ExecutionStatus, StatusLevel
+from services.results_store import ResultsStore, agent_results_from_execution
+
+
+@pytest.fixture
+def store():
+    store = ResultsStore(":memory:")
+    yield store
+    store.close()
+
+
+def save(store: ResultsStore, execution_id: str, start_date=None) -> None:
+    store.save_execution(ExecutionStatus(
+        execution_id=execution_id,
+        flow_id="finance-ai-orchestrator",
+        namespace="finance",
+        state=ExecutionState.SUCCESS,
+        start_date=start_date,
+    ))
+
+
+def stored_ids(store: ResultsStore) -> set:
+    return {row[0] for row in store.conn.execute("SELECT execution_id FROM executions")}
+
+
+def test_retention_ages_by_start_date_then_ingest_time(store):
+    now = datetime.now(timezone.utc)
+    save(store, "old-naive", (now - timedelta(days=40)).replace(tzinfo=None))
+    save(store, "old-offset", (now - timedelta(days=40)).astimezone(timezone(timedelta(hours=-5))))
+    save(store, "recent-offset", now - timedelta(days=1))
+    save(store, "never-started-old")
+    save(store, "never-started-new")
+    old_ingest = (datetime.utcnow() - timedelta(days=40)).isoformat()
+    store.conn.execute("UPDATE executions SET ingested_at = ? WHERE execution_id = 'never-started-old'", (old_ingest,))
+
+    assert store.apply_retention(max_age_days=30, max_executions=100) == 3
+    assert stored_ids(store) == {"recent-offset", "never-started-new"}
+
+
+def test_retention_row_cap_keeps_newest(store):
+    start = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    for day in range(5):
+        save(store, f"day-{day}", start + timedelta(days=day))
+    save(store, "never-started")
+    assert store.apply_retention(max_age_days=10_000, max_executions=3) == 3
+    assert stored_ids(store) == {"never-started", "day-4", "day-3"}
+
+
+@pytest.mark.parametrize("value, expected", [(72, 72), ("81", 81), ("7.5", 8), (64.2, 64), ("high", 0), (None, 0)])
+def test_agent_results_parse_risk_scores_defensively(value, expected):
+    data = {
+        "outputs": {"treasury_risk_score": value},
+        "state": {"endDate": "2024-12-11T10:00:00Z"},
+        "taskRunList": [{"taskId": "treasury_ai_summary", "outputs": {"body": '{"response": "Liquidity adequate"}'}}],
+    }
+    [result] = agent_results_from_execution(data)
+    assert result.risk_score == expected
+    assert result.ai_summary == "Liquidity adequate"
+    assert result.status == (StatusLevel.CRITICAL if expected >= 80 else StatusLevel.WARNING if expected >= 60 else StatusLevel.OK)
+
+
+def test_reads_do_not_wait_for_the_write_lock(tmp_path):
+    import threading
+
+    store = ResultsStore(str(tmp_path / "results.db"))
+    save(store, "exec-1", datetime(2024, 12, 11, tzinfo=timezone.utc))
+    found = []
+    with store._lock:  # a write in progress
+        reader = threading.Thread(target=lambda: found.extend(store.list_executions()))
+        reader.start()
+        reader.join(timeout=2)
+    assert [execution.execution_id for execution in found] == ["exec-1"]
+    assert store.has_finished_execution("exec-1")
+    store.close()
+    assert store.get_metadata("missing") is None  # reopens after close
+    store.close()
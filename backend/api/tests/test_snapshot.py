@@ -0,0 +1,93 @@
+import json
+from datetime import date, datetime
+
+import pytest
+
+from config import settings
+from services.snapshot import SnapshotManager, file_stamp
+from tests.helpers import bump
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return SnapshotManager(tmp_path / "snapshot")
+
+
+def test_json_record_lists_are_stored_as_tables(manager, tmp_path):
+    path = tmp_path / "feed.json"
+    document = {
+        "articles": [{"id": "a", "score": 0.5, "tags": ["x"]}, {"id": "b", "score": -0.25}],
+        "mixed": [{"value": 1}, {"value": 1.5}],
+        "summary": {"count": 2},
+    }
+    path.write_text(json.dumps(document))
+
+    entry = manager.entry(path)
+    assert list(entry.tables) == ["articles"]
+    assert manager.read_json(path) == (file_stamp(path), document)
+    assert list(manager.iter_json_records(path, "articles")) == document["articles"]
+    assert list(manager.iter_json_records(path, "mixed")) == document["mixed"]
+    assert manager.read_json_head(path) == {"mixed": document["mixed"], "summary": {"count": 2}}
+    # The rebuilt document is shared between reads of the same version
+    assert manager.read_json(path)[1] is manager.read_json(path)[1]
+
+
+def test_modified_file_is_read_back_immediately(manager, tmp_path):
+    path = tmp_path / "positions.csv"
+    path.write_text("account,balance\nops,100\n")
+    stamp, frame = manager.read_csv(path)
+    assert frame["balance"].tolist() == [100]
+
+    bump(path, "account,balance\nops,100\nfx,250\n")
+    new_stamp, frame = manager.read_csv(path)
+    assert new_stamp != stamp
+    assert frame["balance"].tolist() == [100, 250]
+
+
+def test_workers_share_one_published_copy(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps({"rates": [{"pair": "EURUSD", "rate": 1.05}]}))
+    first = SnapshotManager(tmp_path / "snapshot")
+    second = SnapshotManager(tmp_path / "snapshot")
+    assert first.entry(path).path == second.entry(path).path
+
+    # Old versions are pruned, keeping the newest two
+    for rate in (1.06, 1.07, 1.08):
+        bump(path, json.dumps({"rates": [{"pair": "EURUSD", "rate": rate}]}))
+        first.entry(path)
+    versions = [p for p in first.entry(path).path.parent.iterdir() if not p.name.startswith(".")]
+    assert len(versions) == 2
+    assert second.read_json(path)[1]["rates"][0]["rate"] == 1.08
+
+
+def test_disabled_snapshot_reads_files_directly(manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "snapshot_enabled", False)
+    path = tmp_path / "doc.json"
+    path.write_text('{"items": [{"a": 1}]}')
+    assert manager.entry(path) is None
+    assert manager.read_json(path) == (file_stamp(path), {"items": [{"a": 1}]})
+    assert manager.read_json(tmp_path / "missing.json") == (None, {})
+    assert not (tmp_path / "snapshot").exists()
+
+
+def test_loader_indexes_follow_file_edits(loader, data_dir):
+    kyc_path = data_dir / "compliance" / "kyc_status.json"
+    page = loader.get_kyc_expiring(days=30, as_of=date(2024, 12, 11))
+    assert page.total == 3
+
+    kyc = json.loads(kyc_path.read_text())
+    kyc["expiring_soon"] = kyc["expiring_soon"][:1]
+    bump(kyc_path, json.dumps(kyc))
+    assert loader.get_kyc_expiring(days=30, as_of=date(2024, 12, 11)).total == 1
+
+    news_path = data_dir / "market" / "news_feed.json"
+    news = json.loads(news_path.read_text())
+    as_of = datetime.fromisoformat("2024-12-11T15:00:00+00:00")
+    before = loader.get_market_sentiment(window="1d", as_of=as_of).overall
+    for article in news["articles"]:
+        article["sentiment_score"] = -0.9
+    bump(news_path, json.dumps(news))
+    after = loader.get_market_sentiment(window="1d", as_of=as_of).overall
+    assert after.article_count == before.article_count
+    assert after.weighted_score == -0.9
+
@@ -0,0 +1,115 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from services.warmup import WarmupState
+from tests.helpers import bump
+
+
+def test_treasury_cache_follows_source_edits(loader, data_dir):
+    debt_path = data_dir / "treasury" / "debt_schedule.csv"
+    first = loader.get_treasury_data()
+    assert loader.get_treasury_data() is first
+
+    header, first_row = debt_path.read_text().splitlines()[:2]
+    bump(debt_path, f"{header}\n{first_row}\n")
+    treasury = loader.get_treasury_data()
+    assert treasury.total_debt == 5_000_000.0
+    assert [debt.debt_id for debt in treasury.debt_instruments] == ["DEBT001"]
+    assert treasury.total_cash_usd == first.total_cash_usd
+
+
+def failing_until_fixed(state: WarmupState, broken: dict):
+    def load_market():
+        if broken["market"]:
+            raise OSError("market data unavailable")
+
+    state._steps = lambda: [("treasury", lambda: None), ("market", load_market)]
+
+
+def test_failed_step_leaves_worker_degraded_until_retry_succeeds():
+    state = WarmupState()
+    broken = {"market": True}
+    failing_until_fixed(state, broken)
+
+    asyncio.run(state.run())
+    assert not state.ready
+    assert state.state == "degraded"
+    assert state.status()["errors"] == {"market": "market data unavailable"}
+
+    assert not asyncio.run(state.retry_failed())
+    broken["market"] = False
+    assert asyncio.run(state.retry_failed())
+    assert state.state == "ready"
+    assert state.errors == {}
+
+
+def test_readiness_probe_reports_degraded(monkeypatch):
+    from main import app
+    from routers import health
+
+    state = WarmupState()
+    broken = {"market": True}
+    failing_until_fixed(state, broken)
+    monkeypatch.setattr(health, "warmup", state)
+    client = TestClient(app)
+
+    assert client.get("/health/ready").json()["status"] == "warming_up"
+    asyncio.run(state.run())
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "degraded"
+
+    broken["market"] = False
+    assert client.get("/health/ready").status_code == 503  # the probe does not retry
+    asyncio.run(state.retry_failed())
+    assert client.get("/health/ready").status_code == 200
+
+
+def test_failed_steps_are_retried_in_the_background():
+    state = WarmupState(retry_interval=0.01)
+    broken = {"market": True}
+    failing_until_fixed(state, broken)
+    attempts = []
+    steps = state._steps
+    state._steps = lambda: [(name, lambda name=name, step=step: (attempts.append(name), step())) for name, step in steps()]
+
+    async def scenario():
+        state.start()
+        await asyncio.sleep(0.05)
+        assert state.state == "degraded"
+        # A retry requested while the background one runs does not start another
+        state._retrying = True
+        assert not await state.retry_failed()
+        state._retrying = False
+        broken["market"] = False
+        for _ in range(100):
+            if state.ready:
+                break
+            await asyncio.sleep(0.01)
+        await state.stop()
+
+    asyncio.run(scenario())
+    assert state.state == "ready"
+    assert attempts.count("treasury") == 1 and attempts.count("market") > 2
+
+
+def test_health_is_unknown_until_the_first_probe_round(monkeypatch):
+    from main import app
+    from routers import health
+    from services.health_monitor import HealthMonitor
+
+    monitor = HealthMonitor()
+
+    async def probe_all():
+        raise AssertionError("/health must not probe inline")
+
+    monkeypatch.setattr(monitor, "probe_all", probe_all)
+    monkeypatch.setattr(health, "health_monitor", monitor)
+    body = TestClient(app).get("/health").json()
+    assert body["status"] == "unknown"
+    assert {body["kestra_status"], body["ollama_status"], body["data_status"]} == {"unknown"}
+
+    for probe in monitor.components.values():
+        probe.record("healthy", 1.0)
+    assert TestClient(app).get("/health").json()["status"] == "healthy"